@@ -0,0 +1,64 @@
+"""
+Проверка поискового индекса по таблице корреляции против CorrTableTempPredictor из boiler.
+
+IndexedCorrTableTempPredictor заменяет предсказатель библиотеки, поэтому перед использованием индекса
+оба предсказателя запускаются на загруженных таблицах на одних и тех же требованиях к температуре.
+Требования случайные (с фиксированным seed) и немонотонные, чтобы расхождение в сдвиге по запаздыванию домов
+или в округлении запаздывания до TIME_TICK меняло результат,
+и выходят за диапазон таблицы, чтобы проверялись и крайние значения.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from boiler.temp_predictors.corr_table_temp_predictor import CorrTableTempPredictor
+from backend.calculators.corr_table_search_index import BOILER_TEMP_COLUMN, CorrTableSearchIndex
+from backend.calculators.indexed_corr_table_temp_predictor import IndexedCorrTableTempPredictor
+
+DEFAULT_PREDICTED_COUNT = 200
+REFERENCE_SEED = 0
+
+_logger = logging.getLogger(__name__)
+
+
+def check_corr_table_search_index(corr_table_search_index: CorrTableSearchIndex,
+                                  temp_correlation_table: pd.DataFrame,
+                                  home_time_deltas: pd.DataFrame,
+                                  predicted_count: int = DEFAULT_PREDICTED_COUNT) -> None:
+    """
+    Бросает ValueError, если предсказания по индексу расходятся с CorrTableTempPredictor.
+    """
+    boiler_temps = temp_correlation_table[BOILER_TEMP_COLUMN].to_numpy(dtype=np.float64)
+    random_state = np.random.RandomState(REFERENCE_SEED)
+    temp_requirements_arr = random_state.uniform(
+        0.3 * boiler_temps.min(),
+        1.05 * boiler_temps.max(),
+        corr_table_search_index.max_time_delta_in_ticks + predicted_count
+    )
+
+    reference_predictor = CorrTableTempPredictor(
+        temp_correlation_table=temp_correlation_table,
+        home_time_deltas=home_time_deltas,
+        home_min_temp_coefficient=1
+    )
+    indexed_predictor = IndexedCorrTableTempPredictor(corr_table_search_index, home_min_temp_coefficient=1)
+
+    reference_temps = np.asarray(
+        reference_predictor.predict_on_temp_requirements(temp_requirements_arr),
+        dtype=np.float64
+    )
+    indexed_temps = indexed_predictor.predict_on_temp_requirements(temp_requirements_arr)
+
+    if reference_temps.shape != indexed_temps.shape:
+        raise ValueError(f"Indexed predictor returns {len(indexed_temps)} temps, "
+                         f"CorrTableTempPredictor returns {len(reference_temps)}")
+    mismatched = ~np.isclose(reference_temps, indexed_temps)
+    if mismatched.any():
+        first_idx = int(np.argmax(mismatched))
+        raise ValueError(f"Indexed predictor differs from CorrTableTempPredictor "
+                         f"in {int(mismatched.sum())} of {len(reference_temps)} temps, "
+                         f"first at {first_idx}: {indexed_temps[first_idx]} != {reference_temps[first_idx]}")
+
+    _logger.debug(f"Indexed predictor matches CorrTableTempPredictor on {len(reference_temps)} temps")
@@ -0,0 +1,86 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from boiler.constants import column_names, time_tick
+
+# Имена колонок берутся из boiler.constants.column_names, как у CorrTableTempPredictor.
+# Для таблицы запаздываний используются имена из файлов данных, если библиотека их не объявляет;
+# совпадение с CorrTableTempPredictor на загруженных таблицах проверяет corr_table_reference_check.
+BOILER_TEMP_COLUMN = column_names.FORWARD_PIPE_COOLANT_TEMP
+HOME_NAME_COLUMN = getattr(column_names, "HOME_NAME", "home_name")
+HOME_TIME_DELTA_COLUMN = getattr(column_names, "AVG_TIMEDELTA", "avg_timedelta")
+
+
+class CorrTableSearchIndex:
+    """
+    Поисковый индекс по таблице корреляции температур.
+
+    Таблица корреляции содержит колонку с температурой на бойлере и по колонке на каждый дом
+    с температурой, которая устанавливается в доме при этой температуре на бойлере.
+    Таблица времён запаздывания содержит имя дома и время, через которое температура с бойлера
+    доходит до дома (число секунд или строка, понятная pd.to_timedelta).
+
+    Для каждого дома строится отсортированный по температуре на бойлере массив
+    накопленных максимумов температуры в доме, поэтому минимальная температура на бойлере,
+    обеспечивающая заданную температуру в доме, находится бинарным поиском.
+    """
+
+    def __init__(self,
+                 temp_correlation_table: pd.DataFrame,
+                 home_time_deltas: pd.DataFrame) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Building index")
+
+        home_names = home_time_deltas[HOME_NAME_COLUMN].to_list()
+        time_deltas = home_time_deltas[HOME_TIME_DELTA_COLUMN]
+        if pd.api.types.is_numeric_dtype(time_deltas):
+            time_deltas = pd.to_timedelta(time_deltas, unit="s")
+        else:
+            time_deltas = pd.to_timedelta(time_deltas)
+        time_deltas_in_ticks = (time_deltas / time_tick.TIME_TICK).round().to_numpy(dtype=np.int64)
+
+        boiler_temps = temp_correlation_table[BOILER_TEMP_COLUMN].to_numpy(dtype=np.float64)
+        if not _is_non_decreasing(boiler_temps):
+            temp_correlation_table = temp_correlation_table.sort_values(BOILER_TEMP_COLUMN, kind="mergesort")
+            boiler_temps = temp_correlation_table[BOILER_TEMP_COLUMN].to_numpy(dtype=np.float64)
+
+        # Для таблицы, уже отсортированной конвертером, колонки не копируются
+        # и остаются представлениями страниц memory-mapped файла.
+        home_temps = []
+        for home_name in home_names:
+            home_temps_arr = temp_correlation_table[home_name].to_numpy(dtype=np.float64)
+            if not _is_non_decreasing(home_temps_arr):
+                home_temps_arr = np.maximum.accumulate(home_temps_arr)
+            home_temps.append(home_temps_arr)
+
+        self._home_names = home_names
+        self._time_deltas_in_ticks = time_deltas_in_ticks
+        self._boiler_temps = boiler_temps
+        self._home_temps = home_temps
+
+        self._logger.debug(f"Index is built for {len(home_names)} homes and {len(boiler_temps)} boiler temps")
+
+    @property
+    def home_names(self) -> list:
+        return self._home_names
+
+    @property
+    def time_deltas_in_ticks(self) -> np.ndarray:
+        return self._time_deltas_in_ticks
+
+    @property
+    def max_time_delta_in_ticks(self) -> int:
+        if len(self._time_deltas_in_ticks) == 0:
+            return 0
+        return int(self._time_deltas_in_ticks.max())
+
+    def get_boiler_temps_for_home_temps(self, home_idx: int, home_temps: np.ndarray) -> np.ndarray:
+        boiler_temp_idx = self._home_temps[home_idx].searchsorted(home_temps, side="left")
+        np.minimum(boiler_temp_idx, len(self._boiler_temps) - 1, out=boiler_temp_idx)
+        return self._boiler_temps.take(boiler_temp_idx)
+
+
+def _is_non_decreasing(arr: np.ndarray) -> bool:
+    return bool(np.all(arr[1:] >= arr[:-1]))
@@ -0,0 +1,64 @@
+"""
+Задачи для выполнения в исполнителе расчётов.
+
+Функции уровня модуля принимают и возвращают массивы numpy и простые объекты,
+поэтому могут выполняться как в пуле потоков, так и в пуле процессов.
+
+Индекс по таблице корреляции в пул процессов не передаётся: predict_control_temps_by_paths
+получает пути к таблицам, и каждый процесс пула один раз загружает их (memory-mapped таблицы
+разделяют страницы файла между процессами) и хранит построенный индекс между задачами.
+Задача передаёт в процесс только массив требований к температуре и коэффициент.
+"""
+
+import os
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.calculators.corr_table_search_index import CorrTableSearchIndex
+from backend.calculators.indexed_corr_table_temp_predictor import IndexedCorrTableTempPredictor
+from backend.calculators.vectorized_temp_graph_requirements_calculator import \
+    VectorizedTempGraphRequirementsCalculator
+
+
+def calc_temp_requirements(temp_requirements_calculator: VectorizedTempGraphRequirementsCalculator,
+                           temp_graph: pd.DataFrame,
+                           weather_temp_arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    temp_requirements_calculator.set_temp_graph(temp_graph)
+    return temp_requirements_calculator.get_temp_requirements_for_weather_temp_arr(weather_temp_arr)
+
+
+_corr_table_search_indexes: Dict[Tuple[str, str], CorrTableSearchIndex] = {}
+
+
+def predict_control_temps(temp_predictor: IndexedCorrTableTempPredictor,
+                          required_temp_arr: np.ndarray) -> np.ndarray:
+    return temp_predictor.predict_on_temp_requirements(required_temp_arr)
+
+
+def predict_control_temps_by_paths(temp_correlation_table_path: str,
+                                   homes_deltas_path: str,
+                                   home_min_temp_coefficient: float,
+                                   required_temp_arr: np.ndarray) -> np.ndarray:
+    temp_predictor = IndexedCorrTableTempPredictor(
+        get_corr_table_search_index(temp_correlation_table_path, homes_deltas_path),
+        home_min_temp_coefficient=home_min_temp_coefficient
+    )
+    return temp_predictor.predict_on_temp_requirements(required_temp_arr)
+
+
+def get_corr_table_search_index(temp_correlation_table_path: str, homes_deltas_path: str) -> CorrTableSearchIndex:
+    # Импорт здесь, т.к. модули ресурсов импортируют dependency_injector, который не нужен задачам расчёта
+    from backend.resources.home_time_deltas_resource import load_home_time_deltas
+    from backend.resources.temp_correlation_table import load_temp_correlation_table
+
+    index_key = (os.path.abspath(temp_correlation_table_path), os.path.abspath(homes_deltas_path))
+    corr_table_search_index = _corr_table_search_indexes.get(index_key)
+    if corr_table_search_index is None:
+        corr_table_search_index = CorrTableSearchIndex(
+            load_temp_correlation_table(index_key[0]),
+            load_home_time_deltas(index_key[1])
+        )
+        _corr_table_search_indexes[index_key] = corr_table_search_index
+    return corr_table_search_index
@@ -0,0 +1,45 @@
+import logging
+
+import numpy as np
+
+from backend.calculators.corr_table_search_index import CorrTableSearchIndex
+
+
+class IndexedCorrTableTempPredictor:
+    """
+    Предсказывает температуру на бойлере по требованиям к температуре теплоносителя
+    с использованием поискового индекса по таблице корреляции.
+
+    Для момента времени t каждому дому нужна температура temp_requirements[t + запаздывание дома],
+    умноженная на home_min_temp_coefficient. На бойлере выставляется максимальная
+    из температур, необходимых домам.
+    """
+
+    def __init__(self,
+                 corr_table_search_index: CorrTableSearchIndex,
+                 home_min_temp_coefficient: float = 1) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance")
+
+        self._index = corr_table_search_index
+        self._home_min_temp_coefficient = home_min_temp_coefficient
+
+        self._logger.debug(f"Home min temp coefficient is {home_min_temp_coefficient}")
+
+    @property
+    def home_min_temp_coefficient(self) -> float:
+        return self._home_min_temp_coefficient
+
+    def predict_on_temp_requirements(self, temp_requirements_arr: np.ndarray) -> np.ndarray:
+        temp_requirements_arr = np.asarray(temp_requirements_arr, dtype=np.float64)
+        predicted_count = len(temp_requirements_arr) - self._index.max_time_delta_in_ticks
+        if predicted_count <= 0 or len(self._index.home_names) == 0:
+            return np.empty(0, dtype=np.float64)
+
+        boiler_temps = np.full(predicted_count, -np.inf)
+        for home_idx, time_delta in enumerate(self._index.time_deltas_in_ticks):
+            home_temps = temp_requirements_arr[time_delta:time_delta + predicted_count] * \
+                self._home_min_temp_coefficient
+            np.maximum(boiler_temps, self._index.get_boiler_temps_for_home_temps(home_idx, home_temps), out=boiler_temps)
+
+        return boiler_temps
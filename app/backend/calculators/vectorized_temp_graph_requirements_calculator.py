@@ -0,0 +1,63 @@
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from boiler.constants import column_names
+
+
+class VectorizedTempGraphRequirementsCalculator:
+    """
+    Рассчитывает требования к температуре теплоносителя по температурному графику
+    сразу для всего массива температур наружного воздуха.
+
+    Для каждой температуры выбирается строка графика с наибольшей температурой воздуха,
+    не превышающей заданную. Если таких строк нет - используется строка с наименьшей
+    температурой воздуха (как и в TempGraphRequirementsCalculator из boiler).
+    """
+
+    def __init__(self, temp_graph: Optional[pd.DataFrame] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance")
+
+        self._temp_graph = None
+        self._weather_temp_arr = None
+        self._forward_temp_arr = None
+        self._backward_temp_arr = None
+
+        if temp_graph is not None:
+            self.set_temp_graph(temp_graph)
+
+    def set_temp_graph(self, temp_graph: pd.DataFrame) -> None:
+        if temp_graph is self._temp_graph:
+            return
+
+        self._logger.debug("Temp graph is set")
+        sorted_temp_graph = temp_graph.sort_values(column_names.WEATHER_TEMP, kind="mergesort")
+        self._weather_temp_arr = sorted_temp_graph[column_names.WEATHER_TEMP].to_numpy(dtype=np.float64)
+        self._forward_temp_arr = sorted_temp_graph[column_names.FORWARD_PIPE_COOLANT_TEMP].to_numpy(dtype=np.float64)
+        self._backward_temp_arr = sorted_temp_graph[column_names.BACKWARD_PIPE_COOLANT_TEMP].to_numpy(dtype=np.float64)
+        self._temp_graph = temp_graph
+
+    def get_temp_requirements_for_weather_temp(self, weather_temp: float) -> dict:
+        forward_temp_arr, backward_temp_arr = self.get_temp_requirements_for_weather_temp_arr(
+            np.array([weather_temp], dtype=np.float64)
+        )
+        return {
+            column_names.FORWARD_PIPE_COOLANT_TEMP: forward_temp_arr[0],
+            column_names.BACKWARD_PIPE_COOLANT_TEMP: backward_temp_arr[0]
+        }
+
+    def get_temp_requirements_for_weather_temp_arr(self,
+                                                   weather_temp_arr: np.ndarray
+                                                   ) -> Tuple[np.ndarray, np.ndarray]:
+        if self._temp_graph is None:
+            raise ValueError("Temp graph is not set")
+
+        temp_graph_idx = np.searchsorted(self._weather_temp_arr, weather_temp_arr, side="right") - 1
+        np.clip(temp_graph_idx, 0, None, out=temp_graph_idx)
+
+        forward_temp_arr = self._forward_temp_arr.take(temp_graph_idx)
+        backward_temp_arr = self._backward_temp_arr.take(temp_graph_idx)
+        return forward_temp_arr, backward_temp_arr
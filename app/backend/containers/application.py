@@ -20,5 +20,6 @@ class Application(containers.DeclarativeContainer):
 
     wsgi = providers.Container(
         WSGI,
-        config=config.server
+        config=config.server,
+        health_service=services.health_service
     )
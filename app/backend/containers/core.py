@@ -1,6 +1,8 @@
 from dependency_injector import containers, providers
 import logging.config
 
+from backend.utils.lazy_import import lazy_callable
+
 
 class Core(containers.DeclarativeContainer):
     config = providers.Configuration()
@@ -12,3 +14,9 @@ class Core(containers.DeclarativeContainer):
         logging.config.dictConfig,
         config=config.logging,
     )
+
+    datetime_parser = providers.Singleton(
+        lazy_callable("backend.parsing.precompiled_datetime_parser", "PrecompiledDatetimeParser"),
+        datetime_patterns=config.datetime_processing.request_patterns,
+        cache_size=config.datetime_processing.parsed_datetime_cache_size
+    )
@@ -5,11 +5,23 @@ from .services_containers.dynamic_settings_container import DynamicSettingsConta
 from .services_containers.temp_graph_container import TempGraphContainer
 from .services_containers.temp_requirements_container import TempRequirementsContainer
 from .services_containers.updater_container import UpdateContainer
+from backend.resources.executor_resource import ExecutorResource
+from backend.utils.lazy_import import lazy_callable
 
 
 class Services(containers.DeclarativeContainer):
     config = providers.Configuration()
 
+    executor = providers.Resource(
+        ExecutorResource,
+        kind=config.executor.kind,
+        max_workers=config.executor.max_workers
+    )
+
+    health_service = providers.Singleton(
+        lazy_callable("backend.services.health_service.health_service", "HealthService")
+    )
+
     dynamic_settings_pkg = providers.Container(
         DynamicSettingsContainer,
         config=config.dynamic_settings
@@ -23,14 +35,16 @@ class Services(containers.DeclarativeContainer):
     temp_requirements_pkg = providers.Container(
         TempRequirementsContainer,
         config=config.temp_requirements_calculation,
-        temp_graph_loader=temp_graph_pkg.temp_graph_dumper_loader
+        temp_graph_loader=temp_graph_pkg.temp_graph_dumper_loader,
+        executor=executor
     )
 
     control_action_pkg = providers.Container(
         ControlActionContainer,
         config=config.boiler_temp_prediction,
         settings_service=dynamic_settings_pkg.settings_service,
-        temp_requirements_repository=temp_requirements_pkg.temp_requirements_repository
+        temp_requirements_repository=temp_requirements_pkg.temp_requirements_repository,
+        executor=executor
     )
 
     updater_pkg = providers.Container(
@@ -40,3 +54,23 @@ class Services(containers.DeclarativeContainer):
         temp_graph_updater=temp_graph_pkg.temp_graph_update_service,
         temp_requirements_calculator=temp_requirements_pkg.temp_requirements_service,
     )
+
+    warm_start_service = providers.Singleton(
+        lazy_callable("backend.services.warm_start_service.warm_start_service", "WarmStartService"),
+        path=config.warm_start.path,
+        save_interval=config.warm_start.save_interval,
+        temp_graph_loader=temp_graph_pkg.temp_graph_dumper_loader,
+        temp_graph_update_service=temp_graph_pkg.temp_graph_update_service,
+        temp_requirements_service=temp_requirements_pkg.temp_requirements_service,
+        temp_requirements_repository=temp_requirements_pkg.temp_requirements_repository,
+        control_actions_repository=control_action_pkg.control_actions_repository
+    )
+
+    stations_registry = providers.Singleton(
+        lazy_callable("backend.stations.stations_registry", "StationsRegistry"),
+        services_config=config,
+        settings_service=dynamic_settings_pkg.settings_service.provider,
+        executor=executor.provider,
+        update_concurrency=config.stations_update_concurrency,
+        feeds_cache_ttl=config.stations_feeds_cache_ttl
+    )
@@ -1,11 +1,6 @@
-from boiler.temp_predictors.corr_table_temp_predictor import CorrTableTempPredictor
 from dependency_injector import containers, providers
 
-from backend.repositories.control_action_simple_repository import ControlActionsSimpleRepository
-from backend.resources.home_time_deltas_resource import HomeTimeDeltasResource
-from backend.resources.temp_correlation_table import TempCorrelationTable
-from backend.services.control_action_prediction_service.corr_table_control_action_prediction_service import \
-    CorrTableControlActionPredictionService
+from backend.utils.lazy_import import lazy_callable, lazy_resource
 
 
 class ControlActionContainer(containers.DeclarativeContainer):
@@ -13,30 +8,67 @@ class ControlActionContainer(containers.DeclarativeContainer):
     settings_service = providers.Dependency()
 
     temp_requirements_repository = providers.Dependency()
+    executor = providers.Object(None)
+
+    # В режиме с несколькими процессами API main.py переопределяет
+    # control_actions_snapshot_publisher в процессе обновления
+    # и control_actions_repository в процессах API.
+    shared_snapshot_writer = providers.Singleton(
+        lazy_callable("backend.repositories.shared_control_actions_snapshot", "SharedControlActionsSnapshotWriter"),
+        path=config.shared_snapshot.path,
+        capacity=config.shared_snapshot.capacity
+    )
+    shared_snapshot_reader = providers.Singleton(
+        lazy_callable("backend.repositories.shared_control_actions_snapshot", "SharedControlActionsSnapshotReader"),
+        path=config.shared_snapshot.path
+    )
+    control_actions_snapshot_publisher = providers.Object(None)
+
     control_actions_repository = providers.Singleton(
-        ControlActionsSimpleRepository
+        lazy_callable("backend.repositories.control_action_columnar_repository", "ControlActionsColumnarRepository"),
+        snapshot_publisher=control_actions_snapshot_publisher
+    )
+    shared_control_actions_repository = providers.Singleton(
+        lazy_callable("backend.repositories.control_action_shared_memory_repository",
+                      "ControlActionsSharedMemoryRepository"),
+        snapshot_reader=shared_snapshot_reader
+    )
+    control_actions_response_cache = providers.Singleton(
+        lazy_callable("backend.repositories.control_action_response_cache", "ControlActionResponseCache"),
+        max_size=config.response_cache_max_size
     )
 
     temp_correlation_table = providers.Resource(
-        TempCorrelationTable,
+        lazy_resource("backend.resources.temp_correlation_table", "TempCorrelationTable"),
         config.temp_correlation_table_path
     )
 
     homes_time_deltas = providers.Resource(
-        HomeTimeDeltasResource,
+        lazy_resource("backend.resources.home_time_deltas_resource", "HomeTimeDeltasResource"),
         config.homes_deltas_path
     )
 
-    temp_predictor = providers.Factory(
-        CorrTableTempPredictor,
+    temp_correlation_index = providers.Resource(
+        lazy_resource("backend.resources.corr_table_search_index_resource", "CorrTableSearchIndexResource"),
         temp_correlation_table=temp_correlation_table,
         home_time_deltas=homes_time_deltas,
-        home_min_temp_coefficient=settings_service.provided.get_one_setting_sync.call("home_min_temp_coefficient")
+        check_with_reference=config.check_temp_predictor_with_reference
+    )
+
+    temp_predictor = providers.Factory(
+        lazy_callable("backend.calculators.indexed_corr_table_temp_predictor", "IndexedCorrTableTempPredictor"),
+        corr_table_search_index=temp_correlation_index
     )
 
-    temp_prediction_service = providers.Factory(
-        CorrTableControlActionPredictionService,
-        temp_predictor=temp_predictor,
+    temp_prediction_service = providers.Singleton(
+        lazy_callable("backend.services.control_action_prediction_service.corr_table_control_action_prediction_service",
+                      "CorrTableControlActionPredictionService"),
+        temp_predictor_factory=temp_predictor.provider,
+        settings_service=settings_service,
         temp_requirements_repository=temp_requirements_repository,
-        control_actions_repository=control_actions_repository
+        control_actions_repository=control_actions_repository,
+        control_actions_response_cache=control_actions_response_cache,
+        executor=executor,
+        temp_correlation_table_path=config.temp_correlation_table_path,
+        homes_deltas_path=config.homes_deltas_path
     )
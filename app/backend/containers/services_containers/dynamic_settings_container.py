@@ -1,39 +1,67 @@
 from dependency_injector import containers, providers
-from dynamic_settings.repository.db_settings_repository import dtype_converters, DBSettingsRepository
-from dynamic_settings.service.simple_settings_service import SimpleSettingsService
 
-from backend.resources.async_settings_db_engine import AsyncSettingsDBEngine
-from backend.resources.async_settings_db_session_factory import AsyncSettingsDBSessionFactory
+from backend.utils.lazy_import import lazy_async_resource, lazy_callable
+
+
+def make_dtype_converters() -> list:
+    from dynamic_settings.repository.db_settings_repository import dtype_converters
+    return [
+        dtype_converters.BooleanDTypeConverter(),
+        dtype_converters.DatetimeDTypeConverter(),
+        dtype_converters.FloatDTypeConverter(),
+        dtype_converters.IntDTypeConverter(),
+        dtype_converters.StrDTypeConverter(),
+        dtype_converters.NoneDTypeConverter(),
+        dtype_converters.TimedeltaDTypeConverter()
+    ]
 
 
 class DynamicSettingsContainer(containers.DeclarativeContainer):
     config = providers.Configuration()
 
     db_engine = providers.Resource(
-        AsyncSettingsDBEngine,
-        db_url=config.db_url
+        lazy_async_resource("backend.resources.async_settings_db_engine", "AsyncSettingsDBEngine"),
+        db_url=config.db_url,
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.pool_timeout
     )
     session_factory = providers.Resource(
-        AsyncSettingsDBSessionFactory,
+        lazy_async_resource("backend.resources.async_settings_db_session_factory", "AsyncSettingsDBSessionFactory"),
         db_engine=db_engine
     )
-    converters = providers.Object([
-        dtype_converters.BooleanDTypeConverter(),
-        dtype_converters.DatetimeDTypeConverter(),
-        dtype_converters.FloatDTypeConverter(),
-        dtype_converters.IntDTypeConverter(),
-        dtype_converters.StrDTypeConverter(),
-        dtype_converters.NoneDTypeConverter(),
-        dtype_converters.TimedeltaDTypeConverter()
-    ])
+    converters = providers.Singleton(make_dtype_converters)
     settings_repository = providers.Singleton(
-        DBSettingsRepository,
+        lazy_callable("dynamic_settings.repository.db_settings_repository", "DBSettingsRepository"),
         session_factory=session_factory,
         dtype_converters=converters
     )
 
-    settings_service = providers.Singleton(
-        SimpleSettingsService,
+    db_settings_service = providers.Singleton(
+        lazy_callable("dynamic_settings.service.simple_settings_service", "SimpleSettingsService"),
         settings_repository=settings_repository,
         defaults=config.defaults
     )
+
+    settings_version_repository = providers.Singleton(
+        lazy_callable("backend.repositories.settings_version_repository", "SettingsVersionRepository"),
+        db_engine=db_engine
+    )
+
+    settings_batch_repository = providers.Singleton(
+        lazy_callable("backend.repositories.settings_batch_repository", "SettingsBatchRepository"),
+        db_engine=db_engine,
+        dtype_converters=converters,
+        settings_version_repository=settings_version_repository,
+        defaults=config.defaults
+    )
+
+    settings_service = providers.Singleton(
+        lazy_callable("backend.services.dynamic_settings_service.cached_settings_service", "CachedSettingsService"),
+        settings_service=db_settings_service,
+        defaults=config.defaults,
+        settings_version_repository=settings_version_repository,
+        settings_batch_repository=settings_batch_repository,
+        cache_ttl=config.cache_ttl,
+        refresh_interval=config.refresh_interval
+    )
@@ -1,35 +1,44 @@
 from dateutil.tz import gettz
 from dependency_injector import containers, providers
 
-from boiler.temp_requirements.calculators.temp_graph_requirements_calculator \
-    import TempGraphRequirementsCalculator
-from boiler.temp_requirements.repository.db.async_.temp_requirements_db_async_fake_repository \
-    import TempRequirementsDBAsyncFakeRepository
-from boiler_softm.weather.io.sync.soft_m_sync_weather_forecast_json_reader \
-    import SoftMSyncWeatherForecastJSONReader
-from boiler_softm.weather.io.async_.soft_m_async_weather_forecast_online_loader \
-    import SoftMAsyncWeatherForecastOnlineLoader
-from backend.services.temp_requirements_update_service.simple_temp_requirements_service \
-    import SimpleTempRequirementsService
+from backend.utils.lazy_import import lazy_callable
 
 
 class TempRequirementsContainer(containers.DeclarativeContainer):
     config = providers.Configuration()
 
     temp_graph_loader = providers.Dependency()
+    executor = providers.Object(None)
 
-    temp_requirements_calculator = providers.Singleton(TempGraphRequirementsCalculator)
+    temp_requirements_calculator = providers.Singleton(
+        lazy_callable("backend.calculators.vectorized_temp_graph_requirements_calculator",
+                      "VectorizedTempGraphRequirementsCalculator")
+    )
 
     weather_forecast_timezone = providers.Callable(gettz, config.weather_server_timezone)
-    weather_forecast_reader = providers.Singleton(SoftMSyncWeatherForecastJSONReader,
-                                                  weather_data_timezone=weather_forecast_timezone)
-    weather_forecast_loader = providers.Singleton(SoftMAsyncWeatherForecastOnlineLoader,
-                                                  weather_reader=weather_forecast_reader)
-
-    temp_requirements_repository = providers.Singleton(TempRequirementsDBAsyncFakeRepository)
-
-    temp_requirements_service = providers.Singleton(SimpleTempRequirementsService,
-                                                    temp_graph_loader=temp_graph_loader,
-                                                    weather_loader=weather_forecast_loader,
-                                                    temp_requirements_repository=temp_requirements_repository,
-                                                    temp_graph_requirements_calculator=temp_requirements_calculator)
+    weather_forecast_reader = providers.Singleton(
+        lazy_callable("boiler_softm.weather.io.sync.soft_m_sync_weather_forecast_json_reader",
+                      "SoftMSyncWeatherForecastJSONReader"),
+        weather_data_timezone=weather_forecast_timezone
+    )
+    weather_forecast_loader = providers.Singleton(
+        lazy_callable("backend.utils.softm_loaders", "make_weather_forecast_loader"),
+        weather_reader=weather_forecast_reader,
+        server_address=config.weather_server_address
+    )
+
+    temp_requirements_repository = providers.Singleton(
+        lazy_callable("backend.repositories.temp_requirements_sqlite_repository",
+                      "TempRequirementsSQLiteRepository"),
+        db_path=config.temp_requirements_db_path
+    )
+
+    temp_requirements_service = providers.Singleton(
+        lazy_callable("backend.services.temp_requirements_update_service.simple_temp_requirements_service",
+                      "SimpleTempRequirementsService"),
+        temp_graph_loader=temp_graph_loader,
+        weather_loader=weather_forecast_loader,
+        temp_requirements_repository=temp_requirements_repository,
+        temp_graph_requirements_calculator=temp_requirements_calculator,
+        executor=executor
+    )
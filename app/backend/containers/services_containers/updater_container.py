@@ -1,11 +1,6 @@
-import pandas as pd
 from dependency_injector import containers, providers
 
-from updater.updater_service.simple_updater_service import SimpleUpdaterService
-from backend.services.control_action_prediction_service.control_action_updatable_item import ControlActionUpdatableItem
-from backend.services.temp_graph_update_service.temp_graph_updatable_item import TempGraphUpdatableItem
-from backend.services.temp_requirements_update_service.temp_requirements_updatable_item import \
-    TempRequirementsUpdatableItem
+from backend.utils.lazy_import import lazy_callable
 
 
 class UpdateContainer(containers.DeclarativeContainer):
@@ -15,24 +10,39 @@ class UpdateContainer(containers.DeclarativeContainer):
     temp_graph_updater = providers.Dependency()
     temp_requirements_calculator = providers.Dependency()
 
-    temp_graph_update_interval = providers.Callable(pd.Timedelta,
-                                                    seconds=config.temp_graph_update_interval)
-    temp_graph_updatable_item = providers.Singleton(TempGraphUpdatableItem,
-                                                    provider=temp_graph_updater.provider,
-                                                    update_interval=temp_graph_update_interval)
+    temp_graph_update_interval = providers.Callable(
+        lazy_callable("pandas", "Timedelta"),
+        seconds=config.temp_graph_update_interval
+    )
+    temp_graph_updatable_item = providers.Singleton(
+        lazy_callable("backend.services.temp_graph_update_service.temp_graph_updatable_item",
+                      "TempGraphUpdatableItem"),
+        provider=temp_graph_updater.provider,
+        update_interval=temp_graph_update_interval
+    )
 
-    temp_requirements_update_interval = providers.Callable(pd.Timedelta,
-                                                           seconds=config.temp_requirements_update_interval)
-    temp_requirements_updatable_item = providers.Singleton(TempRequirementsUpdatableItem,
-                                                           provider=temp_requirements_calculator.provider,
-                                                           update_interval=temp_requirements_update_interval)
+    temp_requirements_update_interval = providers.Callable(
+        lazy_callable("pandas", "Timedelta"),
+        seconds=config.temp_requirements_update_interval
+    )
+    temp_requirements_updatable_item = providers.Singleton(
+        lazy_callable("backend.services.temp_requirements_update_service.temp_requirements_updatable_item",
+                      "TempRequirementsUpdatableItem"),
+        provider=temp_requirements_calculator.provider,
+        update_interval=temp_requirements_update_interval
+    )
 
-    control_action_updatable_item = providers.Singleton(ControlActionUpdatableItem,
-                                                        provider=control_actions_predictor.provider,
-                                                        dependencies=providers.List(
-                                                            temp_graph_updatable_item,
-                                                            temp_requirements_updatable_item
-                                                        ))
+    control_action_updatable_item = providers.Singleton(
+        lazy_callable("backend.services.control_action_prediction_service.control_action_updatable_item",
+                      "ControlActionUpdatableItem"),
+        provider=control_actions_predictor.provider,
+        dependencies=providers.List(
+            temp_graph_updatable_item,
+            temp_requirements_updatable_item
+        )
+    )
 
-    updater_service = providers.Singleton(SimpleUpdaterService,
-                                          item_to_update=control_action_updatable_item)
+    updater_service = providers.Singleton(
+        lazy_callable("updater.updater_service.simple_updater_service", "SimpleUpdaterService"),
+        item_to_update=control_action_updatable_item
+    )
@@ -0,0 +1,98 @@
+from dependency_injector import containers, providers
+
+from backend.containers.services_containers.control_action_container import ControlActionContainer
+from backend.containers.services_containers.temp_graph_container import TempGraphContainer
+from backend.containers.services_containers.temp_requirements_container import TempRequirementsContainer
+from backend.utils.lazy_import import lazy_callable
+
+
+class HeatingNetworkContainer(containers.DeclarativeContainer):
+    """
+    Расчёт требований к температуре теплоносителя, общий для станций
+    с одним прогнозом погоды и одним температурным графиком.
+    """
+
+    config = providers.Configuration()
+
+    weather_forecast_loader = providers.Dependency()
+    temp_graph_loader = providers.Dependency()
+    update_semaphore = providers.Dependency()
+    executor = providers.Dependency()
+
+    temp_graph_pkg = providers.Container(
+        TempGraphContainer,
+        config=config.temp_graph_providing,
+        temp_graph_loader=temp_graph_loader
+    )
+
+    temp_requirements_pkg = providers.Container(
+        TempRequirementsContainer,
+        config=config.temp_requirements_calculation,
+        temp_graph_loader=temp_graph_pkg.temp_graph_dumper_loader,
+        weather_forecast_loader=weather_forecast_loader,
+        executor=executor
+    )
+
+    temp_graph_update_interval = providers.Callable(
+        lazy_callable("pandas", "Timedelta"),
+        seconds=config.updater.temp_graph_update_interval
+    )
+    temp_graph_updatable_item = providers.Singleton(
+        lazy_callable("backend.services.temp_graph_update_service.temp_graph_updatable_item",
+                      "TempGraphUpdatableItem"),
+        provider=temp_graph_pkg.temp_graph_update_service.provider,
+        update_semaphore=update_semaphore,
+        update_interval=temp_graph_update_interval
+    )
+
+    temp_requirements_update_interval = providers.Callable(
+        lazy_callable("pandas", "Timedelta"),
+        seconds=config.updater.temp_requirements_update_interval
+    )
+    temp_requirements_updatable_item = providers.Singleton(
+        lazy_callable("backend.services.temp_requirements_update_service.temp_requirements_updatable_item",
+                      "TempRequirementsUpdatableItem"),
+        provider=temp_requirements_pkg.temp_requirements_service.provider,
+        update_semaphore=update_semaphore,
+        update_interval=temp_requirements_update_interval
+    )
+
+
+class StationContainer(containers.DeclarativeContainer):
+    """
+    Предсказание управляющих воздействий одной станции.
+    Требования к температуре теплоносителя берутся из тепловой сети станции.
+    """
+
+    config = providers.Configuration()
+
+    settings_service = providers.Dependency()
+    temp_requirements_repository = providers.Dependency()
+    temp_graph_updatable_item = providers.Dependency()
+    temp_requirements_updatable_item = providers.Dependency()
+    update_semaphore = providers.Dependency()
+    executor = providers.Dependency()
+
+    control_action_pkg = providers.Container(
+        ControlActionContainer,
+        config=config.boiler_temp_prediction,
+        settings_service=settings_service,
+        temp_requirements_repository=temp_requirements_repository,
+        executor=executor
+    )
+
+    control_action_updatable_item = providers.Singleton(
+        lazy_callable("backend.services.control_action_prediction_service.control_action_updatable_item",
+                      "ControlActionUpdatableItem"),
+        provider=control_action_pkg.temp_prediction_service.provider,
+        update_semaphore=update_semaphore,
+        dependencies=providers.List(
+            temp_graph_updatable_item,
+            temp_requirements_updatable_item
+        )
+    )
+
+    updater_service = providers.Singleton(
+        lazy_callable("updater.updater_service.simple_updater_service", "SimpleUpdaterService"),
+        item_to_update=control_action_updatable_item
+    )
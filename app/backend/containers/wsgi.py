@@ -1,26 +1,35 @@
 from dependency_injector import containers, providers
-# noinspection SpellCheckingInspection
-import uvicorn
 
-from backend.resources.fastapi_app import FastAPIApp
-from backend.web import api_v1, api_v2
+from backend.utils.lazy_import import lazy_callable, lazy_resource
+
+
+def get_api_routers() -> list:
+    # Модули API импортируют FastAPI и pydantic, поэтому импортируются при создании приложения
+    from backend.web import api_health, api_stations, api_v1, api_v2
+    return [
+        api_v1.api_router,
+        api_v2.api_router,
+        api_stations.api_router,
+        api_health.api_router
+    ]
 
 
 class WSGI(containers.DeclarativeContainer):
     config = providers.Configuration()
 
-    routers = providers.Object([
-        api_v1.api_router,
-        api_v2.api_router
-    ])
+    health_service = providers.Object(None)
+
+    routers = providers.Singleton(get_api_routers)
 
     app = providers.Resource(
-        FastAPIApp,
-        api_routers=routers
+        lazy_resource("backend.resources.fastapi_app", "FastAPIApp"),
+        api_routers=routers,
+        health_service=health_service
     )
 
+    # noinspection SpellCheckingInspection
     server_config = providers.Singleton(
-        uvicorn.Config,
+        lazy_callable("uvicorn", "Config"),
         app=app,
         host=config.host,
         port=config.port,
@@ -28,6 +37,6 @@ class WSGI(containers.DeclarativeContainer):
     )
 
     server = providers.Singleton(
-        uvicorn.Server,
+        lazy_callable("uvicorn", "Server"),
         config=server_config
     )
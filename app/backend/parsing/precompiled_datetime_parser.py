@@ -0,0 +1,67 @@
+import functools
+import logging
+import re
+from datetime import datetime, tzinfo
+from typing import Iterable, Optional
+
+from boiler.parsing_utils.datetime_parsing import parse_datetime
+
+
+class PrecompiledDatetimeParser:
+    """
+    Разбор даты и времени по списку шаблонов из конфигов.
+    Шаблоны компилируются один раз при создании, последний сработавший шаблон проверяется первым,
+    результаты для повторяющихся строк запоминаются.
+    Строка должна соответствовать шаблону целиком.
+    Если строке соответствуют несколько шаблонов, используется первый из них в порядке конфига,
+    поэтому результат не зависит от предыдущих запросов:
+    после совпадения с последним сработавшим шаблоном проверяются шаблоны, стоящие в конфиге перед ним.
+    """
+
+    DEFAULT_CACHE_SIZE = 4096
+
+    def __init__(self,
+                 datetime_patterns: Iterable[str],
+                 cache_size: Optional[int] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance")
+
+        if cache_size is None:
+            cache_size = self.DEFAULT_CACHE_SIZE
+
+        self._datetime_patterns = tuple(datetime_patterns)
+        self._compiled_patterns = tuple(re.compile(pattern) for pattern in self._datetime_patterns)
+        self._last_matched_pattern_idx = 0
+        self._parse_datetime_cached = functools.lru_cache(maxsize=cache_size)(self._parse_datetime)
+
+        self._logger.debug(f"Compiled {len(self._compiled_patterns)} datetime patterns")
+
+    def parse_datetime(self, datetime_as_str: str, timezone: Optional[tzinfo] = None) -> datetime:
+        return self._parse_datetime_cached(datetime_as_str, timezone)
+
+    def _parse_datetime(self, datetime_as_str: str, timezone: Optional[tzinfo]) -> datetime:
+        pattern_idx = self._find_pattern_idx(datetime_as_str)
+        if pattern_idx is not None:
+            try:
+                return parse_datetime(datetime_as_str, (self._datetime_patterns[pattern_idx],), timezone=timezone)
+            except ValueError:
+                self._logger.debug(f"Pattern {self._datetime_patterns[pattern_idx]} is matched, but not parsed "
+                                   f"\"{datetime_as_str}\", falling back to all patterns")
+        return parse_datetime(datetime_as_str, self._datetime_patterns, timezone=timezone)
+
+    def _find_pattern_idx(self, datetime_as_str: str) -> Optional[int]:
+        last_matched_pattern_idx = self._last_matched_pattern_idx
+        if last_matched_pattern_idx < len(self._compiled_patterns) and \
+                self._compiled_patterns[last_matched_pattern_idx].fullmatch(datetime_as_str) is not None:
+            # Шаблон, стоящий в конфиге раньше, имеет приоритет
+            patterns_count = last_matched_pattern_idx
+        else:
+            patterns_count = len(self._compiled_patterns)
+            last_matched_pattern_idx = None
+
+        for pattern_idx in range(patterns_count):
+            if self._compiled_patterns[pattern_idx].fullmatch(datetime_as_str) is not None:
+                self._last_matched_pattern_idx = pattern_idx
+                return pattern_idx
+
+        return last_matched_pattern_idx
@@ -0,0 +1,69 @@
+import logging
+import secrets
+from typing import Optional
+
+import pandas as pd
+
+from backend.repositories.control_actions_snapshot import ControlActionsSnapshot
+from backend.repositories.shared_control_actions_snapshot import SharedControlActionsSnapshotWriter
+
+
+class ControlActionsColumnarRepository:
+    """
+    Хранилище управляющих воздействий на основе отсортированных массивов.
+    Поиск диапазона выполняется бинарным поиском, запросы не копируют всё хранилище.
+    Каждая запись строит новый неизменяемый срез и подменяет ссылку на него целиком,
+    поэтому читатели, получившие срез до записи, продолжают работать с согласованными данными.
+    Новые данные вливаются слиянием отсортированных массивов за линейное время,
+    устаревшие данные отбрасываются отсечением начала массивов без копирования.
+    Если задан snapshot_publisher, каждый новый срез публикуется для процессов API.
+    Срезы помечаются случайным boot_token хранилища, чтобы версии срезов разных запусков не совпадали.
+    """
+
+    def __init__(self, snapshot_publisher: Optional[SharedControlActionsSnapshotWriter] = None):
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance of provider")
+
+        self._boot_token = secrets.randbits(64)
+        self._snapshot = ControlActionsSnapshot.empty(boot_token=self._boot_token)
+        self._snapshot_publisher = snapshot_publisher
+
+    def get_snapshot(self) -> ControlActionsSnapshot:
+        return self._snapshot
+
+    async def get_control_action(self, start_datetime: pd.Timestamp = None, end_datetime: pd.Timestamp = None):
+        self._logger.debug(f"Requested boiler control action from {start_datetime} to {end_datetime}")
+
+        snapshot = self._snapshot
+        start_idx, end_idx = snapshot.get_bounds(start_datetime, end_datetime)
+        return snapshot.to_dataframe(start_idx, end_idx)
+
+    async def set_control_action(self, boiler_control_df: pd.DataFrame):
+        self._logger.debug("Boiler control action is stored")
+        self._set_snapshot(ControlActionsSnapshot.from_dataframe(
+            boiler_control_df,
+            version=self._next_version(),
+            boot_token=self._boot_token
+        ))
+
+    async def update_control_action(self, boiler_control_df: pd.DataFrame):
+        self._logger.debug("Stored boiler control action is updated")
+
+        new_snapshot = ControlActionsSnapshot.from_dataframe(boiler_control_df)
+        self._set_snapshot(self._snapshot.merge(new_snapshot, version=self._next_version()))
+
+    async def delete_control_action_older_than(self, datetime: pd.Timestamp):
+        self._logger.debug(f"Requested deleting boiler control data older than {datetime}")
+
+        snapshot = self._snapshot
+        if len(snapshot) == 0 or snapshot.timestamps[0] >= pd.Timestamp(datetime).value:
+            return
+        self._set_snapshot(snapshot.trim_head(datetime, version=self._next_version()))
+
+    def _next_version(self) -> int:
+        return self._snapshot.version + 1
+
+    def _set_snapshot(self, snapshot: ControlActionsSnapshot) -> None:
+        self._snapshot = snapshot
+        if self._snapshot_publisher is not None:
+            self._snapshot_publisher.publish(snapshot)
@@ -0,0 +1,47 @@
+import logging
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class ControlActionResponseCache:
+    """
+    Ограниченный LRU-кэш заранее сформированных ответов с управляющими воздействиями.
+    Кэш сбрасывается при увеличении номера поколения,
+    которое увеличивается при публикации новых управляющих воздействий.
+    """
+
+    DEFAULT_MAX_SIZE = 256
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance of cache")
+
+        if max_size is None:
+            max_size = self.DEFAULT_MAX_SIZE
+        self._max_size = max_size
+        self._generation = 0
+        self._responses = OrderedDict()
+
+        self._logger.debug(f"Max size is {max_size}")
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def bump_generation(self) -> int:
+        self._generation += 1
+        self._responses.clear()
+        self._logger.debug(f"Generation is bumped to {self._generation}")
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        content = self._responses.get(key)
+        if content is not None:
+            self._responses.move_to_end(key)
+        return content
+
+    def put(self, key: Hashable, content: bytes) -> None:
+        self._responses[key] = content
+        self._responses.move_to_end(key)
+        while len(self._responses) > self._max_size:
+            self._responses.popitem(last=False)
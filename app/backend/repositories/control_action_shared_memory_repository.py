@@ -0,0 +1,30 @@
+import logging
+
+import pandas as pd
+
+from backend.repositories.control_actions_snapshot import ControlActionsSnapshot
+from backend.repositories.shared_control_actions_snapshot import SharedControlActionsSnapshotReader
+
+
+class ControlActionsSharedMemoryRepository:
+    """
+    Хранилище управляющих воздействий только для чтения для процессов API.
+    Срез читается из memory-mapped файла, в который его публикует процесс обновления.
+    Метки времени возвращаются в UTC.
+    """
+
+    def __init__(self, snapshot_reader: SharedControlActionsSnapshotReader):
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance of provider")
+
+        self._snapshot_reader = snapshot_reader
+
+    def get_snapshot(self) -> ControlActionsSnapshot:
+        return self._snapshot_reader.get_snapshot()
+
+    async def get_control_action(self, start_datetime: pd.Timestamp = None, end_datetime: pd.Timestamp = None):
+        self._logger.debug(f"Requested boiler control action from {start_datetime} to {end_datetime}")
+
+        snapshot = self.get_snapshot()
+        start_idx, end_idx = snapshot.get_bounds(start_datetime, end_datetime)
+        return snapshot.to_dataframe(start_idx, end_idx)
@@ -0,0 +1,164 @@
+from datetime import tzinfo
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from boiler.constants import column_names
+
+
+class ControlActionsSnapshot:
+    """
+    Неизменяемый срез управляющих воздействий.
+    Хранит отсортированные метки времени (int64, наносекунды от эпохи в UTC)
+    и температуры в виде массивов только для чтения.
+
+    Версия - счётчик записей хранилища, который начинается заново после перезапуска,
+    поэтому срез идентифицируется парой (boot_token, version),
+    где boot_token - случайное число, выбранное хранилищем при создании.
+    Срезы, полученные слиянием и отсечением, сохраняют boot_token исходного среза.
+    """
+
+    __slots__ = ("_timestamps", "_forward_temps", "_timezone", "_version", "_boot_token")
+
+    def __init__(self,
+                 timestamps: np.ndarray,
+                 forward_temps: np.ndarray,
+                 timezone: Optional[tzinfo] = None,
+                 version: int = 0,
+                 boot_token: int = 0) -> None:
+        timestamps.flags.writeable = False
+        forward_temps.flags.writeable = False
+
+        self._timestamps = timestamps
+        self._forward_temps = forward_temps
+        self._timezone = timezone
+        self._version = version
+        self._boot_token = boot_token
+
+    @classmethod
+    def empty(cls, version: int = 0, boot_token: int = 0) -> "ControlActionsSnapshot":
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64),
+                   version=version, boot_token=boot_token)
+
+    @classmethod
+    def from_dataframe(cls,
+                       control_actions_df: pd.DataFrame,
+                       version: int = 0,
+                       boot_token: int = 0) -> "ControlActionsSnapshot":
+        datetime_index = pd.DatetimeIndex(control_actions_df[column_names.TIMESTAMP])
+        return cls.from_arrays(
+            datetime_index.asi8,
+            control_actions_df[column_names.FORWARD_PIPE_COOLANT_TEMP].to_numpy(dtype=np.float64),
+            datetime_index.tz,
+            version,
+            boot_token
+        )
+
+    @classmethod
+    def from_arrays(cls,
+                    timestamps: np.ndarray,
+                    forward_temps: np.ndarray,
+                    timezone: Optional[tzinfo] = None,
+                    version: int = 0,
+                    boot_token: int = 0) -> "ControlActionsSnapshot":
+        # Сортировка устойчивая, поэтому из записей с одинаковой меткой времени остаётся последняя
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        forward_temps = forward_temps[order]
+        is_last_duplicate = np.empty(len(timestamps), dtype=np.bool_)
+        is_last_duplicate[:-1] = timestamps[1:] != timestamps[:-1]
+        is_last_duplicate[-1:] = True
+
+        return cls(timestamps[is_last_duplicate], forward_temps[is_last_duplicate], timezone, version, boot_token)
+
+    def merge(self, other: "ControlActionsSnapshot", version: int = 0) -> "ControlActionsSnapshot":
+        """
+        Слияние за линейное время с другим срезом.
+        При совпадении меток времени остаются значения из other.
+        """
+        timezone = other.timezone if other.timezone is not None else self._timezone
+        if len(other) == 0:
+            return ControlActionsSnapshot(self._timestamps, self._forward_temps, timezone, version, self._boot_token)
+        if len(self) == 0 or self._timestamps[-1] < other.timestamps[0]:
+            return ControlActionsSnapshot(
+                np.concatenate((self._timestamps, other.timestamps)),
+                np.concatenate((self._forward_temps, other.forward_temps)),
+                timezone,
+                version,
+                self._boot_token
+            )
+
+        insert_positions = self._timestamps.searchsorted(other.timestamps, side="left")
+        is_in_bounds = insert_positions < len(self)
+        is_duplicate = np.zeros(len(other), dtype=np.bool_)
+        is_duplicate[is_in_bounds] = \
+            self._timestamps[insert_positions[is_in_bounds]] == other.timestamps[is_in_bounds]
+        is_kept = np.ones(len(self), dtype=np.bool_)
+        is_kept[insert_positions[is_duplicate]] = False
+
+        kept_before_count = np.concatenate(([0], np.cumsum(is_kept)))[insert_positions]
+        other_positions = kept_before_count + np.arange(len(other))
+        merged_size = int(is_kept.sum()) + len(other)
+        is_from_other = np.zeros(merged_size, dtype=np.bool_)
+        is_from_other[other_positions] = True
+
+        timestamps = np.empty(merged_size, dtype=np.int64)
+        forward_temps = np.empty(merged_size, dtype=np.float64)
+        timestamps[is_from_other] = other.timestamps
+        forward_temps[is_from_other] = other.forward_temps
+        timestamps[~is_from_other] = self._timestamps[is_kept]
+        forward_temps[~is_from_other] = self._forward_temps[is_kept]
+
+        return ControlActionsSnapshot(timestamps, forward_temps, timezone, version, self._boot_token)
+
+    def trim_head(self, start_datetime: pd.Timestamp, version: int = 0) -> "ControlActionsSnapshot":
+        start_idx, end_idx = self.get_bounds(start_datetime=start_datetime)
+        return ControlActionsSnapshot(*self.get_arrays(start_idx, end_idx), self._timezone, version, self._boot_token)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps
+
+    @property
+    def forward_temps(self) -> np.ndarray:
+        return self._forward_temps
+
+    @property
+    def timezone(self) -> Optional[tzinfo]:
+        return self._timezone
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def boot_token(self) -> int:
+        return self._boot_token
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def get_bounds(self,
+                   start_datetime: Optional[pd.Timestamp] = None,
+                   end_datetime: Optional[pd.Timestamp] = None) -> Tuple[int, int]:
+        start_idx = 0
+        if start_datetime is not None:
+            start_idx = int(self._timestamps.searchsorted(pd.Timestamp(start_datetime).value, side="left"))
+        end_idx = len(self._timestamps)
+        if end_datetime is not None:
+            end_idx = int(self._timestamps.searchsorted(pd.Timestamp(end_datetime).value, side="right"))
+        return start_idx, max(start_idx, end_idx)
+
+    def get_arrays(self, start_idx: int, end_idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self._timestamps[start_idx:end_idx], self._forward_temps[start_idx:end_idx]
+
+    def to_dataframe(self, start_idx: int = 0, end_idx: Optional[int] = None) -> pd.DataFrame:
+        timestamps, forward_temps = self.get_arrays(start_idx, end_idx)
+        datetime_index = pd.to_datetime(timestamps, utc=True)
+        if self._timezone is not None:
+            datetime_index = datetime_index.tz_convert(self._timezone)
+        return pd.DataFrame({
+            column_names.TIMESTAMP: datetime_index,
+            column_names.FORWARD_PIPE_COOLANT_TEMP: forward_temps
+        })
@@ -0,0 +1,65 @@
+"""
+Запись пакета динамических настроек одной транзакцией БД настроек.
+
+Строки настроек пишет репозиторий библиотеки dynamic_settings (DBSettingsRepository) со своими конвертерами типов,
+но его сессии привязаны к соединению, в котором уже начата транзакция db_engine.begin().
+Сессия, привязанная к соединению с начатой транзакцией, не фиксирует её при commit,
+поэтому все настройки пакета и увеличение счётчика изменений фиксируются вместе при выходе из begin()
+или откатываются вместе при ошибке.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from dynamic_settings.repository.db_settings_repository import DBSettingsRepository
+from dynamic_settings.service.simple_settings_service import SimpleSettingsService
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from backend.repositories.settings_version_repository import SettingsVersionRepository
+
+
+class SettingsBatchRepository:
+
+    def __init__(self,
+                 db_engine: AsyncEngine,
+                 dtype_converters: List,
+                 settings_version_repository: SettingsVersionRepository,
+                 defaults: Optional[Dict[str, Any]] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance of repository")
+
+        self._db_engine = db_engine
+        self._dtype_converters = dtype_converters
+        self._settings_version_repository = settings_version_repository
+        self._defaults = defaults
+
+    async def set_many_settings_async(self, settings: Dict[str, Any]) -> int:
+        """
+        Записывает настройки и увеличивает счётчик изменений в одной транзакции.
+        Возвращает новое значение счётчика.
+        """
+        async with self._db_engine.begin() as conn:
+            settings_service = await self._make_settings_service(conn)
+            for setting_name, setting_value in settings.items():
+                await settings_service.set_one_setting_async(setting_name, setting_value)
+            version = await self._settings_version_repository.increment_version_async(conn)
+        self._logger.debug(f"Settings {list(settings)} are written with version {version}")
+        return version
+
+    async def _make_settings_service(self, conn: AsyncConnection) -> SimpleSettingsService:
+        session_factory = scoped_session(
+            sessionmaker(autocommit=False,
+                         autoflush=False,
+                         bind=conn,
+                         class_=AsyncSession),
+        )
+        settings_service = SimpleSettingsService(
+            settings_repository=DBSettingsRepository(
+                session_factory=session_factory,
+                dtype_converters=self._dtype_converters
+            ),
+            defaults=self._defaults
+        )
+        await settings_service.initialize_service()
+        return settings_service
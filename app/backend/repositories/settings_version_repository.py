@@ -0,0 +1,72 @@
+"""
+Счётчик изменений динамических настроек в БД настроек.
+
+Каждая запись настроек через приложение увеличивает счётчик, поэтому процессы,
+держащие настройки в памяти, узнают об изменении одним дешёвым запросом
+и перечитывают настройки только тогда, когда счётчик вырос.
+Счётчик хранится в отдельной таблице из одной строки, таблица настроек библиотеки dynamic_settings не меняется.
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import Column, Integer, MetaData, Table, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+SETTINGS_VERSION_ROW_ID = 1
+
+settings_version_metadata = MetaData()
+settings_version_table = Table(
+    "settings_version",
+    settings_version_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False)
+)
+
+
+class SettingsVersionRepository:
+
+    def __init__(self, db_engine: AsyncEngine) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance of repository")
+
+        self._db_engine = db_engine
+
+    async def initialize_async(self) -> None:
+        async with self._db_engine.begin() as conn:
+            await conn.run_sync(settings_version_metadata.create_all)
+        try:
+            async with self._db_engine.begin() as conn:
+                if await self._select_version(conn) is None:
+                    await conn.execute(insert(settings_version_table).values(id=SETTINGS_VERSION_ROW_ID, version=0))
+        except IntegrityError:
+            # Строку одновременно создал другой процесс
+            pass
+
+    async def get_version_async(self) -> int:
+        async with self._db_engine.connect() as conn:
+            version = await self._select_version(conn)
+        return version or 0
+
+    async def increment_version_async(self, conn: Optional[AsyncConnection] = None) -> int:
+        # Если передано соединение, счётчик увеличивается в уже начатой на нём транзакции
+        if conn is None:
+            async with self._db_engine.begin() as conn:
+                return await self.increment_version_async(conn)
+
+        await conn.execute(
+            update(settings_version_table)
+            .where(settings_version_table.c.id == SETTINGS_VERSION_ROW_ID)
+            .values(version=settings_version_table.c.version + 1)
+        )
+        version = await self._select_version(conn)
+        self._logger.debug(f"Settings version is incremented to {version}")
+        return version
+
+    @staticmethod
+    async def _select_version(conn):
+        result = await conn.execute(
+            select(settings_version_table.c.version).where(settings_version_table.c.id == SETTINGS_VERSION_ROW_ID)
+        )
+        return result.scalar()
@@ -0,0 +1,172 @@
+"""
+Публикация среза управляющих воздействий в разделяемый memory-mapped файл.
+
+Процесс обновления пишет срез в файл, процессы API читают его без блокировок.
+Согласованность обеспечивается счётчиком последовательности (seqlock):
+писатель делает счётчик нечётным перед записью и чётным после неё,
+читатель копирует данные и повторяет чтение, если счётчик был нечётным
+или изменился за время копирования.
+
+Раскладка файла:
+    заголовок (HEADER_DTYPE), метки времени int64[capacity], температуры float64[capacity].
+
+В заголовке также публикуется версия динамических настроек (settings_version),
+по которой процессы API узнают, что настройки изменились, и сбрасывают свои кэши настроек.
+Она пишется одним словом вне счётчика последовательности и не связана со срезом.
+"""
+
+import logging
+import mmap
+import os
+import tempfile
+import time
+from typing import Optional
+
+import numpy as np
+
+from backend.repositories.control_actions_snapshot import ControlActionsSnapshot
+
+MAGIC = b"BCCASNP3"
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("sequence", "<u8"),
+    ("capacity", "<u8"),
+    ("count", "<u8"),
+    ("version", "<i8"),
+    ("boot_token", "<u8"),
+    ("settings_version", "<u8"),
+])
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "boiler_control_actions.snapshot")
+DEFAULT_CAPACITY = 65536
+MAX_READ_ATTEMPTS = 1000
+
+
+def _get_file_size(capacity: int) -> int:
+    return HEADER_DTYPE.itemsize + capacity * (np.dtype(np.int64).itemsize + np.dtype(np.float64).itemsize)
+
+
+def _map_arrays(buffer, capacity: int):
+    header = np.frombuffer(buffer, dtype=HEADER_DTYPE, count=1)
+    timestamps = np.frombuffer(buffer, dtype="<i8", count=capacity, offset=HEADER_DTYPE.itemsize)
+    forward_temps = np.frombuffer(buffer, dtype="<f8", count=capacity,
+                                  offset=HEADER_DTYPE.itemsize + timestamps.nbytes)
+    return header, timestamps, forward_temps
+
+
+class SharedControlActionsSnapshotWriter:
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 capacity: Optional[int] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance")
+
+        if path is None:
+            path = DEFAULT_PATH
+        if capacity is None:
+            capacity = DEFAULT_CAPACITY
+        self._path = os.path.abspath(path)
+        self._capacity = capacity
+
+        # Файл создаётся под временным именем и подменяется целиком,
+        # поэтому читатели никогда не видят файл без заголовка.
+        tmp_path = f"{self._path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.truncate(_get_file_size(capacity))
+        with open(tmp_path, "r+b") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0)
+        self._header, self._timestamps, self._forward_temps = _map_arrays(self._mmap, capacity)
+        self._header["magic"] = MAGIC
+        self._header["capacity"] = capacity
+        os.replace(tmp_path, self._path)
+
+        self._logger.debug(f"Shared snapshot file {self._path} with capacity {capacity} is created")
+
+    def publish(self, snapshot: ControlActionsSnapshot) -> None:
+        count = len(snapshot)
+        if count > self._capacity:
+            self._logger.warning(f"Snapshot size {count} exceeds shared capacity {self._capacity}, "
+                                 f"only first {self._capacity} control actions are published")
+            count = self._capacity
+
+        sequence = int(self._header["sequence"][0])
+        self._header["sequence"] = sequence + 1
+        self._timestamps[:count] = snapshot.timestamps[:count]
+        self._forward_temps[:count] = snapshot.forward_temps[:count]
+        self._header["count"] = count
+        self._header["version"] = snapshot.version
+        self._header["boot_token"] = snapshot.boot_token
+        self._header["sequence"] = sequence + 2
+
+        self._logger.debug(f"Snapshot version {snapshot.version} with {count} control actions is published")
+
+    def publish_settings_version(self, settings_version: int) -> None:
+        self._header["settings_version"] = settings_version
+        self._logger.debug(f"Settings version {settings_version} is published")
+
+    def close(self) -> None:
+        del self._header, self._timestamps, self._forward_temps
+        self._mmap.close()
+
+
+class SharedControlActionsSnapshotReader:
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance")
+
+        if path is None:
+            path = DEFAULT_PATH
+        self._path = os.path.abspath(path)
+        self._mmap = None
+        self._header = None
+        self._timestamps = None
+        self._forward_temps = None
+        self._last_sequence = None
+        self._last_snapshot = ControlActionsSnapshot.empty()
+
+    def get_snapshot(self) -> ControlActionsSnapshot:
+        if self._mmap is None and not self._open():
+            return self._last_snapshot
+
+        for _ in range(MAX_READ_ATTEMPTS):
+            sequence = int(self._header["sequence"][0])
+            if sequence == self._last_sequence:
+                return self._last_snapshot
+            if sequence % 2 == 1:
+                time.sleep(0)
+                continue
+
+            count = int(self._header["count"][0])
+            version = int(self._header["version"][0])
+            boot_token = int(self._header["boot_token"][0])
+            timestamps = self._timestamps[:count].copy()
+            forward_temps = self._forward_temps[:count].copy()
+
+            if int(self._header["sequence"][0]) == sequence:
+                self._last_sequence = sequence
+                self._last_snapshot = ControlActionsSnapshot(timestamps, forward_temps,
+                                                            version=version, boot_token=boot_token)
+                return self._last_snapshot
+
+        self._logger.warning("Shared snapshot is being rewritten too often, previous snapshot is returned")
+        return self._last_snapshot
+
+    def get_settings_version(self) -> Optional[int]:
+        if self._mmap is None and not self._open():
+            return None
+        return int(self._header["settings_version"][0])
+
+    def _open(self) -> bool:
+        try:
+            with open(self._path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return False
+
+        header = np.frombuffer(self._mmap, dtype=HEADER_DTYPE, count=1)
+        if header["magic"][0] != MAGIC:
+            raise ValueError(f"{self._path} is not a shared control actions snapshot")
+        self._header, self._timestamps, self._forward_temps = _map_arrays(self._mmap, int(header["capacity"][0]))
+        self._logger.debug(f"Shared snapshot file {self._path} is opened")
+        return True
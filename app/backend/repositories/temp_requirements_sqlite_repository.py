@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from datetime import tzinfo
+from typing import Optional, Tuple
+
+import aiosqlite
+import numpy as np
+import pandas as pd
+from boiler.constants import column_names
+from boiler.temp_requirements.repository.db.async_.temp_requirements_db_async_repository \
+    import TempRequirementsDBAsyncRepository
+
+IN_MEMORY_DB_PATH = ":memory:"
+
+_ROWS_DTYPE = np.dtype([
+    ("timestamp", np.int64),
+    ("forward_temp", np.float64),
+    ("backward_temp", np.float64)
+])
+
+_CREATE_TABLE_QUERY = (
+    "CREATE TABLE IF NOT EXISTS temp_requirements ("
+    "timestamp INTEGER PRIMARY KEY, "
+    "forward_temp REAL NOT NULL, "
+    "backward_temp REAL NOT NULL)"
+)
+_UPSERT_QUERY = (
+    "INSERT OR REPLACE INTO temp_requirements (timestamp, forward_temp, backward_temp) VALUES (?, ?, ?)"
+)
+_SELECT_QUERY = (
+    "SELECT timestamp, forward_temp, backward_temp FROM temp_requirements "
+    "WHERE timestamp >= ? AND timestamp <= ? ORDER BY timestamp"
+)
+_DELETE_ALL_QUERY = "DELETE FROM temp_requirements"
+_DELETE_OLDER_THAN_QUERY = "DELETE FROM temp_requirements WHERE timestamp < ?"
+_DELETE_QUERY = "DELETE FROM temp_requirements WHERE timestamp = ?"
+
+_MIN_TIMESTAMP = np.iinfo(np.int64).min
+_MAX_TIMESTAMP = np.iinfo(np.int64).max
+
+
+class TempRequirementsSQLiteRepository(TempRequirementsDBAsyncRepository):
+    """
+    Хранилище требований к температуре теплоносителя в локальной базе SQLite.
+    Метка времени хранится в наносекундах UTC и является первичным ключом (псевдонимом rowid),
+    поэтому выборка диапазона и удаление устаревших данных выполняются по индексу.
+    set_temp_requirements заменяет все хранимые требования,
+    update_temp_requirements записывает только переданные метки времени (upsert), остальные сохраняются.
+    Обновление записывает весь DataFrame одним executemany в одной транзакции,
+    выборка читается сразу в структурированный массив NumPy.
+    Операции выполняются по одной на соединение, поэтому чтение не видит незавершённую запись.
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance of repository")
+
+        if db_path is None:
+            db_path = IN_MEMORY_DB_PATH
+        self._db_path = db_path
+        self._timezone: Optional[tzinfo] = None
+
+        self._connection: Optional[aiosqlite.Connection] = None
+        self._connection_lock = asyncio.Lock()
+
+    async def get_temp_requirements(self,
+                                    start_datetime: pd.Timestamp = None,
+                                    end_datetime: pd.Timestamp = None) -> pd.DataFrame:
+        self._logger.debug(f"Requested temp requirements from {start_datetime} to {end_datetime}")
+
+        timestamps, forward_temps, backward_temps = \
+            await self.get_temp_requirements_arrays(start_datetime, end_datetime)
+        datetime_index = pd.to_datetime(timestamps, utc=True)
+        if self._timezone is not None:
+            datetime_index = datetime_index.tz_convert(self._timezone)
+        return pd.DataFrame({
+            column_names.TIMESTAMP: datetime_index,
+            column_names.FORWARD_PIPE_COOLANT_TEMP: forward_temps,
+            column_names.BACKWARD_PIPE_COOLANT_TEMP: backward_temps
+        })
+
+    async def get_temp_requirements_arrays(self,
+                                           start_datetime: pd.Timestamp = None,
+                                           end_datetime: pd.Timestamp = None
+                                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        start_timestamp = _MIN_TIMESTAMP if start_datetime is None else pd.Timestamp(start_datetime).value
+        end_timestamp = _MAX_TIMESTAMP if end_datetime is None else pd.Timestamp(end_datetime).value
+
+        async with self._connection_lock:
+            connection = await self._get_connection()
+            async with connection.execute(_SELECT_QUERY, (start_timestamp, end_timestamp)) as cursor:
+                rows = await cursor.fetchall()
+
+        rows_arr = np.array(rows, dtype=_ROWS_DTYPE)
+        return rows_arr["timestamp"], rows_arr["forward_temp"], rows_arr["backward_temp"]
+
+    async def set_temp_requirements(self, temp_requirements_df: pd.DataFrame) -> None:
+        self._logger.debug("Temp requirements are stored")
+        await self._write(temp_requirements_df, replace_all=True)
+
+    async def update_temp_requirements(self, temp_requirements_df: pd.DataFrame) -> None:
+        self._logger.debug("Stored temp requirements are updated")
+        await self._write(temp_requirements_df, replace_all=False)
+
+    async def delete_temp_requirements_older_than(self, datetime: pd.Timestamp) -> None:
+        self._logger.debug(f"Requested deleting temp requirements older than {datetime}")
+
+        async with self._connection_lock:
+            connection = await self._get_connection()
+            await connection.execute(_DELETE_OLDER_THAN_QUERY, (pd.Timestamp(datetime).value,))
+            await connection.commit()
+
+    async def delete_temp_requirements(self, datetimes: pd.DatetimeIndex) -> None:
+        self._logger.debug(f"Requested deleting {len(datetimes)} temp requirements")
+
+        rows = [(timestamp,) for timestamp in pd.DatetimeIndex(datetimes).asi8.tolist()]
+        async with self._connection_lock:
+            connection = await self._get_connection()
+            try:
+                await connection.executemany(_DELETE_QUERY, rows)
+                await connection.commit()
+            except Exception:
+                await connection.rollback()
+                raise
+
+    async def close(self) -> None:
+        async with self._connection_lock:
+            if self._connection is not None:
+                self._logger.debug("Closing db connection")
+                await self._connection.close()
+                self._connection = None
+
+    async def _write(self, temp_requirements_df: pd.DataFrame, replace_all: bool) -> None:
+        datetime_index = pd.DatetimeIndex(temp_requirements_df[column_names.TIMESTAMP])
+        rows = zip(
+            datetime_index.asi8.tolist(),
+            temp_requirements_df[column_names.FORWARD_PIPE_COOLANT_TEMP].to_numpy(dtype=np.float64).tolist(),
+            temp_requirements_df[column_names.BACKWARD_PIPE_COOLANT_TEMP].to_numpy(dtype=np.float64).tolist()
+        )
+
+        async with self._connection_lock:
+            connection = await self._get_connection()
+            try:
+                if replace_all:
+                    await connection.execute(_DELETE_ALL_QUERY)
+                await connection.executemany(_UPSERT_QUERY, rows)
+                await connection.commit()
+            except Exception:
+                await connection.rollback()
+                raise
+
+        if datetime_index.tz is not None:
+            self._timezone = datetime_index.tz
+
+    async def _get_connection(self) -> aiosqlite.Connection:
+        if self._connection is None:
+            self._logger.debug(f"Opening db {self._db_path}")
+            connection = await aiosqlite.connect(self._db_path)
+            if self._db_path != IN_MEMORY_DB_PATH:
+                await connection.execute("PRAGMA journal_mode=WAL")
+                await connection.execute("PRAGMA synchronous=NORMAL")
+            await connection.execute(_CREATE_TABLE_QUERY)
+            await connection.commit()
+            self._connection = connection
+        return self._connection
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from dependency_injector import resources
 from dynamic_settings.repository.db_settings_repository.setting_model import Setting
@@ -11,14 +12,31 @@ class AsyncSettingsDBEngine(resources.AsyncResource):
         self._logger = logging.getLogger(self.__class__.__name__)
         self._logger.debug("Creating instance of Resource")
 
-    async def init(self, db_url: str) -> AsyncEngine:
+    async def init(self,
+                   db_url: str,
+                   pool_size: Optional[int] = None,
+                   max_overflow: Optional[int] = None,
+                   pool_timeout: Optional[float] = None) -> AsyncEngine:
         self._logger.debug(f"Initialize db engine with url: {db_url}")
 
-        db_engine = create_async_engine(db_url)
+        # Параметры пула передаются только если заданы в конфиге:
+        # пулы по умолчанию некоторых диалектов (например, sqlite) их не принимают
+        pool_params = {}
+        if pool_size is not None:
+            pool_params["pool_size"] = pool_size
+        if max_overflow is not None:
+            pool_params["max_overflow"] = max_overflow
+        if pool_timeout is not None:
+            pool_params["pool_timeout"] = pool_timeout
+        if pool_params:
+            self._logger.debug(f"Db engine pool params: {pool_params}")
+
+        db_engine = create_async_engine(db_url, **pool_params)
         async with db_engine.begin() as conn:
             await conn.run_sync(Setting.metadata.create_all)
 
         return db_engine
 
     async def shutdown(self, db_engine: AsyncEngine) -> None:
-        pass
+        self._logger.debug("Disposing db engine")
+        await db_engine.dispose()
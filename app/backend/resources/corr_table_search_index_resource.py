@@ -0,0 +1,33 @@
+import logging
+from typing import Optional
+
+import pandas as pd
+from dependency_injector import resources
+
+from backend.calculators.corr_table_reference_check import check_corr_table_search_index
+from backend.calculators.corr_table_search_index import CorrTableSearchIndex
+
+
+class CorrTableSearchIndexResource(resources.Resource):
+
+    def __init__(self):
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance of Resource")
+
+    def init(self,
+             temp_correlation_table: pd.DataFrame,
+             home_time_deltas: pd.DataFrame,
+             check_with_reference: Optional[bool] = None) -> CorrTableSearchIndex:
+        self._logger.debug("Building temp correlation table search index")
+
+        corr_table_search_index = CorrTableSearchIndex(temp_correlation_table, home_time_deltas)
+
+        # Индекс используется вместо CorrTableTempPredictor только если совпадает с ним на этих таблицах
+        if check_with_reference is None or check_with_reference:
+            self._logger.debug("Checking search index against CorrTableTempPredictor")
+            check_corr_table_search_index(corr_table_search_index, temp_correlation_table, home_time_deltas)
+
+        return corr_table_search_index
+
+    def shutdown(self, corr_table_search_index: CorrTableSearchIndex) -> None:
+        pass
@@ -0,0 +1,63 @@
+import logging
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from dependency_injector import resources
+
+EXECUTOR_KIND_THREAD = "thread"
+EXECUTOR_KIND_PROCESS = "process"
+EXECUTOR_KIND_INLINE = "inline"
+DEFAULT_EXECUTOR_KIND = EXECUTOR_KIND_THREAD
+
+
+class InlineExecutor(Executor):
+    """
+    Выполняет задачу сразу в вызывающем потоке.
+    Используется для отладки и профилирования расчётов без пула.
+    """
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class ExecutorResource(resources.Resource):
+    """
+    Исполнитель для расчётов, занимающих процессор.
+    В пуле процессов расчёты не удерживают GIL процесса, обслуживающего запросы,
+    поэтому задачи должны быть функциями уровня модуля с сериализуемыми аргументами
+    (см. backend.calculators.executor_tasks).
+    """
+
+    def __init__(self):
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance of Resource")
+
+    def init(self,
+             kind: Optional[str] = None,
+             max_workers: Optional[int] = None) -> Executor:
+        if kind is None:
+            kind = DEFAULT_EXECUTOR_KIND
+        self._logger.debug(f"Initialization of {kind} executor with max workers {max_workers}")
+
+        if kind == EXECUTOR_KIND_THREAD:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        elif kind == EXECUTOR_KIND_PROCESS:
+            # spawn, т.к. fork процесса с запущенным циклом событий и потоками небезопасен
+            executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        elif kind == EXECUTOR_KIND_INLINE:
+            executor = InlineExecutor()
+        else:
+            raise ValueError(f"Unknown executor kind {kind}, expected one of "
+                             f"{EXECUTOR_KIND_THREAD}, {EXECUTOR_KIND_PROCESS}, {EXECUTOR_KIND_INLINE}")
+
+        return executor
+
+    def shutdown(self, executor: Executor) -> None:
+        self._logger.debug("Shutdown of executor")
+        executor.shutdown(wait=True)
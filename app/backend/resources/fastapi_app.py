@@ -1,7 +1,48 @@
 import logging
+from typing import Optional
 
 from dependency_injector import resources
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from starlette import status
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.services.health_service.health_service import HealthService
+
+HEALTH_PATH_PREFIX = "/health"
+STARTING_RETRY_AFTER = 1
+
+
+class RejectUntilStartedMiddleware:
+    """
+    ASGI middleware, отвечающая 503 на все запросы кроме проб, пока запуск не завершён.
+    После запуска запросы передаются приложению напрямую, без проверок и обёрток.
+    """
+
+    def __init__(self, app: ASGIApp, health_service: HealthService) -> None:
+        self._app = app
+        self._health_service = health_service
+        self._is_started = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self._is_started:
+            await self._app(scope, receive, send)
+            return
+
+        if scope["type"] != "http" or scope["path"].startswith(HEALTH_PATH_PREFIX):
+            await self._app(scope, receive, send)
+            return
+        if self._health_service.is_started():
+            self._is_started = True
+            await self._app(scope, receive, send)
+            return
+
+        response = JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Application is starting"},
+            headers={"Retry-After": str(STARTING_RETRY_AFTER)}
+        )
+        await response(scope, receive, send)
 
 
 class FastAPIApp(resources.Resource):
@@ -10,13 +51,18 @@ class FastAPIApp(resources.Resource):
         self._logger = logging.getLogger(self.__class__.__name__)
         self._logger.debug("Creating instance of Resource")
 
-    def init(self, api_routers: list) -> FastAPI:
+    def init(self, api_routers: list, health_service: Optional[HealthService] = None) -> FastAPI:
         self._logger.debug("Initialization of FastAPI app")
 
         app = FastAPI()
         for router in api_routers:
             app.include_router(router)
 
+        if health_service is not None:
+            # Сервер принимает соединения до окончания запуска,
+            # до этого все запросы кроме проб получают 503
+            app.add_middleware(RejectUntilStartedMiddleware, health_service=health_service)
+
         return app
 
     def shutdown(self, app: FastAPI) -> None:
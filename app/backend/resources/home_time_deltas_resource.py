@@ -4,6 +4,14 @@ import os
 import pandas as pd
 from dependency_injector import resources
 
+from backend.utils.mmap_table_format import is_mmap_table, load_mmap_table
+
+
+def load_home_time_deltas(homes_deltas_path: str) -> pd.DataFrame:
+    if is_mmap_table(homes_deltas_path):
+        return load_mmap_table(homes_deltas_path)
+    return pd.read_csv(homes_deltas_path)
+
 
 class HomeTimeDeltasResource(resources.Resource):
 
@@ -15,7 +23,9 @@ class HomeTimeDeltasResource(resources.Resource):
         homes_deltas_path = os.path.abspath(homes_deltas_path)
         self._logger.debug(f"Loading home time deltas from {homes_deltas_path}")
 
-        homes_time_deltas = pd.read_csv(homes_deltas_path)
+        if is_mmap_table(homes_deltas_path):
+            self._logger.debug("Memory-mapped table format is detected")
+        homes_time_deltas = load_home_time_deltas(homes_deltas_path)
 
         return homes_time_deltas
 
@@ -4,6 +4,14 @@ import os
 import pandas as pd
 from dependency_injector import resources
 
+from backend.utils.mmap_table_format import is_mmap_table, load_mmap_table
+
+
+def load_temp_correlation_table(temp_correlation_table_path: str) -> pd.DataFrame:
+    if is_mmap_table(temp_correlation_table_path):
+        return load_mmap_table(temp_correlation_table_path)
+    return pd.read_pickle(temp_correlation_table_path)
+
 
 class TempCorrelationTable(resources.Resource):
 
@@ -15,7 +23,9 @@ class TempCorrelationTable(resources.Resource):
         temp_correlation_table_path = os.path.abspath(temp_correlation_table_path)
         self._logger.debug(f"Loading optimized temp table from {temp_correlation_table_path}")
 
-        temp_correlation_table = pd.read_pickle(temp_correlation_table_path)
+        if is_mmap_table(temp_correlation_table_path):
+            self._logger.debug("Memory-mapped table format is detected")
+        temp_correlation_table = load_temp_correlation_table(temp_correlation_table_path)
 
         return temp_correlation_table
 
@@ -1,20 +1,31 @@
-from typing import Optional
+import asyncio
+from typing import Optional, Tuple
 
 from dependency_injector.providers import Provider
 from updater.updatable_item.updatable_item import UpdatableItem
 
 from backend.services.control_action_prediction_service.control_actions_prediction_service \
     import ControlActionPredictionService
+from backend.utils.concurrency import acquire_optional
 
 
 class ControlActionUpdatableItem(UpdatableItem):
 
     def __init__(self,
                  provider: Optional[Provider] = None,
+                 update_semaphore: Optional[asyncio.Semaphore] = None,
                  **kwargs):
         super().__init__(**kwargs)
 
         self._provider = provider
+        # Ограничивает число одновременно выполняемых обновлений у нескольких станций
+        self._update_semaphore = update_semaphore
+
+        # Зависимости публикуют версии своих данных.
+        # Если ни одна версия не изменилась с прошлого запуска, предсказание пропускается.
+        self._input_items = list(kwargs.get("dependencies") or ())
+        self._last_input_versions = None
+        self._skipped_updates_count = 0
 
         self._logger.debug(f"Service provider is set to {provider}")
 
@@ -22,7 +33,30 @@ class ControlActionUpdatableItem(UpdatableItem):
         self._logger.debug(f"Service provider is set to {provider}")
         self._provider = provider
 
+    def get_last_input_versions(self) -> Optional[Tuple]:
+        return self._last_input_versions
+
+    def get_skipped_updates_count(self) -> int:
+        return self._skipped_updates_count
+
     async def _run_update_async(self):
         self._logger.debug("Run update")
         service: ControlActionPredictionService = await self._provider()
-        await service.predict_control_actions_async()
+        await service.refresh_predictor_settings_async()
+        input_versions = self._get_input_versions(service)
+        if self._input_items and input_versions == self._last_input_versions:
+            self._skipped_updates_count += 1
+            self._logger.debug(f"Input data versions {input_versions} are not changed, "
+                               f"control actions prediction is skipped "
+                               f"({self._skipped_updates_count} skipped in total)")
+            await service.drop_expired_control_actions_async()
+            return
+
+        async with acquire_optional(self._update_semaphore):
+            await service.predict_control_actions_async()
+        self._last_input_versions = input_versions
+
+    def _get_input_versions(self, service: ControlActionPredictionService) -> Tuple:
+        # Настройки предсказателя входят в версию, чтобы изменение коэффициента не пропускало предсказание
+        return tuple(input_item.get_data_version() for input_item in self._input_items) + \
+            tuple(service.get_predictor_settings())
@@ -2,3 +2,12 @@ class ControlActionPredictionService:
 
     async def predict_control_actions_async(self):
         raise NotImplementedError
+
+    async def drop_expired_control_actions_async(self):
+        raise NotImplementedError
+
+    async def refresh_predictor_settings_async(self):
+        raise NotImplementedError
+
+    def get_predictor_settings(self) -> tuple:
+        raise NotImplementedError
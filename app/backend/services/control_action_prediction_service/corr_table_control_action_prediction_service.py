@@ -1,5 +1,8 @@
 import asyncio
+import functools
 import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Optional, Tuple
 
 import pandas as pd
 from dateutil.tz import tzlocal
@@ -7,50 +10,156 @@ from dateutil.tz import tzlocal
 from boiler.constants import column_names
 from boiler.temp_requirements.repository.db.async_.temp_requirements_db_async_repository \
     import TempRequirementsDBAsyncRepository
-from boiler.temp_predictors.corr_table_temp_predictor import CorrTableTempPredictor
-from backend.repositories.control_action_simple_repository import ControlActionsSimpleRepository
+from backend.calculators.executor_tasks import predict_control_temps, predict_control_temps_by_paths
+from backend.calculators.indexed_corr_table_temp_predictor import IndexedCorrTableTempPredictor
+from backend.repositories.control_action_columnar_repository import ControlActionsColumnarRepository
+from backend.repositories.control_action_response_cache import ControlActionResponseCache
 from backend.services.control_action_prediction_service.control_actions_prediction_service import \
     ControlActionPredictionService
+from backend.services.dynamic_settings_service.cached_settings_service import CachedSettingsService
+
+HOME_MIN_TEMP_COEFFICIENT_SETTING = "home_min_temp_coefficient"
 
 
 class CorrTableControlActionPredictionService(ControlActionPredictionService):
+    """
+    Долгоживущий сервис предсказания управляющих воздействий.
+
+    Предсказатель создаётся через temp_predictor_factory с коэффициентом из динамических настроек
+    и переиспользуется между запусками. При изменении коэффициента новый предсказатель
+    строится в фоне и подменяет текущий целиком.
+    Запросы на предсказание, пришедшие во время выполнения, объединяются в один следующий запуск.
+
+    В пуле процессов предсказатель не сериализуется на каждый запуск: если заданы пути к таблицам
+    (temp_correlation_table_path, homes_deltas_path), процессы пула загружают индекс по ним один раз,
+    а в задачу передаются только требования к температуре и коэффициент.
+    """
 
     def __init__(self,
-                 temp_predictor: CorrTableTempPredictor = None,
+                 temp_predictor: IndexedCorrTableTempPredictor = None,
+                 temp_predictor_factory: Optional[Callable[..., IndexedCorrTableTempPredictor]] = None,
+                 settings_service: Optional[CachedSettingsService] = None,
                  temp_requirements_repository: TempRequirementsDBAsyncRepository = None,
-                 control_actions_repository: ControlActionsSimpleRepository = None):
+                 control_actions_repository: ControlActionsColumnarRepository = None,
+                 control_actions_response_cache: ControlActionResponseCache = None,
+                 executor: Optional[Executor] = None,
+                 temp_correlation_table_path: Optional[str] = None,
+                 homes_deltas_path: Optional[str] = None):
         self._logger = logging.getLogger(self.__class__.__name__)
         self._logger.debug("Creating instance of the provider")
 
         self._service_lock = asyncio.Lock()
+        self._requested_runs_count = 0
+        self._completed_runs_count = 0
+
+        self._temp_predictor_lock = asyncio.Lock()
         self._temp_predictor = temp_predictor
+        self._temp_predictor_factory = temp_predictor_factory
+        self._temp_predictor_rebuild_task: Optional[asyncio.Task] = None
+        self._settings_service = settings_service
+        if settings_service is not None:
+            settings_service.add_change_listener(self._on_setting_changed)
         self._temp_requirements_repository = temp_requirements_repository
         self._control_action_repository = control_actions_repository
+        self._control_actions_response_cache = control_actions_response_cache
+        self._executor = executor
+        self._temp_correlation_table_path = temp_correlation_table_path
+        self._homes_deltas_path = homes_deltas_path
 
         self._logger.debug(f"Temp predictor is {temp_predictor}")
         self._logger.debug(f"Temp requirements repository is {temp_requirements_repository}")
         self._logger.debug(f"Control actions repository is {control_actions_repository}")
+        self._logger.debug(f"Control actions response cache is {control_actions_response_cache}")
+        self._logger.debug(f"Executor is {executor}")
 
     def set_temp_requirements_repository(self, temp_requirements_repository: TempRequirementsDBAsyncRepository):
         self._logger.debug("Set temp requirements repository")
         self._temp_requirements_repository = temp_requirements_repository
 
-    def set_control_actions_repository(self, control_actions_repository: ControlActionsSimpleRepository):
+    def set_control_actions_repository(self, control_actions_repository: ControlActionsColumnarRepository):
         self._logger.debug("Set control actions repository")
         self._control_action_repository = control_actions_repository
 
-    def set_temp_predictor(self, temp_predictor: CorrTableTempPredictor):
+    def set_control_actions_response_cache(self, control_actions_response_cache: ControlActionResponseCache):
+        self._logger.debug("Set control actions response cache")
+        self._control_actions_response_cache = control_actions_response_cache
+
+    def set_executor(self, executor: Optional[Executor]):
+        self._logger.debug("Set executor")
+        self._executor = executor
+
+    def set_temp_predictor(self, temp_predictor: IndexedCorrTableTempPredictor):
         logging.debug("Set temp predictor")
         self._temp_predictor = temp_predictor
 
+    async def refresh_predictor_settings_async(self):
+        # Настройки могли изменить другие процессы, поэтому перед сравнением версий они перечитываются
+        if self._settings_service is not None:
+            await self._settings_service.refresh_async()
+
+    def get_predictor_settings(self) -> Tuple:
+        if self._settings_service is None:
+            return ()
+        return (self._settings_service.get_one_setting_sync(HOME_MIN_TEMP_COEFFICIENT_SETTING),)
+
     async def predict_control_actions_async(self):
-        self._logger.debug("Requested updating control actions")
+        self._requested_runs_count += 1
+        run_number = self._requested_runs_count
+        self._logger.debug(f"Requested updating control actions, run {run_number}")
 
         async with self._service_lock:
+            # Запуск, начавшийся после этого запроса, уже учёл его данные
+            if self._completed_runs_count >= run_number:
+                self._logger.debug(f"Run {run_number} is coalesced with run {self._completed_runs_count}")
+                return
+
+            last_requested_run_number = self._requested_runs_count
+            temp_predictor = await self._get_temp_predictor()
             temp_requirements_df = await self._get_temp_requirements()
-            control_action_df = await self._calc_control_actions_in_executor(temp_requirements_df)
+            control_action_df = await self._calc_control_actions_in_executor(temp_predictor, temp_requirements_df)
             await self._control_action_repository.set_control_action(control_action_df)
             await self._drop_expired_control_actions()
+            self._invalidate_responses()
+            self._completed_runs_count = last_requested_run_number
+
+    async def drop_expired_control_actions_async(self):
+        # Вызывается, когда предсказание пропущено, чтобы устаревшие воздействия не копились в срезе.
+        # Кэш ответов не сбрасывается: ключи кэша содержат версию среза, которая меняется при отсечении.
+        async with self._service_lock:
+            await self._drop_expired_control_actions()
+
+    def _on_setting_changed(self, setting_name: str) -> None:
+        if setting_name == HOME_MIN_TEMP_COEFFICIENT_SETTING:
+            self._logger.debug(f"Setting {setting_name} is changed, rebuilding temp predictor")
+            self._temp_predictor_rebuild_task = asyncio.ensure_future(self._get_temp_predictor())
+            self._temp_predictor_rebuild_task.add_done_callback(self._on_temp_predictor_rebuilt)
+
+    def _on_temp_predictor_rebuilt(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        e = task.exception()
+        if e is not None:
+            self._logger.error("Temp predictor rebuild is failed", exc_info=e)
+
+    async def _get_temp_predictor(self) -> IndexedCorrTableTempPredictor:
+        if self._temp_predictor_factory is None or self._settings_service is None:
+            return self._temp_predictor
+
+        async with self._temp_predictor_lock:
+            home_min_temp_coefficient = \
+                self._settings_service.get_one_setting_sync(HOME_MIN_TEMP_COEFFICIENT_SETTING)
+            temp_predictor = self._temp_predictor
+            if temp_predictor is None or temp_predictor.home_min_temp_coefficient != home_min_temp_coefficient:
+                self._logger.debug(f"Building temp predictor with home min temp coefficient "
+                                   f"{home_min_temp_coefficient}")
+                loop = asyncio.get_running_loop()
+                temp_predictor = await loop.run_in_executor(
+                    None,
+                    functools.partial(self._temp_predictor_factory,
+                                      home_min_temp_coefficient=home_min_temp_coefficient)
+                )
+                self._temp_predictor = temp_predictor
+            return temp_predictor
 
     async def _get_temp_requirements(self):
         start_datetime = pd.Timestamp.now(tz=tzlocal())
@@ -62,28 +171,41 @@ class CorrTableControlActionPredictionService(ControlActionPredictionService):
 
         return temp_requirements_df
 
-    async def _calc_control_actions_in_executor(self, temp_requirements_df):
+    async def _calc_control_actions_in_executor(self, temp_predictor, temp_requirements_df):
+        self._logger.debug("Predicting control actions on temp requirements in executor")
         loop = asyncio.get_running_loop()
-        control_actions_list = await loop.run_in_executor(
-            None,
-            self._calc_control_actions,
-            temp_requirements_df
-        )
-
-        return control_actions_list
-
-    def _calc_control_actions(self, temp_requirements_df):
-        self._logger.debug("Predicting control actions on temp requirements")
         required_temp_arr = temp_requirements_df[column_names.FORWARD_PIPE_COOLANT_TEMP].to_numpy()
-        control_temp_list = self._temp_predictor.predict_on_temp_requirements(required_temp_arr)
-        control_actions_count = len(control_temp_list)
+        if self._is_index_loaded_by_paths():
+            control_temp_arr = await loop.run_in_executor(
+                self._executor,
+                predict_control_temps_by_paths,
+                self._temp_correlation_table_path,
+                self._homes_deltas_path,
+                temp_predictor.home_min_temp_coefficient,
+                required_temp_arr
+            )
+        else:
+            control_temp_arr = await loop.run_in_executor(
+                self._executor,
+                predict_control_temps,
+                temp_predictor,
+                required_temp_arr
+            )
+        return self._make_control_actions_df(temp_requirements_df, control_temp_arr)
+
+    def _is_index_loaded_by_paths(self) -> bool:
+        return isinstance(self._executor, ProcessPoolExecutor) and \
+            self._temp_correlation_table_path is not None and \
+            self._homes_deltas_path is not None
+
+    def _make_control_actions_df(self, temp_requirements_df, control_temp_arr):
+        control_actions_count = len(control_temp_arr)
         self._logger.debug(f"Calculated {control_actions_count} actions")
 
-        temp_requirements_dates_list = temp_requirements_df[column_names.TIMESTAMP].to_list()
-        control_actions_dates_list = temp_requirements_dates_list[:control_actions_count]
         control_action_df = pd.DataFrame({
-            column_names.TIMESTAMP: control_actions_dates_list,
-            column_names.FORWARD_PIPE_COOLANT_TEMP: control_temp_list
+            column_names.TIMESTAMP: temp_requirements_df[column_names.TIMESTAMP].iloc[:control_actions_count]
+                .reset_index(drop=True),
+            column_names.FORWARD_PIPE_COOLANT_TEMP: control_temp_arr
         })
 
         return control_action_df
@@ -92,3 +214,7 @@ class CorrTableControlActionPredictionService(ControlActionPredictionService):
         datetime_now = pd.Timestamp.now(tz=tzlocal())
         self._logger.debug(f"Dropping expired control actions, that older than {datetime_now}")
         await self._control_action_repository.delete_control_action_older_than(datetime_now)
+
+    def _invalidate_responses(self):
+        if self._control_actions_response_cache is not None:
+            self._control_actions_response_cache.bump_generation()
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from dynamic_settings.service.settings_service import SettingsService
+
+from backend.repositories.settings_batch_repository import SettingsBatchRepository
+from backend.repositories.settings_version_repository import SettingsVersionRepository
+
+
+class CachedSettingsService:
+    """
+    Кэш динамических настроек в памяти процесса перед сервисом настроек.
+
+    Кэш заполняется при initialize_service значениями настроек по умолчанию (и сохранёнными в БД),
+    чтение get_one_setting_sync не обращается к репозиторию, пока значение есть в кэше.
+    Запись через set_one_setting_async сразу удаляет значение из кэша,
+    следующее чтение получает его из репозитория.
+    После записи вызываются слушатели изменений с именем изменённой настройки.
+
+    Записи, сделанные не через этот объект (другим процессом или напрямую в БД), обнаруживаются в refresh_async:
+    если счётчик изменений настроек в БД (settings_version_repository) вырос
+    или с последней загрузки прошло больше cache_ttl секунд (0 - без ограничения), настройки перечитываются из БД,
+    а слушатели вызываются для настроек, значения которых изменились.
+    refresh_async вызывается перед чтением настроек через API и каждые refresh_interval секунд
+    после start_periodic_refresh. Запись через этот объект увеличивает счётчик изменений.
+
+    Процессы API в режиме нескольких процессов не опрашивают БД: set_version_getter подменяет чтение счётчика
+    чтением версии, которую процесс обновления публикует в разделяемом файле через слушатель add_version_listener.
+
+    Пакетная запись set_many_settings_async выполняется через settings_batch_repository
+    одной транзакцией вместе с увеличением счётчика изменений: при ошибке не записывается ни одна настройка пакета.
+    После записи сервис настроек перечитывает настройки из БД.
+    """
+
+    DEFAULT_CACHE_TTL = 60
+    DEFAULT_REFRESH_INTERVAL = 5
+
+    def __init__(self,
+                 settings_service: Optional[SettingsService] = None,
+                 defaults: Optional[Dict[str, Any]] = None,
+                 settings_version_repository: Optional[SettingsVersionRepository] = None,
+                 settings_batch_repository: Optional[SettingsBatchRepository] = None,
+                 cache_ttl: Optional[float] = None,
+                 refresh_interval: Optional[float] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance of the service")
+
+        if cache_ttl is None:
+            cache_ttl = self.DEFAULT_CACHE_TTL
+        if refresh_interval is None:
+            refresh_interval = self.DEFAULT_REFRESH_INTERVAL
+
+        self._settings_service = settings_service
+        self._preloaded_settings_names = list(defaults or {})
+        self._settings_version_repository = settings_version_repository
+        self._settings_batch_repository = settings_batch_repository
+        self._cache_ttl = cache_ttl
+        self._refresh_interval = refresh_interval
+
+        self._cache: Dict[str, Any] = {}
+        self._hits_count = 0
+        self._misses_count = 0
+        self._reloads_count = 0
+        self._version: Optional[int] = None
+        self._loaded_at = time.monotonic()
+        self._change_listeners: List[Callable[[str], None]] = []
+        self._version_listeners: List[Callable[[int], None]] = []
+        self._version_getter: Optional[Callable[[], Optional[int]]] = None
+        self._write_lock = asyncio.Lock()
+        self._periodic_refresh_task: Optional[asyncio.Task] = None
+
+    def add_change_listener(self, listener: Callable[[str], None]) -> None:
+        self._change_listeners.append(listener)
+
+    def add_version_listener(self, listener: Callable[[int], None]) -> None:
+        self._version_listeners.append(listener)
+
+    def set_version_getter(self, version_getter: Callable[[], Optional[int]]) -> None:
+        self._logger.debug(f"Settings version getter is set to {version_getter}")
+        self._version_getter = version_getter
+
+    def set_settings_service(self, settings_service: SettingsService) -> None:
+        self._logger.debug("Settings service is set")
+        self._settings_service = settings_service
+        self.invalidate()
+
+    async def initialize_service(self) -> None:
+        if self._settings_version_repository is not None:
+            await self._settings_version_repository.initialize_async()
+            self._version = await self._settings_version_repository.get_version_async()
+        await self._settings_service.initialize_service()
+        self.invalidate()
+        self._preload(self._preloaded_settings_names)
+        self._loaded_at = time.monotonic()
+        self._logger.debug(f"Settings cache is populated with {len(self._cache)} settings, version {self._version}")
+        self._notify_version_listeners()
+
+    async def refresh_async(self) -> bool:
+        """
+        Перечитывает настройки из БД, если счётчик изменений вырос или истёк cache_ttl.
+        Возвращает True, если настройки перечитаны.
+        """
+        version = await self._get_stored_version()
+        if not self._is_reload_needed(version):
+            return False
+
+        async with self._write_lock:
+            # Пока ожидалась блокировка, настройки мог перечитать или записать другой вызов
+            version = await self._get_stored_version()
+            if not self._is_reload_needed(version):
+                return False
+            is_version_changed = self._is_version_changed(version)
+
+            previous_values = dict(self._cache)
+            # Сервис настроек библиотеки загружает настройки из БД при инициализации
+            await self._settings_service.initialize_service()
+            self.invalidate()
+            self._preload(self._preloaded_settings_names)
+            self._loaded_at = time.monotonic()
+            self._reloads_count += 1
+            if is_version_changed:
+                self._version = version
+
+        if is_version_changed:
+            self._notify_version_listeners()
+        changed_settings_names = [
+            setting_name for setting_name, setting_value in previous_values.items()
+            if self.get_one_setting_sync(setting_name) != setting_value
+        ]
+        self._logger.debug(f"Settings are reloaded with version {self._version}, "
+                           f"changed settings: {changed_settings_names}")
+        self._notify_listeners(changed_settings_names)
+        return True
+
+    def start_periodic_refresh(self) -> None:
+        if not self._refresh_interval:
+            return
+        self._logger.debug(f"Settings will be refreshed every {self._refresh_interval} seconds")
+        self._periodic_refresh_task = asyncio.create_task(self._run_periodic_refresh())
+
+    async def stop_async(self) -> None:
+        if self._periodic_refresh_task is not None:
+            self._periodic_refresh_task.cancel()
+            try:
+                await self._periodic_refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._periodic_refresh_task = None
+
+    def get_one_setting_sync(self, setting_name: str) -> Any:
+        if setting_name in self._cache:
+            self._hits_count += 1
+            return self._cache[setting_name]
+
+        self._misses_count += 1
+        self._logger.debug(f"Setting {setting_name} is not cached, loading")
+        setting_value = self._settings_service.get_one_setting_sync(setting_name)
+        self._cache[setting_name] = setting_value
+        return setting_value
+
+    def get_many_settings_sync(self, settings_names: Iterable[str]) -> Dict[str, Any]:
+        return {setting_name: self.get_one_setting_sync(setting_name) for setting_name in settings_names}
+
+    async def set_one_setting_async(self, setting_name: str, setting_value: Any) -> None:
+        await self.set_many_settings_async({setting_name: setting_value})
+
+    async def set_many_settings_async(self, settings: Dict[str, Any]) -> None:
+        async with self._write_lock:
+            if self._settings_batch_repository is not None:
+                version = await self._settings_batch_repository.set_many_settings_async(settings)
+                # Сервис настроек библиотеки держит значения в памяти и загружает их из БД при инициализации
+                await self._settings_service.initialize_service()
+            else:
+                for setting_name, setting_value in settings.items():
+                    await self._settings_service.set_one_setting_async(setting_name, setting_value)
+                version = None
+                if self._settings_version_repository is not None:
+                    version = await self._settings_version_repository.increment_version_async()
+            for setting_name in settings:
+                self._cache.pop(setting_name, None)
+            if version is not None:
+                self._on_version_incremented(version)
+
+        self._logger.debug(f"Settings {list(settings)} are set, cached values are invalidated")
+        self._notify_listeners(settings)
+
+    def invalidate(self, setting_name: Optional[str] = None) -> None:
+        if setting_name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(setting_name, None)
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        return {
+            "hits": self._hits_count,
+            "misses": self._misses_count,
+            "reloads": self._reloads_count,
+            "size": len(self._cache)
+        }
+
+    def _on_version_incremented(self, version: int) -> None:
+        # Если счётчик вырос больше чем на 1, в промежутке настройки менял кто-то ещё,
+        # и версия не обновляется, чтобы следующий refresh_async перечитал настройки
+        if self._version is not None and version == self._version + 1:
+            self._version = version
+            self._notify_version_listeners()
+
+    def _notify_listeners(self, settings_names: Iterable[str]) -> None:
+        for setting_name in settings_names:
+            for listener in self._change_listeners:
+                listener(setting_name)
+
+    async def _get_stored_version(self) -> Optional[int]:
+        if self._version_getter is not None:
+            return self._version_getter()
+        if self._settings_version_repository is not None:
+            return await self._settings_version_repository.get_version_async()
+        return None
+
+    def _is_version_changed(self, version: Optional[int]) -> bool:
+        return version is not None and (self._version is None or version > self._version)
+
+    def _is_reload_needed(self, version: Optional[int]) -> bool:
+        is_expired = self._cache_ttl > 0 and time.monotonic() - self._loaded_at >= self._cache_ttl
+        return self._is_version_changed(version) or is_expired
+
+    def _notify_version_listeners(self) -> None:
+        if self._version is None:
+            return
+        for listener in self._version_listeners:
+            listener(self._version)
+
+    async def _run_periodic_refresh(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                await self.refresh_async()
+            except Exception:
+                self._logger.exception("Settings are not refreshed")
+
+    def _preload(self, settings_names: Iterable[str]) -> None:
+        for setting_name in settings_names:
+            self._cache[setting_name] = self._settings_service.get_one_setting_sync(setting_name)
@@ -0,0 +1,52 @@
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class HealthService:
+    """
+    Состояние запуска приложения для проб живости и готовности.
+
+    Сервер начинает принимать соединения до инициализации ресурсов.
+    Пока запуск не завершён (mark_started), API кроме проб отвечает 503.
+    Приложение готово, когда запуск завершён и проходят все проверки готовности,
+    например, когда появились первые управляющие воздействия.
+    Время инициализации каждого ресурса записывается и отдаётся в пробе готовности.
+    """
+
+    def __init__(self) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance of the service")
+
+        self._is_started = False
+        self._init_timings: Dict[str, float] = {}
+        self._readiness_checks: Dict[str, Callable[[], bool]] = {}
+
+    def add_readiness_check(self, name: str, check: Callable[[], bool]) -> None:
+        self._readiness_checks[name] = check
+
+    async def track_init(self, name: str, awaitable: Awaitable[T]) -> T:
+        started_at = time.perf_counter()
+        result = await awaitable
+        init_time = time.perf_counter() - started_at
+        self._init_timings[name] = init_time
+        self._logger.info(f"{name} is initialized in {init_time:.3f} s")
+        return result
+
+    def get_init_timings(self) -> Dict[str, float]:
+        return dict(self._init_timings)
+
+    def mark_started(self) -> None:
+        self._logger.info("Application is started")
+        self._is_started = True
+
+    def is_started(self) -> bool:
+        return self._is_started
+
+    def get_readiness(self) -> Tuple[bool, Dict[str, bool]]:
+        checks = {"started": self._is_started}
+        for name, check in self._readiness_checks.items():
+            checks[name] = self._is_started and check()
+        return all(checks.values()), checks
@@ -5,6 +5,7 @@ from typing import Optional
 from backend.services.temp_graph_update_service.temp_graph_update_service import TempGraphUpdateService
 from boiler.temp_graph.io.async_.async_temp_graph_loader import AsyncTempGraphLoader
 from boiler.temp_graph.io.sync.sync_temp_graph_dumper import SyncTempGraphDumper
+from backend.utils.dataframe_hashing import hash_dataframe
 
 
 class SimpleTempGraphUpdateService(TempGraphUpdateService):
@@ -21,6 +22,9 @@ class SimpleTempGraphUpdateService(TempGraphUpdateService):
         self._temp_graph_loader = temp_graph_loader
         self._temp_graph_dumper = temp_graph_dumper
 
+        self._temp_graph_hash = None
+        self._data_version = 0
+
     def set_temp_graph_loader(self,
                               temp_graph_loader: AsyncTempGraphLoader) -> None:
         self._logger.debug("Temp graph src repository is set")
@@ -34,5 +38,21 @@ class SimpleTempGraphUpdateService(TempGraphUpdateService):
         self._logger.debug("Requested temp graph update")
         async with self._service_lock:
             temp_graph = await self._temp_graph_loader.load_temp_graph()
+            temp_graph_hash = hash_dataframe(temp_graph)
+            if temp_graph_hash == self._temp_graph_hash:
+                self._logger.debug("Temp graph is not changed")
+                return
             self._temp_graph_dumper.dump_temp_graph(temp_graph)
-            self._logger.debug("temp graph is updated")
+            self._temp_graph_hash = temp_graph_hash
+            self._data_version += 1
+            self._logger.debug(f"temp graph is updated, data version is {self._data_version}")
+
+    async def restore_temp_graph_async(self, temp_graph) -> None:
+        async with self._service_lock:
+            self._temp_graph_dumper.dump_temp_graph(temp_graph)
+            self._temp_graph_hash = hash_dataframe(temp_graph)
+            self._data_version += 1
+            self._logger.debug(f"Temp graph is restored, data version is {self._data_version}")
+
+    def get_data_version(self) -> int:
+        return self._data_version
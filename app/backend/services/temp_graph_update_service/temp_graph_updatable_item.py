@@ -1,20 +1,24 @@
+import asyncio
 from typing import Optional
 
 from dependency_injector.providers import Provider
 from updater.updatable_item.updatable_item import UpdatableItem
 
 from backend.services.temp_graph_update_service.temp_graph_update_service import TempGraphUpdateService
+from backend.utils.concurrency import acquire_optional
 
 
 class TempGraphUpdatableItem(UpdatableItem):
 
     def __init__(self,
                  provider: Optional[Provider] = None,
+                 update_semaphore: Optional[asyncio.Semaphore] = None,
                  **kwargs):
 
         super().__init__(**kwargs)
 
         self._provider = provider
+        self._update_semaphore = update_semaphore
 
         self._logger.debug(f"Service provider is set to {provider}")
 
@@ -25,4 +29,9 @@ class TempGraphUpdatableItem(UpdatableItem):
     async def _run_update_async(self):
         self._logger.debug("Run update")
         service: TempGraphUpdateService = self._provider()
-        await service.update_temp_graph_async()
+        async with acquire_optional(self._update_semaphore):
+            await service.update_temp_graph_async()
+
+    def get_data_version(self) -> int:
+        service: TempGraphUpdateService = self._provider()
+        return service.get_data_version()
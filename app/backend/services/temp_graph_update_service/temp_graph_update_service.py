@@ -2,3 +2,6 @@ class TempGraphUpdateService:
 
     async def update_temp_graph_async(self):
         raise NotImplementedError
+
+    def get_data_version(self) -> int:
+        raise NotImplementedError
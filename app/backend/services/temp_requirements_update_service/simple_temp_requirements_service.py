@@ -1,18 +1,23 @@
 import asyncio
 import logging
-from typing import Optional
+from concurrent.futures import Executor
+from typing import Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from dateutil.tz import tzlocal
 
 from boiler.constants import column_names
 from boiler.weather.interpolators.weather_data_linear_interpolator import WeatherDataLinearInterpolator
 from boiler.temp_graph.io.sync.sync_temp_graph_loader import SyncTempGraphLoader
-from boiler.temp_requirements.repository.db.async_.temp_requirements_db_async_repository \
-    import TempRequirementsDBAsyncRepository
 from boiler.weather.io.async_.async_weather_loader import AsyncWeatherLoader
+from backend.calculators.executor_tasks import calc_temp_requirements
+from backend.calculators.vectorized_temp_graph_requirements_calculator import \
+    VectorizedTempGraphRequirementsCalculator
+from backend.repositories.temp_requirements_sqlite_repository import TempRequirementsSQLiteRepository
 from backend.services.temp_requirements_update_service.temp_requirements_update_service import \
     TempRequirementsUpdateService
+from backend.utils.dataframe_hashing import hash_dataframe
 
 
 class SimpleTempRequirementsService(TempRequirementsUpdateService):
@@ -20,8 +25,9 @@ class SimpleTempRequirementsService(TempRequirementsUpdateService):
     def __init__(self,
                  temp_graph_loader: Optional[SyncTempGraphLoader] = None,
                  weather_loader: Optional[AsyncWeatherLoader] = None,
-                 temp_requirements_repository: Optional[TempRequirementsDBAsyncRepository] = None,
-                 temp_graph_requirements_calculator=None):
+                 temp_requirements_repository: Optional[TempRequirementsSQLiteRepository] = None,
+                 temp_graph_requirements_calculator: Optional[VectorizedTempGraphRequirementsCalculator] = None,
+                 executor: Optional[Executor] = None):
 
         self._logger = logging.getLogger(self.__class__.__name__)
         self._logger.debug("Creating instance of the provider")
@@ -33,6 +39,13 @@ class SimpleTempRequirementsService(TempRequirementsUpdateService):
         self._temp_graph_loader = temp_graph_loader
 
         self._temp_requirements_calculator = temp_graph_requirements_calculator
+        # None - пул потоков цикла событий по умолчанию
+        self._executor = executor
+
+        self._weather_forecast_df = None
+        self._weather_forecast_hash = None
+        self._temp_graph_hash = None
+        self._data_version = 0
 
     def set_temp_graph_loader(self, temp_graph_loader):
         self._logger.debug("Temp graph repository is set")
@@ -42,11 +55,16 @@ class SimpleTempRequirementsService(TempRequirementsUpdateService):
         self._logger.debug("Weather repository is set")
         self._weather_loader = weather_loader
 
-    def set_temp_requirements_repository(self, temp_requirements_repository: TempRequirementsDBAsyncRepository):
+    def set_temp_requirements_repository(self, temp_requirements_repository: TempRequirementsSQLiteRepository):
         self._logger.debug("Temp requirements repository is set")
         self._temp_requirements_repository = temp_requirements_repository
 
-    def set_temp_graph_requirements_calculator(self, temp_graph_requirements_calculator):
+    def set_executor(self, executor: Optional[Executor]):
+        self._logger.debug("Executor is set")
+        self._executor = executor
+
+    def set_temp_graph_requirements_calculator(self,
+                                               temp_graph_requirements_calculator: VectorizedTempGraphRequirementsCalculator):
         self._logger.debug("Temp graph requirements calculator is set")
         self._temp_requirements_calculator = temp_graph_requirements_calculator
 
@@ -55,48 +73,155 @@ class SimpleTempRequirementsService(TempRequirementsUpdateService):
         async with self._service_lock:
             weather_df = await self._get_weather_forecast()
             temp_graph = self._get_temp_graph()
-            temp_requirements_df = await self._calc_temp_requirements_in_executor(weather_df, temp_graph)
-            await self._temp_requirements_repository.update_temp_requirements(temp_requirements_df)
+
+            weather_forecast_hash = hash_dataframe(weather_df)
+            temp_graph_hash = hash_dataframe(temp_graph)
+            is_temp_graph_changed = temp_graph_hash != self._temp_graph_hash
+            if not is_temp_graph_changed and weather_forecast_hash == self._weather_forecast_hash:
+                self._logger.debug("Weather forecast and temp graph are not changed, "
+                                   "temp requirements calculation is skipped")
+            else:
+                weather_df = self._interpolate_weather_forecast(weather_df)
+                previous_weather_df = self._weather_forecast_df
+                if is_temp_graph_changed or previous_weather_df is None or previous_weather_df.empty:
+                    # Полный пересчёт заменяет все хранимые требования,
+                    # в том числе оставшиеся от прошлого запуска или за пределами нового горизонта
+                    self._logger.debug(f"Temp requirements will be calculated for "
+                                       f"all {len(weather_df)} weather forecast records")
+                    temp_requirements_df = await self._calc_temp_requirements_in_executor(weather_df, temp_graph)
+                    await self._temp_requirements_repository.set_temp_requirements(temp_requirements_df)
+                    self._data_version += 1
+                    self._logger.debug(f"Temp requirements data version is {self._data_version}")
+                else:
+                    changed_weather_df, removed_datetimes = \
+                        self._get_weather_forecast_changes(previous_weather_df, weather_df)
+                    self._logger.debug(f"Temp requirements will be calculated for "
+                                       f"{len(changed_weather_df)} of {len(weather_df)} weather forecast records, "
+                                       f"{len(removed_datetimes)} records are removed from forecast")
+                    if len(removed_datetimes) > 0:
+                        await self._temp_requirements_repository.delete_temp_requirements(removed_datetimes)
+                    if not changed_weather_df.empty:
+                        # Репозиторий обновляет только переданные метки времени (upsert), остальные не трогает
+                        temp_requirements_df = await self._calc_temp_requirements_in_executor(
+                            changed_weather_df,
+                            temp_graph
+                        )
+                        await self._temp_requirements_repository.update_temp_requirements(temp_requirements_df)
+                    if len(removed_datetimes) > 0 or not changed_weather_df.empty:
+                        self._data_version += 1
+                        self._logger.debug(f"Temp requirements data version is {self._data_version}")
+
+                self._weather_forecast_df = weather_df
+                self._weather_forecast_hash = weather_forecast_hash
+                self._temp_graph_hash = temp_graph_hash
+
             await self._drop_expired_temp_requirements()
 
+    async def restore_state_async(self,
+                                  weather_df: pd.DataFrame,
+                                  temp_requirements_df: pd.DataFrame,
+                                  weather_forecast_hash: Optional[str] = None,
+                                  temp_graph_hash: Optional[str] = None) -> None:
+        async with self._service_lock:
+            # Восстановленное состояние заменяет всё хранимое, иначе в постоянной БД остались бы чужие записи
+            await self._temp_requirements_repository.set_temp_requirements(temp_requirements_df)
+            self._weather_forecast_df = weather_df
+            # Если прогноз погоды и температурный график после старта не изменятся,
+            # расчёт требований к температуре теплоносителя будет пропущен
+            self._weather_forecast_hash = weather_forecast_hash
+            self._temp_graph_hash = temp_graph_hash
+            self._data_version += 1
+            self._logger.debug(f"Temp requirements state is restored, data version is {self._data_version}")
+
+    def get_state_hashes(self) -> Tuple[Optional[str], Optional[str]]:
+        return self._weather_forecast_hash, self._temp_graph_hash
+
+    def get_data_version(self) -> int:
+        return self._data_version
+
+    async def get_weather_forecast(self,
+                                   start_datetime: Optional[pd.Timestamp] = None,
+                                   end_datetime: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        weather_df = self._weather_forecast_df
+        if weather_df is None:
+            return None
+
+        timestamps = pd.DatetimeIndex(weather_df[column_names.TIMESTAMP]).asi8
+        start_idx = 0
+        if start_datetime is not None:
+            start_idx = timestamps.searchsorted(pd.Timestamp(start_datetime).value, side="left")
+        end_idx = len(timestamps)
+        if end_datetime is not None:
+            end_idx = timestamps.searchsorted(pd.Timestamp(end_datetime).value, side="right")
+        return weather_df.iloc[start_idx:end_idx]
+
     async def _get_weather_forecast(self):
         start_datetime = pd.Timestamp.now(tz=tzlocal())
         weather_df = await self._weather_loader.load_weather(start_datetime=start_datetime)
+        return weather_df
+
+    # noinspection PyMethodMayBeStatic
+    def _interpolate_weather_forecast(self, weather_df):
         interpolator = WeatherDataLinearInterpolator()
         weather_df = interpolator.interpolate_weather_data(weather_df)
         return weather_df
 
+    # noinspection PyMethodMayBeStatic
+    def _get_weather_forecast_changes(self,
+                                      previous_weather_df: pd.DataFrame,
+                                      weather_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DatetimeIndex]:
+        """
+        Возвращает записи прогноза, которых не было в прошлом прогнозе или в которых изменилась температура,
+        и метки времени прошлого прогноза, которых нет в новом.
+        """
+        previous_timestamps = pd.DatetimeIndex(previous_weather_df[column_names.TIMESTAMP]).asi8
+        previous_weather_temps = previous_weather_df[column_names.WEATHER_TEMP].to_numpy()
+        order = np.argsort(previous_timestamps, kind="stable")
+        previous_timestamps = previous_timestamps[order]
+        previous_weather_temps = previous_weather_temps[order]
+
+        timestamps = pd.DatetimeIndex(weather_df[column_names.TIMESTAMP]).asi8
+        weather_temps = weather_df[column_names.WEATHER_TEMP].to_numpy()
+        positions = np.minimum(previous_timestamps.searchsorted(timestamps), len(previous_timestamps) - 1)
+        is_unchanged = (previous_timestamps[positions] == timestamps) & \
+                       (previous_weather_temps[positions] == weather_temps)
+
+        is_removed = ~np.isin(previous_timestamps, timestamps)
+        removed_datetimes = pd.to_datetime(previous_timestamps[is_removed], utc=True)
+
+        return weather_df[~is_unchanged], removed_datetimes
+
     def _get_temp_graph(self) -> pd.DataFrame:
         temp_graph_df = self._temp_graph_loader.load_temp_graph()
         return temp_graph_df
 
     async def _calc_temp_requirements_in_executor(self, weather_df, temp_graph):
+        self._logger.debug("Calculating temp requirements in executor")
         loop = asyncio.get_running_loop()
-        temp_requirements = await loop.run_in_executor(
-            None,
-            self._calc_temp_requirements,
-            weather_df,
-            temp_graph
+        forward_temp_arr, backward_temp_arr = await loop.run_in_executor(
+            self._executor,
+            calc_temp_requirements,
+            self._temp_requirements_calculator,
+            temp_graph,
+            weather_df[column_names.WEATHER_TEMP].to_numpy()
         )
-        return temp_requirements
+        return self._make_temp_requirements_df(weather_df, forward_temp_arr, backward_temp_arr)
 
     def _calc_temp_requirements(self, weather_df, temp_graph):
         self._logger.debug("Calculating temp requirements")
-
-        self._temp_requirements_calculator.set_temp_graph(temp_graph)
-
-        weather_temp_arr = weather_df[column_names.WEATHER_TEMP].to_numpy()
-        temp_requirements_datetime_list = weather_df[column_names.TIMESTAMP].to_list()
-        temp_requirements = []
-        for weather_temp, datetime_ in zip(weather_temp_arr, temp_requirements_datetime_list):
-            required_temp = self._temp_requirements_calculator.get_temp_requirements_for_weather_temp(weather_temp)
-            temp_requirements.append({
-                column_names.TIMESTAMP: datetime_,
-                column_names.FORWARD_PIPE_COOLANT_TEMP: required_temp[column_names.FORWARD_PIPE_COOLANT_TEMP],
-                column_names.BACKWARD_PIPE_COOLANT_TEMP: required_temp[column_names.BACKWARD_PIPE_COOLANT_TEMP]
-            })
-        temp_requirements_df = pd.DataFrame(temp_requirements)
-
+        forward_temp_arr, backward_temp_arr = calc_temp_requirements(
+            self._temp_requirements_calculator,
+            temp_graph,
+            weather_df[column_names.WEATHER_TEMP].to_numpy()
+        )
+        return self._make_temp_requirements_df(weather_df, forward_temp_arr, backward_temp_arr)
+
+    def _make_temp_requirements_df(self, weather_df, forward_temp_arr, backward_temp_arr):
+        temp_requirements_df = pd.DataFrame({
+            column_names.TIMESTAMP: weather_df[column_names.TIMESTAMP].reset_index(drop=True),
+            column_names.FORWARD_PIPE_COOLANT_TEMP: forward_temp_arr,
+            column_names.BACKWARD_PIPE_COOLANT_TEMP: backward_temp_arr
+        })
         self._logger.debug("Temp requirements are calculated")
         return temp_requirements_df
 
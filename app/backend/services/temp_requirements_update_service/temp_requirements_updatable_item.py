@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional
 
 from dependency_injector.providers import Provider
@@ -5,17 +6,20 @@ from updater.updatable_item.updatable_item import UpdatableItem
 
 from backend.services.temp_requirements_update_service.temp_requirements_update_service import \
     TempRequirementsUpdateService
+from backend.utils.concurrency import acquire_optional
 
 
 class TempRequirementsUpdatableItem(UpdatableItem):
 
     def __init__(self,
                  provider: Optional[Provider] = None,
+                 update_semaphore: Optional[asyncio.Semaphore] = None,
                  **kwargs):
 
         super().__init__(**kwargs)
 
         self._provider = provider
+        self._update_semaphore = update_semaphore
 
         self._logger.debug(f"Service provider is set to {provider}")
 
@@ -26,4 +30,9 @@ class TempRequirementsUpdatableItem(UpdatableItem):
     async def _run_update_async(self):
         self._logger.debug("Running update")
         service: TempRequirementsUpdateService = self._provider()
-        await service.update_temp_requirements_async()
+        async with acquire_optional(self._update_semaphore):
+            await service.update_temp_requirements_async()
+
+    def get_data_version(self) -> int:
+        service: TempRequirementsUpdateService = self._provider()
+        return service.get_data_version()
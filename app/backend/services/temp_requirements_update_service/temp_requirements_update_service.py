@@ -2,3 +2,6 @@ class TempRequirementsUpdateService:
 
     async def update_temp_requirements_async(self):
         raise NotImplementedError
+
+    def get_data_version(self) -> int:
+        raise NotImplementedError
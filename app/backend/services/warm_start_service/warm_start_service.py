@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import os
+from typing import Optional
+
+import pandas as pd
+from boiler.constants import column_names
+from boiler.temp_graph.io.sync.sync_temp_graph_loader import SyncTempGraphLoader
+from boiler.temp_requirements.repository.db.async_.temp_requirements_db_async_repository \
+    import TempRequirementsDBAsyncRepository
+
+from backend.repositories.control_action_columnar_repository import ControlActionsColumnarRepository
+from backend.services.temp_graph_update_service.simple_temp_graph_update_service import SimpleTempGraphUpdateService
+from backend.services.temp_requirements_update_service.simple_temp_requirements_service import \
+    SimpleTempRequirementsService
+from backend.utils.pipeline_state_format import load_pipeline_state, save_pipeline_state
+
+TEMP_GRAPH_FRAME = "temp_graph"
+WEATHER_FORECAST_FRAME = "weather_forecast"
+TEMP_REQUIREMENTS_FRAME = "temp_requirements"
+CONTROL_ACTIONS_FRAME = "control_actions"
+
+
+class WarmStartService:
+    """
+    Снимок состояния конвейера расчёта для тёплого старта.
+
+    Снимок содержит температурный график, последний интерполированный прогноз погоды,
+    требования к температуре теплоносителя и управляющие воздействия.
+    При старте снимок загружается до запуска сервиса обновления,
+    поэтому API сразу отдаёт управляющие воздействия из снимка, а обновление идёт в фоне.
+    Устаревшие на момент загрузки записи отбрасываются.
+    Снимок записывается каждые save_interval секунд и при завершении.
+    Если path не задан, сервис ничего не делает.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 save_interval: Optional[float] = None,
+                 temp_graph_loader: Optional[SyncTempGraphLoader] = None,
+                 temp_graph_update_service: Optional[SimpleTempGraphUpdateService] = None,
+                 temp_requirements_service: Optional[SimpleTempRequirementsService] = None,
+                 temp_requirements_repository: Optional[TempRequirementsDBAsyncRepository] = None,
+                 control_actions_repository: Optional[ControlActionsColumnarRepository] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance of the service")
+
+        self._path = path
+        self._save_interval = save_interval
+
+        self._temp_graph_loader = temp_graph_loader
+        self._temp_graph_update_service = temp_graph_update_service
+        self._temp_requirements_service = temp_requirements_service
+        self._temp_requirements_repository = temp_requirements_repository
+        self._control_actions_repository = control_actions_repository
+
+        self._save_lock = asyncio.Lock()
+        self._periodic_save_task: Optional[asyncio.Task] = None
+
+    def is_enabled(self) -> bool:
+        return self._path is not None
+
+    async def restore_async(self) -> bool:
+        if not self.is_enabled() or not os.path.isfile(self._path):
+            return False
+
+        self._logger.debug(f"Restoring pipeline state from {self._path}")
+        loop = asyncio.get_running_loop()
+        try:
+            frames, extra, created_at = await loop.run_in_executor(None, load_pipeline_state, self._path)
+        except (OSError, ValueError, KeyError) as e:
+            self._logger.warning(f"Pipeline state is not restored, snapshot {self._path} is unreadable: {e}")
+            return False
+
+        datetime_now = pd.Timestamp.now(tz="UTC")
+        temp_graph = frames.get(TEMP_GRAPH_FRAME)
+        if temp_graph is not None:
+            await self._temp_graph_update_service.restore_temp_graph_async(temp_graph)
+
+        weather_df = _drop_expired(frames.get(WEATHER_FORECAST_FRAME), datetime_now)
+        temp_requirements_df = _drop_expired(frames.get(TEMP_REQUIREMENTS_FRAME), datetime_now)
+        if weather_df is not None and temp_requirements_df is not None:
+            await self._temp_requirements_service.restore_state_async(
+                weather_df,
+                temp_requirements_df,
+                weather_forecast_hash=extra.get("weather_forecast_hash"),
+                temp_graph_hash=extra.get("temp_graph_hash")
+            )
+
+        control_actions_df = _drop_expired(frames.get(CONTROL_ACTIONS_FRAME), datetime_now)
+        if control_actions_df is not None and not control_actions_df.empty:
+            await self._control_actions_repository.set_control_action(control_actions_df)
+
+        restored_count = 0 if control_actions_df is None else len(control_actions_df)
+        self._logger.info(f"Pipeline state from {created_at} is restored "
+                          f"with {restored_count} not expired control actions")
+        return True
+
+    async def save_async(self) -> None:
+        if not self.is_enabled():
+            return
+
+        async with self._save_lock:
+            frames = {
+                CONTROL_ACTIONS_FRAME: await self._control_actions_repository.get_control_action(),
+                TEMP_REQUIREMENTS_FRAME: await self._temp_requirements_repository.get_temp_requirements(),
+                WEATHER_FORECAST_FRAME: await self._temp_requirements_service.get_weather_forecast(),
+                TEMP_GRAPH_FRAME: None
+            }
+            if self._temp_graph_update_service.get_data_version() > 0:
+                frames[TEMP_GRAPH_FRAME] = self._temp_graph_loader.load_temp_graph()
+            weather_forecast_hash, temp_graph_hash = self._temp_requirements_service.get_state_hashes()
+            extra = {
+                "weather_forecast_hash": weather_forecast_hash,
+                "temp_graph_hash": temp_graph_hash
+            }
+
+            self._logger.debug(f"Saving pipeline state to {self._path}")
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, save_pipeline_state, self._path, frames, extra)
+
+    def start_periodic_save(self) -> None:
+        if not self.is_enabled() or not self._save_interval:
+            return
+        self._logger.debug(f"Pipeline state will be saved every {self._save_interval} seconds")
+        self._periodic_save_task = asyncio.create_task(self._run_periodic_save())
+
+    async def stop_async(self) -> None:
+        if self._periodic_save_task is not None:
+            self._periodic_save_task.cancel()
+            try:
+                await self._periodic_save_task
+            except asyncio.CancelledError:
+                pass
+            self._periodic_save_task = None
+        await self.save_async()
+
+    async def _run_periodic_save(self) -> None:
+        while True:
+            await asyncio.sleep(self._save_interval)
+            try:
+                await self.save_async()
+            except Exception:
+                self._logger.exception("Pipeline state is not saved")
+
+
+def _drop_expired(df: Optional[pd.DataFrame], datetime_now: pd.Timestamp) -> Optional[pd.DataFrame]:
+    if df is None:
+        return None
+    return df[df[column_names.TIMESTAMP] >= datetime_now].reset_index(drop=True)
@@ -0,0 +1,91 @@
+"""
+Загрузчики, разделяемые несколькими станциями.
+
+Станции одного города получают прогноз погоды из одного источника,
+станции одной тепловой сети - один температурный график.
+Разделяемый загрузчик объединяет одновременные запросы в одну загрузку
+и отдаёт результат повторно в течение cache_ttl.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import pandas as pd
+
+DEFAULT_CACHE_TTL = pd.Timedelta(seconds=60)
+
+
+class _CoalescedLoad:
+
+    def __init__(self, cache_ttl: Optional[pd.Timedelta] = None) -> None:
+        if cache_ttl is None:
+            cache_ttl = DEFAULT_CACHE_TTL
+        self._cache_ttl = cache_ttl
+        self._loaded_at = None
+        self._result = None
+        self._pending = None
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+        self._result = None
+
+    async def get(self, load_coroutine_function):
+        if self._loaded_at is not None and pd.Timestamp.now(tz="UTC") - self._loaded_at < self._cache_ttl:
+            return self._result
+
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._load(load_coroutine_function))
+        pending = self._pending
+        return await asyncio.shield(pending)
+
+    async def _load(self, load_coroutine_function):
+        try:
+            self._result = await load_coroutine_function()
+            self._loaded_at = pd.Timestamp.now(tz="UTC")
+            return self._result
+        finally:
+            self._pending = None
+
+
+class SharedAsyncWeatherForecastLoader:
+
+    def __init__(self,
+                 weather_loader,
+                 cache_ttl: Optional[pd.Timedelta] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance")
+
+        self._weather_loader = weather_loader
+        self._coalesced_load = _CoalescedLoad(cache_ttl)
+        self._start_datetime = None
+
+    async def load_weather(self, start_datetime: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        # Прогноз, загруженный с более раннего момента, подходит и для более позднего запроса
+        if self._start_datetime is not None and \
+                (start_datetime is None or start_datetime < self._start_datetime):
+            self._coalesced_load.invalidate()
+
+        async def load():
+            self._logger.debug(f"Loading weather forecast from {start_datetime}")
+            self._start_datetime = start_datetime
+            return await self._weather_loader.load_weather(start_datetime=start_datetime)
+
+        weather_df = await self._coalesced_load.get(load)
+        return weather_df.copy()
+
+
+class SharedAsyncTempGraphLoader:
+
+    def __init__(self,
+                 temp_graph_loader,
+                 cache_ttl: Optional[pd.Timedelta] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance")
+
+        self._temp_graph_loader = temp_graph_loader
+        self._coalesced_load = _CoalescedLoad(cache_ttl)
+
+    async def load_temp_graph(self) -> pd.DataFrame:
+        temp_graph = await self._coalesced_load.get(self._temp_graph_loader.load_temp_graph)
+        return temp_graph.copy()
@@ -0,0 +1,195 @@
+"""
+Реестр станций для работы нескольких котельных в одном процессе.
+
+Станции описываются в конфиге в разделе services.stations.
+Настройки станции накладываются поверх общих настроек раздела services:
+
+    services:
+      stations_update_concurrency: 4
+      stations:
+        boiler_house_1:
+          weather_forecast_feed: city_1
+          temp_graph_feed: network_1
+          boiler_temp_prediction:
+            temp_correlation_table_path: ../storage/boiler_house_1/temp_correlation_table
+            homes_deltas_path: ../storage/boiler_house_1/homes_deltas
+
+Общие ресурсы не дублируются:
+    - станции с одинаковым weather_forecast_feed используют одну загрузку прогноза погоды;
+    - станции с одинаковым temp_graph_feed используют одну загрузку температурного графика;
+    - станции с одинаковыми weather_forecast_feed и temp_graph_feed используют один расчёт
+      требований к температуре теплоносителя (если temp_requirements_calculation.temp_requirements_db_path
+      задан, он должен различаться у станций с разными парами weather_forecast_feed и temp_graph_feed);
+    - станции с одинаковыми путями к таблице корреляции и времён запаздывания
+      используют один поисковый индекс.
+Одновременно выполняется не более stations_update_concurrency обновлений.
+"""
+
+import asyncio
+import copy
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from dependency_injector import providers
+from dependency_injector.providers import Provider
+
+from backend.containers.services_containers.temp_graph_container import TempGraphContainer
+from backend.containers.services_containers.temp_requirements_container import TempRequirementsContainer
+from backend.containers.station import HeatingNetworkContainer, StationContainer
+from backend.stations.shared_loaders import SharedAsyncTempGraphLoader, SharedAsyncWeatherForecastLoader
+
+STATION_SECTIONS = (
+    "temp_graph_providing",
+    "temp_requirements_calculation",
+    "boiler_temp_prediction",
+    "updater"
+)
+DEFAULT_FEED = "default"
+DEFAULT_UPDATE_CONCURRENCY = 4
+
+
+def _merge_config(base: dict, overrides: dict) -> dict:
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+class StationsRegistry:
+
+    def __init__(self,
+                 services_config: dict,
+                 settings_service: Provider,
+                 executor: Provider,
+                 update_concurrency: Optional[int] = None,
+                 feeds_cache_ttl: Optional[float] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._logger.debug("Creating instance")
+
+        if update_concurrency is None:
+            update_concurrency = DEFAULT_UPDATE_CONCURRENCY
+        if feeds_cache_ttl is not None:
+            feeds_cache_ttl = pd.Timedelta(seconds=feeds_cache_ttl)
+
+        self._settings_service = settings_service
+        self._executor = executor
+        self._feeds_cache_ttl = feeds_cache_ttl
+        self._update_semaphore = asyncio.Semaphore(update_concurrency)
+
+        self._weather_forecast_loaders: Dict[str, SharedAsyncWeatherForecastLoader] = {}
+        self._temp_graph_loaders: Dict[str, SharedAsyncTempGraphLoader] = {}
+        self._heating_networks: Dict[Tuple[str, str], HeatingNetworkContainer] = {}
+        self._temp_correlation_indexes: Dict[Tuple[str, str], Provider] = {}
+        self._stations: Dict[str, StationContainer] = {}
+
+        services_config = services_config or {}
+        common_config = {section: services_config.get(section) or {} for section in STATION_SECTIONS}
+        for station_id, station_config in (services_config.get("stations") or {}).items():
+            self._add_station(str(station_id), _merge_config(common_config, station_config or {}))
+
+        self._logger.debug(f"{len(self._stations)} stations are registered with "
+                           f"{len(self._heating_networks)} heating networks, "
+                           f"{len(self._weather_forecast_loaders)} weather forecast feeds, "
+                           f"{len(self._temp_graph_loaders)} temp graph feeds and "
+                           f"{len(self._temp_correlation_indexes)} temp correlation tables")
+
+    def get_station_ids(self) -> List[str]:
+        return list(self._stations)
+
+    def get_station(self, station_id: str) -> StationContainer:
+        return self._stations[station_id]
+
+    async def init_resources(self) -> None:
+        # Таблицы разных станций загружаются параллельно вне цикла событий
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(None, temp_correlation_index)
+            for temp_correlation_index in self._temp_correlation_indexes.values()
+        ))
+
+    def has_control_actions(self) -> bool:
+        return all(
+            len(station.control_action_pkg.control_actions_repository().get_snapshot()) > 0
+            for station in self._stations.values()
+        )
+
+    async def start_service(self) -> None:
+        for station_id, station in self._stations.items():
+            self._logger.debug(f"Starting updater service of station {station_id}")
+            await station.updater_service().start_service()
+
+    def _add_station(self, station_id: str, station_config: dict) -> None:
+        self._logger.debug(f"Registering station {station_id}")
+
+        heating_network = self._get_heating_network(station_config)
+        station = StationContainer(
+            settings_service=self._settings_service,
+            temp_requirements_repository=heating_network.temp_requirements_pkg.temp_requirements_repository,
+            temp_graph_updatable_item=heating_network.temp_graph_updatable_item,
+            temp_requirements_updatable_item=heating_network.temp_requirements_updatable_item,
+            update_semaphore=providers.Object(self._update_semaphore),
+            executor=self._executor
+        )
+        station.config.from_dict(station_config)
+
+        boiler_temp_prediction_config = station_config["boiler_temp_prediction"]
+        index_key = (
+            boiler_temp_prediction_config.get("temp_correlation_table_path"),
+            boiler_temp_prediction_config.get("homes_deltas_path")
+        )
+        if index_key in self._temp_correlation_indexes:
+            station.control_action_pkg.temp_correlation_index.override(self._temp_correlation_indexes[index_key])
+        else:
+            self._temp_correlation_indexes[index_key] = station.control_action_pkg.temp_correlation_index
+
+        self._stations[station_id] = station
+
+    def _get_heating_network(self, station_config: dict) -> HeatingNetworkContainer:
+        weather_forecast_feed = str(station_config.get("weather_forecast_feed", DEFAULT_FEED))
+        temp_graph_feed = str(station_config.get("temp_graph_feed", DEFAULT_FEED))
+        heating_network_key = (weather_forecast_feed, temp_graph_feed)
+
+        heating_network = self._heating_networks.get(heating_network_key)
+        if heating_network is None:
+            heating_network = HeatingNetworkContainer(
+                weather_forecast_loader=providers.Object(
+                    self._get_weather_forecast_loader(weather_forecast_feed, station_config)
+                ),
+                temp_graph_loader=providers.Object(
+                    self._get_temp_graph_loader(temp_graph_feed, station_config)
+                ),
+                update_semaphore=providers.Object(self._update_semaphore),
+                executor=self._executor
+            )
+            heating_network.config.from_dict(station_config)
+            self._heating_networks[heating_network_key] = heating_network
+
+        return heating_network
+
+    def _get_weather_forecast_loader(self, feed: str, station_config: dict) -> SharedAsyncWeatherForecastLoader:
+        weather_forecast_loader = self._weather_forecast_loaders.get(feed)
+        if weather_forecast_loader is None:
+            feed_container = TempRequirementsContainer()
+            feed_container.config.from_dict(station_config["temp_requirements_calculation"])
+            weather_forecast_loader = SharedAsyncWeatherForecastLoader(
+                feed_container.weather_forecast_loader(),
+                cache_ttl=self._feeds_cache_ttl
+            )
+            self._weather_forecast_loaders[feed] = weather_forecast_loader
+        return weather_forecast_loader
+
+    def _get_temp_graph_loader(self, feed: str, station_config: dict) -> SharedAsyncTempGraphLoader:
+        temp_graph_loader = self._temp_graph_loaders.get(feed)
+        if temp_graph_loader is None:
+            feed_container = TempGraphContainer()
+            feed_container.config.from_dict(station_config["temp_graph_providing"])
+            temp_graph_loader = SharedAsyncTempGraphLoader(
+                feed_container.temp_graph_loader(),
+                cache_ttl=self._feeds_cache_ttl
+            )
+            self._temp_graph_loaders[feed] = temp_graph_loader
+        return temp_graph_loader
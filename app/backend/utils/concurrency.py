@@ -0,0 +1,12 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+
+@asynccontextmanager
+async def acquire_optional(semaphore: Optional[asyncio.Semaphore]):
+    if semaphore is None:
+        yield
+        return
+    async with semaphore:
+        yield
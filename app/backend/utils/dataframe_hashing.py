@@ -0,0 +1,18 @@
+import hashlib
+from typing import Optional
+
+import pandas as pd
+
+
+def hash_dataframe(df: Optional[pd.DataFrame]) -> Optional[str]:
+    """
+    Хэш содержимого DataFrame: значений, имён и порядка колонок (без учёта индекса).
+    """
+
+    if df is None:
+        return None
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(tuple(df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
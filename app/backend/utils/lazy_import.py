@@ -0,0 +1,88 @@
+"""
+Отложенный импорт объектов, на которые ссылаются провайдеры контейнеров.
+
+Контейнеры ссылаются на классы тяжёлых модулей (pandas, boiler, boiler_softm, SQLAlchemy, uvicorn)
+через lazy_callable и lazy_resource, поэтому импорт контейнеров не импортирует эти модули.
+FastAPI при этом всё равно импортируется: его импортирует dependency_injector.wiring,
+который импортируется вместе с dependency_injector.containers.
+Модуль импортируется при первом разрешении провайдера, которому он нужен.
+"""
+
+import importlib
+import threading
+
+from dependency_injector import resources
+
+_import_lock = threading.Lock()
+
+
+def import_object(module_name: str, object_name: str):
+    module = importlib.import_module(module_name)
+    return getattr(module, object_name)
+
+
+class LazyCallable:
+
+    def __init__(self, module_name: str, object_name: str) -> None:
+        self._module_name = module_name
+        self._object_name = object_name
+        self._object = None
+
+    def resolve(self):
+        if self._object is None:
+            with _import_lock:
+                if self._object is None:
+                    self._object = import_object(self._module_name, self._object_name)
+        return self._object
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._module_name}.{self._object_name})"
+
+
+def lazy_callable(module_name: str, object_name: str) -> LazyCallable:
+    return LazyCallable(module_name, object_name)
+
+
+def lazy_resource(module_name: str, class_name: str) -> type:
+    """
+    Класс ресурса, который импортирует и создаёт ресурс class_name из module_name только при инициализации.
+    Провайдер Resource различает синхронные и асинхронные ресурсы по классу,
+    поэтому для асинхронных ресурсов используется lazy_async_resource.
+    """
+
+    lazy_class = LazyCallable(module_name, class_name)
+
+    class LazyResource(resources.Resource):
+
+        def __init__(self):
+            self._resource = lazy_class()
+
+        def init(self, *args, **kwargs):
+            return self._resource.init(*args, **kwargs)
+
+        def shutdown(self, resource) -> None:
+            self._resource.shutdown(resource)
+
+    LazyResource.__name__ = LazyResource.__qualname__ = f"Lazy{class_name}"
+    return LazyResource
+
+
+def lazy_async_resource(module_name: str, class_name: str) -> type:
+    lazy_class = LazyCallable(module_name, class_name)
+
+    class LazyAsyncResource(resources.AsyncResource):
+
+        def __init__(self):
+            self._resource = lazy_class()
+
+        async def init(self, *args, **kwargs):
+            return await self._resource.init(*args, **kwargs)
+
+        async def shutdown(self, resource) -> None:
+            await self._resource.shutdown(resource)
+
+    LazyAsyncResource.__name__ = LazyAsyncResource.__qualname__ = f"Lazy{class_name}"
+    return LazyAsyncResource
@@ -0,0 +1,102 @@
+"""
+Формат хранения таблиц на диске с загрузкой через memory mapping.
+
+Таблица хранится в каталоге:
+    manifest.json - версия формата, порядок колонок и список блоков;
+    block_<N>.npy - двумерный массив колонок одного типа в column-major порядке.
+
+Каждая колонка блока лежит в файле непрерывно, поэтому после загрузки с mmap_mode="r"
+колонка DataFrame является представлением страниц файла без копирования,
+а несколько процессов, загрузивших одну таблицу, разделяют одни и те же физические страницы.
+Строковые колонки хранятся как массивы фиксированной длины ("<U") и при загрузке
+копируются в object колонки pandas.
+"""
+
+import json
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+FORMAT_NAME = "boiler-control-mmap-table"
+FORMAT_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+BLOCK_FILENAME_TEMPLATE = "block_{}.npy"
+
+
+def is_mmap_table(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, MANIFEST_FILENAME))
+
+
+def save_mmap_table(df: pd.DataFrame, path: str) -> None:
+    os.makedirs(path, exist_ok=True)
+
+    block_dtypes = []
+    block_columns = []
+    for column_name in df.columns:
+        column_dtype = _get_storage_dtype(df[column_name])
+        if column_dtype not in block_dtypes:
+            block_dtypes.append(column_dtype)
+            block_columns.append([])
+        block_columns[block_dtypes.index(column_dtype)].append(column_name)
+
+    blocks = []
+    for block_idx, (block_dtype, columns) in enumerate(zip(block_dtypes, block_columns)):
+        block_values = df[columns].to_numpy()
+        if block_dtype.kind == "U":
+            block_values = block_values.astype(str)
+        block_values = np.asfortranarray(block_values, dtype=block_dtype)
+        block_filename = BLOCK_FILENAME_TEMPLATE.format(block_idx)
+        np.save(os.path.join(path, block_filename), block_values)
+        blocks.append({"filename": block_filename, "columns": [str(column) for column in columns]})
+
+    manifest = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "rows_count": len(df),
+        "columns": [str(column) for column in df.columns],
+        "blocks": blocks
+    }
+    # Манифест пишется последним, поэтому недописанная таблица не распознаётся как готовая.
+    manifest_path = os.path.join(path, MANIFEST_FILENAME)
+    with open(f"{manifest_path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+
+def load_mmap_table(path: str, mmap_mode: Optional[str] = "r") -> pd.DataFrame:
+    with open(os.path.join(path, MANIFEST_FILENAME)) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_NAME:
+        raise ValueError(f"{path} is not a {FORMAT_NAME}")
+    if manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported {FORMAT_NAME} version {manifest.get('version')}, "
+                         f"expected {FORMAT_VERSION}")
+
+    block_dfs = []
+    for block in manifest["blocks"]:
+        block_values = np.load(os.path.join(path, block["filename"]), mmap_mode=mmap_mode)
+        if block_values.shape != (manifest["rows_count"], len(block["columns"])):
+            raise ValueError(f"Block {block['filename']} shape {block_values.shape} does not match manifest")
+        if block_values.dtype.kind == "U":
+            block_values = block_values.astype(object)
+        # Транспонированный column-major массив становится блоком pandas без копирования.
+        block_dfs.append(pd.DataFrame(block_values, columns=block["columns"], copy=False))
+
+    if len(block_dfs) == 1:
+        return block_dfs[0]
+    if not block_dfs:
+        return pd.DataFrame(columns=manifest["columns"])
+    return pd.concat(block_dfs, axis=1)[manifest["columns"]]
+
+
+def _get_storage_dtype(column: pd.Series) -> np.dtype:
+    if pd.api.types.is_datetime64tz_dtype(column) or pd.api.types.is_extension_array_dtype(column):
+        raise ValueError(f"Column {column.name} with dtype {column.dtype} is not supported")
+    if pd.api.types.is_numeric_dtype(column) or \
+            pd.api.types.is_datetime64_dtype(column) or \
+            pd.api.types.is_timedelta64_dtype(column):
+        return column.dtype
+    max_len = int(column.astype(str).str.len().max()) if len(column) else 1
+    return np.dtype(f"<U{max(max_len, 1)}")
@@ -0,0 +1,113 @@
+"""
+Двоичный формат снимка состояния конвейера расчёта для тёплого старта.
+
+Снимок - один файл .npz без сжатия:
+    meta - JSON (в виде массива байт) с версией формата, временем создания,
+           описанием колонок таблиц и дополнительными значениями;
+    <таблица>.<N> - массив N-й колонки таблицы.
+
+Колонки дат с временной зоной хранятся как int64 наносекунды UTC и загружаются в UTC,
+колонки дат без временной зоны - как int64 наносекунды.
+Файл записывается во временный файл рядом и подменяется атомарно,
+поэтому при аварийном завершении во время записи остаётся предыдущий снимок.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+FORMAT_NAME = "boiler-control-pipeline-state"
+FORMAT_VERSION = 1
+META_KEY = "meta"
+
+COLUMN_KIND_VALUES = "values"
+COLUMN_KIND_DATETIME_UTC = "datetime_utc"
+COLUMN_KIND_DATETIME_NAIVE = "datetime_naive"
+
+
+def _fsync_directory(directory: str) -> None:
+    # Сохраняет на диске саму подмену файла; на платформах без open для каталогов пропускается
+    try:
+        directory_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(directory_fd)
+
+
+def save_pipeline_state(path: str,
+                        frames: Dict[str, Optional[pd.DataFrame]],
+                        extra: Optional[Dict[str, Any]] = None) -> None:
+    arrays = {}
+    frames_meta = {}
+    for frame_name, df in frames.items():
+        if df is None:
+            continue
+        columns_meta = []
+        for column_idx, column_name in enumerate(df.columns):
+            column_kind, column_arr = _to_storage_array(df[column_name])
+            arrays[f"{frame_name}.{column_idx}"] = column_arr
+            columns_meta.append({"name": str(column_name), "kind": column_kind})
+        frames_meta[frame_name] = {"columns": columns_meta}
+
+    meta = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "created_at": pd.Timestamp.now(tz="UTC").value,
+        "frames": frames_meta,
+        "extra": extra or {}
+    }
+    arrays[META_KEY] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+        # Данные попадают на диск до подмены, иначе после сбоя питания на месте файла может оказаться пустой файл
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(directory)
+
+
+def load_pipeline_state(path: str) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Any], pd.Timestamp]:
+    with np.load(path, allow_pickle=False) as npz_file:
+        meta = json.loads(npz_file[META_KEY].tobytes().decode("utf-8"))
+        if meta.get("format") != FORMAT_NAME or meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported pipeline state format {meta.get('format')} "
+                             f"version {meta.get('version')} in {path}")
+
+        frames = {}
+        for frame_name, frame_meta in meta["frames"].items():
+            columns = {}
+            for column_idx, column_meta in enumerate(frame_meta["columns"]):
+                column_arr = npz_file[f"{frame_name}.{column_idx}"]
+                columns[column_meta["name"]] = _from_storage_array(column_meta["kind"], column_arr)
+            frames[frame_name] = pd.DataFrame(columns)
+
+    created_at = pd.Timestamp(meta["created_at"], tz="UTC")
+    return frames, meta["extra"], created_at
+
+
+def _to_storage_array(column: pd.Series) -> Tuple[str, np.ndarray]:
+    if pd.api.types.is_datetime64_any_dtype(column):
+        datetime_index = pd.DatetimeIndex(column)
+        column_kind = COLUMN_KIND_DATETIME_NAIVE if datetime_index.tz is None else COLUMN_KIND_DATETIME_UTC
+        return column_kind, datetime_index.asi8
+    return COLUMN_KIND_VALUES, column.to_numpy()
+
+
+def _from_storage_array(column_kind: str, column_arr: np.ndarray):
+    if column_kind == COLUMN_KIND_DATETIME_UTC:
+        return pd.to_datetime(column_arr, utc=True)
+    if column_kind == COLUMN_KIND_DATETIME_NAIVE:
+        return pd.to_datetime(column_arr)
+    return column_arr
@@ -0,0 +1,35 @@
+"""
+Создание загрузчиков SoftM с необязательным адресом сервера.
+
+Если адрес в конфиге не задан, загрузчик обращается к серверу по умолчанию библиотеки boiler_softm.
+Адрес задаётся, например, для нагрузочного тестирования с локальными заглушками серверов SoftM.
+"""
+
+from typing import Optional
+
+from boiler_softm.temp_graph.io.async_.soft_m_async_temp_graph_online_loader import \
+    SoftMAsyncTempGraphOnlineLoader
+from boiler_softm.weather.io.async_.soft_m_async_weather_forecast_online_loader import \
+    SoftMAsyncWeatherForecastOnlineLoader
+
+
+def _server_address_kwargs(server_address: Optional[str]) -> dict:
+    if server_address is None:
+        return {}
+    return {"server_address": server_address}
+
+
+def make_weather_forecast_loader(weather_reader,
+                                 server_address: Optional[str] = None) -> SoftMAsyncWeatherForecastOnlineLoader:
+    return SoftMAsyncWeatherForecastOnlineLoader(
+        weather_reader=weather_reader,
+        **_server_address_kwargs(server_address)
+    )
+
+
+def make_temp_graph_loader(reader,
+                           server_address: Optional[str] = None) -> SoftMAsyncTempGraphOnlineLoader:
+    return SoftMAsyncTempGraphOnlineLoader(
+        reader=reader,
+        **_server_address_kwargs(server_address)
+    )
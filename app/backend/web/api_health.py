@@ -0,0 +1,36 @@
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from starlette import status
+
+from backend.containers.services import Services
+from backend.services.health_service.health_service import HealthService
+
+api_router = APIRouter(prefix="/health")
+
+
+@api_router.get("/live")
+async def get_live():
+    """
+        Проба живости: процесс принимает и обрабатывает запросы.
+    """
+    return {"status": "alive"}
+
+
+@api_router.get("/ready")
+@inject
+async def get_ready(health_service: HealthService = Depends(Provide[Services.health_service])):
+    """
+        Проба готовности: ресурсы инициализированы и есть управляющие воздействия.
+        Пока приложение не готово, отвечает 503.
+        В ответе - результаты проверок готовности и время инициализации ресурсов в секундах.
+    """
+    is_ready, checks = health_service.get_readiness()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "ready": is_ready,
+            "checks": checks,
+            "init_timings": health_service.get_init_timings()
+        }
+    )
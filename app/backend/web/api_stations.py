@@ -0,0 +1,67 @@
+import logging
+from typing import List, Optional
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import JSONResponse
+from starlette import status
+
+from backend.containers.services import Services
+from backend.containers.station import StationContainer
+from backend.stations.stations_registry import StationsRegistry
+from backend.web.control_action_responses import API_V2, make_control_actions_response
+from backend.web.dependencies import InputDatetimeRange, InputTimezone
+
+api_router = APIRouter(prefix="/api/v2/stations")
+
+
+@inject
+def get_station(station_id: str,
+                stations_registry: StationsRegistry = Depends(Provide[Services.stations_registry])
+                ) -> StationContainer:
+    try:
+        return stations_registry.get_station(station_id)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown station {station_id}")
+
+
+@api_router.get("", response_model=List[str])
+@inject
+async def get_stations(stations_registry: StationsRegistry = Depends(Provide[Services.stations_registry])):
+    """
+        Метод для получения списка идентификаторов станций.
+    """
+    return stations_registry.get_station_ids()
+
+
+@api_router.get("/{station_id}/getPredictedBoilerT", response_class=JSONResponse)
+async def get_station_predicted_boiler_t(
+        station_id: str,
+        datetime_range: InputDatetimeRange = Depends(),
+        work_timezone: InputTimezone = Depends(),
+        station: StationContainer = Depends(get_station),
+        if_none_match: Optional[str] = Header(None)
+):
+    """
+        Метод для получения рекомендуемой температуры, которую необходимо выставить на бойлере станции.
+        Параметры и формат ответа совпадают с /api/v2/getPredictedBoilerT.
+        - **station_id**: Идентификатор станции из конфига.
+    """
+
+    _logger = logging.getLogger(__name__)
+    _logger.debug(f"Requested predicted boiler temp for station {station_id} "
+                  f"for dates range from {datetime_range.start_datetime} to {datetime_range.end_datetime} "
+                  f"with timezone {work_timezone.name}")
+
+    control_action_pkg = station.control_action_pkg
+    return make_control_actions_response(
+        control_action_pkg.control_actions_response_cache(),
+        control_action_pkg.control_actions_repository().get_snapshot(),
+        datetime_range.start_datetime,
+        datetime_range.end_datetime,
+        work_timezone.timezone,
+        work_timezone.name,
+        API_V2,
+        if_none_match=if_none_match,
+        next_update_datetime=station.control_action_updatable_item().get_next_update_datetime()
+    )
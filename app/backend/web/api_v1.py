@@ -1,14 +1,18 @@
 import logging
+from typing import Optional
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header
 from fastapi.responses import JSONResponse
 
 from backend.containers.core import Core
 from backend.containers.services import Services
-from backend.repositories.control_action_simple_repository import ControlActionsSimpleRepository
+from backend.repositories.control_action_columnar_repository import ControlActionsColumnarRepository
+from backend.repositories.control_action_response_cache import ControlActionResponseCache
+from backend.services.control_action_prediction_service.control_action_updatable_item import \
+    ControlActionUpdatableItem
+from backend.web.control_action_responses import API_V1, make_control_actions_response
 from backend.web.dependencies import InputDatesRange, InputTimezone
-from boiler.constants import column_names
 
 api_router = APIRouter(prefix="/api/v1")
 
@@ -18,9 +22,16 @@ api_router = APIRouter(prefix="/api/v1")
 async def get_predicted_boiler_t(
         dates_range: InputDatesRange = Depends(),
         work_timezone: InputTimezone = Depends(),
-        control_action_repository: ControlActionsSimpleRepository = Depends(
+        control_action_repository: ControlActionsColumnarRepository = Depends(
             Provide[Services.control_action_pkg.control_actions_repository]
         ),
+        response_cache: ControlActionResponseCache = Depends(
+            Provide[Services.control_action_pkg.control_actions_response_cache]
+        ),
+        control_action_updatable_item: ControlActionUpdatableItem = Depends(
+            Provide[Services.updater_pkg.control_action_updatable_item]
+        ),
+        if_none_match: Optional[str] = Header(None),
         datetime_processing_params=Depends(Provide[Core.config.datetime_processing])
 ):
     """
@@ -37,25 +48,15 @@ async def get_predicted_boiler_t(
                   f"from {dates_range.start_date} to {dates_range.end_date} "
                   f"with timezone {work_timezone.name}")
 
-    boiler_control_actions_df = await control_action_repository.get_control_action(
+    return make_control_actions_response(
+        response_cache,
+        control_action_repository.get_snapshot(),
         dates_range.start_date,
-        dates_range.end_date
+        dates_range.end_date,
+        work_timezone.timezone,
+        work_timezone.name,
+        API_V1,
+        if_none_match=if_none_match,
+        next_update_datetime=control_action_updatable_item.get_next_update_datetime(),
+        response_datetime_pattern=datetime_processing_params.get("response_pattern")
     )
-
-    predicted_boiler_temp_list = []
-    if not boiler_control_actions_df.empty:
-
-        datetime_column = boiler_control_actions_df[column_names.TIMESTAMP]
-        datetime_column = datetime_column.dt.tz_convert(work_timezone.timezone)
-        response_datetime_pattern = datetime_processing_params.get("response_pattern")
-        datetime_column = datetime_column.dt.strftime(response_datetime_pattern)
-        datetime_column = datetime_column.to_list()
-
-        boiler_out_temps = boiler_control_actions_df[column_names.FORWARD_PIPE_COOLANT_TEMP]
-        boiler_out_temps = boiler_out_temps.round(1)
-        boiler_out_temps = boiler_out_temps.to_list()
-
-        for datetime_, boiler_out_temp in zip(datetime_column, boiler_out_temps):
-            predicted_boiler_temp_list.append((datetime_, boiler_out_temp))
-
-    return predicted_boiler_temp_list
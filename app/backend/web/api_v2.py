@@ -1,26 +1,50 @@
 import logging
+from datetime import datetime
+from typing import List, Optional
 
+import pandas as pd
 from dependency_injector.wiring import Provide, inject
-from dynamic_settings.service.simple_settings_service import SimpleSettingsService
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette import status
 
-from boiler.constants import column_names
-from backend.repositories.control_action_simple_repository import ControlActionsSimpleRepository
+from boiler.temp_requirements.repository.db.async_.temp_requirements_db_async_repository \
+    import TempRequirementsDBAsyncRepository
+from backend.repositories.control_action_columnar_repository import ControlActionsColumnarRepository
+from backend.repositories.control_action_response_cache import ControlActionResponseCache
+from backend.containers.core import Core
 from backend.containers.services import Services
+from backend.services.control_action_prediction_service.control_action_updatable_item import \
+    ControlActionUpdatableItem
+from backend.services.dynamic_settings_service.cached_settings_service import CachedSettingsService
+from backend.services.temp_requirements_update_service.simple_temp_requirements_service \
+    import SimpleTempRequirementsService
+from backend.web.control_action_export import EXPORT_FORMAT_ARROW, EXPORT_FORMAT_NDJSON, EXPORT_MEDIA_TYPES, \
+    is_arrow_export_available, iter_arrow_ipc, iter_control_actions_chunks, iter_ndjson
+from backend.web.control_action_responses import API_V2, get_control_actions_content, make_control_actions_response
 from backend.web.dependencies import InputDatetimeRange, InputTimezone
+from backend.web.schemas import ControlActionsBatchRequest, MAX_BATCH_SETTINGS_COUNT, SettingsBatchRequest
 
 api_router = APIRouter(prefix="/api/v2")
 
+EXPORT_CHUNK_SIZE = 10_000
+
 
 @api_router.get("/getPredictedBoilerT", response_class=JSONResponse)
 @inject
 async def get_predicted_boiler_t(
         datetime_range: InputDatetimeRange = Depends(),
         work_timezone: InputTimezone = Depends(),
-        control_action_repository: ControlActionsSimpleRepository = Depends(
+        control_action_repository: ControlActionsColumnarRepository = Depends(
             Provide[Services.control_action_pkg.control_actions_repository]
-        )
+        ),
+        response_cache: ControlActionResponseCache = Depends(
+            Provide[Services.control_action_pkg.control_actions_response_cache]
+        ),
+        control_action_updatable_item: ControlActionUpdatableItem = Depends(
+            Provide[Services.updater_pkg.control_action_updatable_item]
+        ),
+        if_none_match: Optional[str] = Header(None)
 ):
     # noinspection SpellCheckingInspection
     """
@@ -58,32 +82,198 @@ async def get_predicted_boiler_t(
                   f"from {datetime_range.start_datetime} to {datetime_range.end_datetime} "
                   f"with timezone {work_timezone.name}")
 
-    boiler_control_actions_df = await control_action_repository.get_control_action(
+    return make_control_actions_response(
+        response_cache,
+        control_action_repository.get_snapshot(),
         datetime_range.start_datetime,
-        datetime_range.end_datetime
+        datetime_range.end_datetime,
+        work_timezone.timezone,
+        work_timezone.name,
+        API_V2,
+        if_none_match=if_none_match,
+        next_update_datetime=control_action_updatable_item.get_next_update_datetime()
     )
 
-    predicted_boiler_temp_list = []
-    if not boiler_control_actions_df.empty:
 
-        datetime = boiler_control_actions_df[column_names.TIMESTAMP]
-        datetime = datetime.dt.tz_convert(work_timezone.timezone)
-        datetime = datetime.to_list()
+@api_router.post("/getPredictedBoilerTBatch", response_class=JSONResponse)
+@inject
+async def get_predicted_boiler_t_batch(
+        batch_request: ControlActionsBatchRequest,
+        control_action_repository: ControlActionsColumnarRepository = Depends(
+            Provide[Services.control_action_pkg.control_actions_repository]
+        ),
+        response_cache: ControlActionResponseCache = Depends(
+            Provide[Services.control_action_pkg.control_actions_response_cache]
+        ),
+        datetime_processing_params=Depends(Provide[Core.config.datetime_processing])
+):
+    """
+        Метод для получения рекомендуемой температуры сразу для нескольких диапазонов времени
+        и временных зон за один запрос.
+        Принимает список запросов **queries**, каждый из которых содержит 3 **опциональных** параметра.
+        - **start_datetime**: Дата время начала управляющего воздействия в формате ISO 8601.
+        - **end_datetime**: Дата время окончания управляющего воздействия в формате ISO 8601.
+        - **timezone_name**: Имя временной зоны для обработки запроса и генерации ответа.
+        Если не указан - используется временная зона из конфигов.
+
+        Все запросы обрабатываются на одном и том же срезе управляющих воздействий.
+        Ответ - список ответов в формате /api/v2/getPredictedBoilerT в порядке следования запросов.
+    """
+
+    _logger = logging.getLogger(__name__)
+    _logger.debug(f"Requested predicted boiler temp for {len(batch_request.queries)} queries")
+
+    snapshot = control_action_repository.get_snapshot()
+    work_timezones = {}
+    contents = []
+    for query_idx, query in enumerate(batch_request.queries):
+        try:
+            work_timezone = work_timezones.get(query.timezone_name)
+            if work_timezone is None:
+                # Параметры передаются по имени: @inject в InputTimezone подставляет их по имени же
+                work_timezone = InputTimezone(
+                    query.timezone_name,
+                    datetime_processing_params=datetime_processing_params
+                )
+                work_timezones[query.timezone_name] = work_timezone
+            datetime_range = InputDatetimeRange(query.start_datetime, query.end_datetime, work_timezone)
+        except HTTPException as e:
+            raise HTTPException(status_code=e.status_code, detail=f"queries[{query_idx}]: {e.detail}")
+
+        start_idx, end_idx = snapshot.get_bounds(datetime_range.start_datetime, datetime_range.end_datetime)
+        contents.append(get_control_actions_content(
+            response_cache,
+            snapshot,
+            start_idx,
+            end_idx,
+            work_timezone.timezone,
+            work_timezone.name,
+            API_V2
+        ))
+
+    content = b"[" + b",".join(contents) + b"]"
+    return Response(content=content, media_type=JSONResponse.media_type)
+
+
+@api_router.get("/exportControlActions")
+@inject
+async def export_control_actions(
+        start_datetime: Optional[datetime] = None,
+        end_datetime: Optional[datetime] = None,
+        export_format: str = Query(EXPORT_FORMAT_NDJSON, alias="format", regex="^(ndjson|arrow)$"),
+        include_temp_requirements: bool = False,
+        include_weather: bool = False,
+        work_timezone: InputTimezone = Depends(),
+        control_action_repository: ControlActionsColumnarRepository = Depends(
+            Provide[Services.control_action_pkg.control_actions_repository]
+        ),
+        temp_requirements_repository: TempRequirementsDBAsyncRepository = Depends(
+            Provide[Services.temp_requirements_pkg.temp_requirements_repository]
+        ),
+        temp_requirements_service: SimpleTempRequirementsService = Depends(
+            Provide[Services.temp_requirements_pkg.temp_requirements_service]
+        )
+):
+    """
+        Потоковая выгрузка всего горизонта управляющих воздействий.
+        - **start_datetime**: Дата время начала выгрузки в формате ISO 8601. Если не указан - с начала горизонта.
+        - **end_datetime**: Дата время окончания выгрузки в формате ISO 8601. Если не указан - до конца горизонта.
+        - **format**: ndjson (по одной JSON записи на строку) или arrow (Arrow IPC stream, требует pyarrow).
+        - **include_temp_requirements**: Добавить требуемые температуры прямой и обратной труб.
+        - **include_weather**: Добавить интерполированную температуру наружного воздуха.
+        - **timezone**: Имя временной зоны для обработки запроса и генерации ответа.
+        Если не указан - используется временная зона из конфигов.
+    """
+
+    _logger = logging.getLogger(__name__)
+    _logger.debug(f"Requested control actions export from {start_datetime} to {end_datetime} "
+                  f"in {export_format} format with timezone {work_timezone.name}")
+
+    if export_format == EXPORT_FORMAT_ARROW and not is_arrow_export_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="arrow format requires pyarrow to be installed"
+        )
 
-        boiler_out_temps = boiler_control_actions_df[column_names.FORWARD_PIPE_COOLANT_TEMP]
-        boiler_out_temps = boiler_out_temps.round(1)
-        boiler_out_temps = boiler_out_temps.to_list()
+    if start_datetime is not None:
+        start_datetime = pd.Timestamp(start_datetime)
+        if start_datetime.tz is None:
+            start_datetime = start_datetime.tz_localize(tz=work_timezone.timezone)
+    if end_datetime is not None:
+        end_datetime = pd.Timestamp(end_datetime)
+        if end_datetime.tz is None:
+            end_datetime = end_datetime.tz_localize(tz=work_timezone.timezone)
 
-        for datetime_, boiler_out_temp in zip(datetime, boiler_out_temps):
-            predicted_boiler_temp_list.append((datetime_, boiler_out_temp))
+    snapshot = control_action_repository.get_snapshot()
+    start_idx, end_idx = snapshot.get_bounds(start_datetime, end_datetime)
+    chunks = iter_control_actions_chunks(
+        snapshot,
+        start_idx,
+        end_idx,
+        EXPORT_CHUNK_SIZE,
+        temp_requirements_repository=temp_requirements_repository if include_temp_requirements else None,
+        temp_requirements_service=temp_requirements_service if include_weather else None
+    )
+    if export_format == EXPORT_FORMAT_ARROW:
+        content = iter_arrow_ipc(chunks, work_timezone.name)
+    else:
+        content = iter_ndjson(chunks, work_timezone.timezone)
 
-    return predicted_boiler_temp_list
+    return StreamingResponse(content, media_type=EXPORT_MEDIA_TYPES[export_format])
 
 
 @api_router.post("/set_min_home_temp_coefficient")
 @inject
 async def set_min_home_temp_coefficient(coefficient: float,
-                                        dynamic_settings_service: SimpleSettingsService = Depends(
+                                        dynamic_settings_service: CachedSettingsService = Depends(
                                             Provide[Services.dynamic_settings_pkg.settings_service]
                                         )):
     await dynamic_settings_service.set_one_setting_async("home_min_temp_coefficient", coefficient)
+
+
+@api_router.get("/get_settings")
+@inject
+async def get_settings(names: List[str] = Query(...),
+                       dynamic_settings_service: CachedSettingsService = Depends(
+                           Provide[Services.dynamic_settings_pkg.settings_service]
+                       )):
+    """
+        Метод для получения значений нескольких динамических настроек за один запрос.
+        - **names**: Имена настроек, параметр повторяется для каждой настройки.
+    """
+    if len(names) > MAX_BATCH_SETTINGS_COUNT:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"No more than {MAX_BATCH_SETTINGS_COUNT} settings can be requested at once"
+        )
+    # Настройки могли измениться в другом процессе или напрямую в БД
+    await dynamic_settings_service.refresh_async()
+    return dynamic_settings_service.get_many_settings_sync(names)
+
+
+@api_router.post("/set_settings")
+@inject
+async def set_settings(batch_request: SettingsBatchRequest,
+                       dynamic_settings_service: CachedSettingsService = Depends(
+                           Provide[Services.dynamic_settings_pkg.settings_service]
+                       )):
+    """
+        Метод для записи нескольких динамических настроек за один запрос.
+        Принимает словарь **settings** с именами и значениями настроек.
+        Настройки записываются одной транзакцией: при ошибке не записывается ни одна из них.
+    """
+    _logger = logging.getLogger(__name__)
+    _logger.debug(f"Requested set of settings {list(batch_request.settings)}")
+
+    await dynamic_settings_service.set_many_settings_async(batch_request.settings)
+
+
+@api_router.get("/get_settings_cache_stats")
+@inject
+async def get_settings_cache_stats(dynamic_settings_service: CachedSettingsService = Depends(
+                                       Provide[Services.dynamic_settings_pkg.settings_service]
+                                   )):
+    """
+        Метод для получения числа попаданий и промахов кэша динамических настроек.
+    """
+    return dynamic_settings_service.get_cache_stats()
@@ -0,0 +1,157 @@
+import importlib.util
+import io
+import json
+from datetime import tzinfo
+from typing import AsyncIterator, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from boiler.constants import column_names
+from boiler.temp_requirements.repository.db.async_.temp_requirements_db_async_repository \
+    import TempRequirementsDBAsyncRepository
+from backend.repositories.control_actions_snapshot import ControlActionsSnapshot
+from backend.services.temp_requirements_update_service.simple_temp_requirements_service \
+    import SimpleTempRequirementsService
+
+EXPORT_FORMAT_NDJSON = "ndjson"
+EXPORT_FORMAT_ARROW = "arrow"
+EXPORT_MEDIA_TYPES = {
+    EXPORT_FORMAT_NDJSON: "application/x-ndjson",
+    EXPORT_FORMAT_ARROW: "application/vnd.apache.arrow.stream"
+}
+
+EXPORT_TIMESTAMP = "timestamp"
+EXPORT_BOILER_TEMP = "boiler_temp"
+EXPORT_REQUIRED_FORWARD_TEMP = "required_forward_temp"
+EXPORT_REQUIRED_BACKWARD_TEMP = "required_backward_temp"
+EXPORT_WEATHER_TEMP = "weather_temp"
+
+
+def is_arrow_export_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _lookup_by_timestamps(timestamps: np.ndarray, df: Optional[pd.DataFrame], column: str) -> np.ndarray:
+    values = np.full(len(timestamps), np.nan)
+    if df is None or df.empty or len(timestamps) == 0:
+        return values
+
+    df_timestamps = pd.DatetimeIndex(df[column_names.TIMESTAMP]).asi8
+    order = np.argsort(df_timestamps, kind="stable")
+    df_timestamps = df_timestamps[order]
+    df_values = df[column].to_numpy(dtype=np.float64)[order]
+
+    positions = np.minimum(df_timestamps.searchsorted(timestamps), len(df_timestamps) - 1)
+    is_matched = df_timestamps[positions] == timestamps
+    values[is_matched] = df_values[positions[is_matched]]
+    return values
+
+
+async def iter_control_actions_chunks(snapshot: ControlActionsSnapshot,
+                                      start_idx: int,
+                                      end_idx: int,
+                                      chunk_size: int,
+                                      temp_requirements_repository: Optional[TempRequirementsDBAsyncRepository] = None,
+                                      temp_requirements_service: Optional[SimpleTempRequirementsService] = None
+                                      ) -> AsyncIterator[Dict[str, np.ndarray]]:
+    """
+    Отдаёт управляющие воздействия частями по chunk_size записей.
+    Требования к температуре и прогноз погоды запрашиваются только для диапазона текущей части.
+    Метки времени отдаются как int64, наносекунды от эпохи в UTC.
+    """
+
+    # Пустой диапазон отдаётся одной пустой частью, чтобы в выгрузке была схема данных
+    chunk_bounds = [(start_idx, start_idx)]
+    if start_idx < end_idx:
+        chunk_bounds = [
+            (chunk_start_idx, min(chunk_start_idx + chunk_size, end_idx))
+            for chunk_start_idx in range(start_idx, end_idx, chunk_size)
+        ]
+
+    for chunk_start_idx, chunk_end_idx in chunk_bounds:
+        timestamps, forward_temps = snapshot.get_arrays(chunk_start_idx, chunk_end_idx)
+        chunk = {
+            EXPORT_TIMESTAMP: timestamps,
+            EXPORT_BOILER_TEMP: forward_temps
+        }
+
+        chunk_start_datetime = chunk_end_datetime = None
+        if len(timestamps) > 0:
+            chunk_start_datetime = pd.Timestamp(timestamps[0], tz="UTC")
+            chunk_end_datetime = pd.Timestamp(timestamps[-1], tz="UTC")
+
+        if temp_requirements_repository is not None:
+            temp_requirements_df = None
+            if chunk_start_datetime is not None:
+                temp_requirements_df = await temp_requirements_repository.get_temp_requirements(
+                    chunk_start_datetime,
+                    chunk_end_datetime
+                )
+            chunk[EXPORT_REQUIRED_FORWARD_TEMP] = _lookup_by_timestamps(
+                timestamps, temp_requirements_df, column_names.FORWARD_PIPE_COOLANT_TEMP
+            )
+            chunk[EXPORT_REQUIRED_BACKWARD_TEMP] = _lookup_by_timestamps(
+                timestamps, temp_requirements_df, column_names.BACKWARD_PIPE_COOLANT_TEMP
+            )
+        if temp_requirements_service is not None:
+            weather_df = None
+            if chunk_start_datetime is not None:
+                weather_df = await temp_requirements_service.get_weather_forecast(
+                    chunk_start_datetime,
+                    chunk_end_datetime
+                )
+            chunk[EXPORT_WEATHER_TEMP] = _lookup_by_timestamps(timestamps, weather_df, column_names.WEATHER_TEMP)
+
+        yield chunk
+
+
+async def iter_ndjson(chunks: AsyncIterator[Dict[str, np.ndarray]], timezone: tzinfo) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        datetime_index = pd.to_datetime(chunk[EXPORT_TIMESTAMP], utc=True).tz_convert(timezone)
+        columns = {
+            column_name: np.round(values, 1).tolist()
+            for column_name, values in chunk.items()
+            if column_name != EXPORT_TIMESTAMP
+        }
+        lines = []
+        for row_idx, datetime_ in enumerate(datetime_index):
+            record = {EXPORT_TIMESTAMP: datetime_.isoformat()}
+            for column_name, values in columns.items():
+                value = values[row_idx]
+                record[column_name] = None if value != value else value
+            lines.append(json.dumps(record, ensure_ascii=False, allow_nan=False, separators=(",", ":")))
+        lines.append("")
+        yield "\n".join(lines).encode("utf-8")
+
+
+async def iter_arrow_ipc(chunks: AsyncIterator[Dict[str, np.ndarray]], timezone_name: str) -> AsyncIterator[bytes]:
+    # pyarrow - необязательная зависимость, нужна только для выгрузки в формате Arrow
+    import pyarrow as pa
+
+    sink = io.BytesIO()
+    writer = None
+    async for chunk in chunks:
+        arrays = [pa.array(chunk[EXPORT_TIMESTAMP], type=pa.timestamp("ns", tz=timezone_name))]
+        names = [EXPORT_TIMESTAMP]
+        for column_name, values in chunk.items():
+            if column_name != EXPORT_TIMESTAMP:
+                arrays.append(pa.array(values, type=pa.float64(), from_pandas=True))
+                names.append(column_name)
+        record_batch = pa.RecordBatch.from_arrays(arrays, names=names)
+
+        if writer is None:
+            writer = pa.ipc.new_stream(sink, record_batch.schema)
+        writer.write_batch(record_batch)
+        yield _drain(sink)
+
+    if writer is not None:
+        writer.close()
+        yield _drain(sink)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    content = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return content
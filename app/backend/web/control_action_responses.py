@@ -0,0 +1,120 @@
+import hashlib
+import json
+from datetime import tzinfo
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse, Response
+from starlette import status
+
+from backend.repositories.control_action_response_cache import ControlActionResponseCache
+from backend.repositories.control_actions_snapshot import ControlActionsSnapshot
+
+API_V1 = "v1"
+API_V2 = "v2"
+
+
+def render_control_actions(timestamps: np.ndarray,
+                           forward_temps: np.ndarray,
+                           timezone: tzinfo,
+                           api_version: str,
+                           response_datetime_pattern: Optional[str] = None) -> bytes:
+    """
+    Формирует JSON-ответ в том же виде, в каком его формирует FastAPI для списка пар (дата, температура).
+    В v1 дата форматируется по шаблону из конфигов, в v2 - в формате ISO 8601.
+    """
+
+    datetime_index = pd.to_datetime(timestamps, utc=True).tz_convert(timezone)
+    if api_version == API_V1:
+        datetime_list = datetime_index.strftime(response_datetime_pattern).to_list()
+    else:
+        datetime_list = [datetime_.isoformat() for datetime_ in datetime_index]
+    boiler_out_temps = np.round(forward_temps, 1).tolist()
+
+    predicted_boiler_temp_list = list(zip(datetime_list, boiler_out_temps))
+    return json.dumps(
+        predicted_boiler_temp_list,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def get_control_actions_etag(snapshot: ControlActionsSnapshot,
+                             start_idx: int,
+                             end_idx: int,
+                             timezone_name: str,
+                             api_version: str) -> str:
+    request_params = f"{api_version}:{timezone_name}:{start_idx}:{end_idx}".encode("utf-8")
+    request_params_hash = hashlib.blake2b(request_params, digest_size=8).hexdigest()
+    # boot_token отличает срезы с одинаковой версией из разных запусков процесса обновления
+    return f'"{snapshot.boot_token:016x}-{snapshot.version}-{request_params_hash}"'
+
+
+def is_etag_matched(etag: str, if_none_match: Optional[str]) -> bool:
+    if if_none_match is None:
+        return False
+    for requested_etag in if_none_match.split(","):
+        requested_etag = requested_etag.strip()
+        if requested_etag.startswith("W/"):
+            requested_etag = requested_etag[2:]
+        if requested_etag in ("*", etag):
+            return True
+    return False
+
+
+def get_cache_control(next_update_datetime: Optional[pd.Timestamp]) -> str:
+    if next_update_datetime is None:
+        return "no-cache"
+    seconds_to_next_update = (next_update_datetime - pd.Timestamp.now(tz=next_update_datetime.tz)).total_seconds()
+    return f"max-age={max(int(seconds_to_next_update), 0)}"
+
+
+def get_control_actions_content(response_cache: ControlActionResponseCache,
+                                snapshot: ControlActionsSnapshot,
+                                start_idx: int,
+                                end_idx: int,
+                                timezone: tzinfo,
+                                timezone_name: str,
+                                api_version: str,
+                                response_datetime_pattern: Optional[str] = None) -> bytes:
+    cache_key = (api_version, timezone_name, snapshot.boot_token, snapshot.version, start_idx, end_idx)
+    content = response_cache.get(cache_key)
+    if content is None:
+        timestamps, forward_temps = snapshot.get_arrays(start_idx, end_idx)
+        content = render_control_actions(timestamps, forward_temps, timezone, api_version, response_datetime_pattern)
+        response_cache.put(cache_key, content)
+    return content
+
+
+def make_control_actions_response(response_cache: ControlActionResponseCache,
+                                  snapshot: ControlActionsSnapshot,
+                                  start_datetime: pd.Timestamp,
+                                  end_datetime: pd.Timestamp,
+                                  timezone: tzinfo,
+                                  timezone_name: str,
+                                  api_version: str,
+                                  if_none_match: Optional[str] = None,
+                                  next_update_datetime: Optional[pd.Timestamp] = None,
+                                  response_datetime_pattern: Optional[str] = None) -> Response:
+    start_idx, end_idx = snapshot.get_bounds(start_datetime, end_datetime)
+    headers = {
+        "ETag": get_control_actions_etag(snapshot, start_idx, end_idx, timezone_name, api_version),
+        "Cache-Control": get_cache_control(next_update_datetime)
+    }
+    if is_etag_matched(headers["ETag"], if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    content = get_control_actions_content(
+        response_cache,
+        snapshot,
+        start_idx,
+        end_idx,
+        timezone,
+        timezone_name,
+        api_version,
+        response_datetime_pattern
+    )
+    return Response(content=content, media_type=JSONResponse.media_type, headers=headers)
@@ -8,8 +8,8 @@ from fastapi import Depends, HTTPException
 from starlette import status
 
 from boiler.constants import time_tick
-from boiler.parsing_utils.datetime_parsing import parse_datetime
 from backend.containers.core import Core
+from backend.parsing.precompiled_datetime_parser import PrecompiledDatetimeParser
 
 
 class InputTimezone:
@@ -42,22 +42,20 @@ class InputDatesRange:
             start_date: Optional[str] = None,
             end_date: Optional[str] = None,
             work_timezone: InputTimezone = Depends(),
-            datetime_processing_params=Depends(Provide[Core.config.datetime_processing])
+            datetime_parser: PrecompiledDatetimeParser = Depends(Provide[Core.datetime_parser])
     ):
-        request_datetime_patterns = datetime_processing_params.get("request_patterns")
-
         if start_date is None:
             start_date = pd.Timestamp.now(tz=work_timezone.timezone)
         else:
             start_date = pd.Timestamp(
-                parse_datetime(start_date, request_datetime_patterns, timezone=work_timezone.timezone)
+                datetime_parser.parse_datetime(start_date, timezone=work_timezone.timezone)
             )
 
         if end_date is None:
             end_date = start_date + time_tick.TIME_TICK
         else:
             end_date = pd.Timestamp(
-                parse_datetime(end_date, request_datetime_patterns, timezone=work_timezone.timezone)
+                datetime_parser.parse_datetime(end_date, timezone=work_timezone.timezone)
             )
 
         if start_date >= end_date:
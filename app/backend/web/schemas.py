@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+MAX_BATCH_QUERIES_COUNT = 1000
+MAX_BATCH_SETTINGS_COUNT = 100
+
+
+class ControlActionsQuery(BaseModel):
+    start_datetime: Optional[datetime] = None
+    end_datetime: Optional[datetime] = None
+    timezone_name: Optional[str] = None
+
+
+class ControlActionsBatchRequest(BaseModel):
+    queries: List[ControlActionsQuery] = Field(..., min_items=1, max_items=MAX_BATCH_QUERIES_COUNT)
+
+
+class SettingsBatchRequest(BaseModel):
+    settings: Dict[str, Any] = Field(..., min_items=1, max_items=MAX_BATCH_SETTINGS_COUNT)
@@ -0,0 +1,93 @@
+"""
+Имитация длительной работы хранилища управляющих воздействий:
+частые обновления прогноза, удаление устаревших данных и чтение диапазонов.
+
+Запуск из каталога app:
+    python -m benchmarks.bench_control_actions_repository --cycles 2000 --horizon 2880
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+
+from boiler.constants import column_names, time_tick
+from backend.repositories.control_action_columnar_repository import ControlActionsColumnarRepository
+from backend.repositories.control_action_simple_repository import ControlActionsSimpleRepository
+
+
+def generate_control_actions(start_datetime: pd.Timestamp, horizon: int, random_state) -> pd.DataFrame:
+    return pd.DataFrame({
+        column_names.TIMESTAMP: pd.date_range(start_datetime, periods=horizon, freq=time_tick.TIME_TICK),
+        column_names.FORWARD_PIPE_COOLANT_TEMP: random_state.uniform(40, 95, horizon)
+    })
+
+
+async def simulate_uptime(repository, cycles: int, horizon: int, reads_per_cycle: int, seed: int):
+    random_state = np.random.RandomState(seed)
+    start_datetime = pd.Timestamp("2021-01-01", tz="UTC")
+
+    write_time = 0.0
+    read_time = 0.0
+    for cycle in range(cycles):
+        datetime_now = start_datetime + cycle * time_tick.TIME_TICK
+        control_actions_df = generate_control_actions(datetime_now, horizon, random_state)
+
+        started_at = time.perf_counter()
+        await repository.update_control_action(control_actions_df)
+        await repository.delete_control_action_older_than(datetime_now)
+        write_time += time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        for _ in range(reads_per_cycle):
+            await repository.get_control_action(datetime_now, datetime_now + time_tick.TIME_TICK)
+        read_time += time.perf_counter() - started_at
+
+    return write_time, read_time
+
+
+async def check_correctness(horizon: int, seed: int):
+    repositories = (ControlActionsSimpleRepository(), ControlActionsColumnarRepository())
+    for repository in repositories:
+        await simulate_uptime(repository, cycles=20, horizon=horizon, reads_per_cycle=0, seed=seed)
+
+    expected_df, actual_df = [await repository.get_control_action() for repository in repositories]
+    assert len(expected_df) == len(actual_df)
+    np.testing.assert_array_equal(
+        pd.DatetimeIndex(expected_df[column_names.TIMESTAMP]).asi8,
+        pd.DatetimeIndex(actual_df[column_names.TIMESTAMP]).asi8
+    )
+    np.testing.assert_array_equal(
+        expected_df[column_names.FORWARD_PIPE_COOLANT_TEMP].to_numpy(dtype=np.float64),
+        actual_df[column_names.FORWARD_PIPE_COOLANT_TEMP].to_numpy(dtype=np.float64)
+    )
+
+
+async def main(cmd_args):
+    await check_correctness(cmd_args.horizon, cmd_args.seed)
+
+    print(f"{'repository':>36} {'writes, ms/cycle':>18} {'reads, us/request':>18}")
+    for repository in (ControlActionsSimpleRepository(), ControlActionsColumnarRepository()):
+        write_time, read_time = await simulate_uptime(
+            repository,
+            cmd_args.cycles,
+            cmd_args.horizon,
+            cmd_args.reads_per_cycle,
+            cmd_args.seed
+        )
+        write_ms_per_cycle = write_time / cmd_args.cycles * 1e3
+        read_us_per_request = read_time / max(cmd_args.cycles * cmd_args.reads_per_cycle, 1) * 1e6
+        print(f"{repository.__class__.__name__:>36} {write_ms_per_cycle:>18.3f} {read_us_per_request:>18.1f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Control actions repository benchmark')
+    parser.add_argument('--cycles', type=int, default=2000, help='update cycles to simulate')
+    parser.add_argument('--horizon', type=int, default=2880, help='control actions in each update')
+    parser.add_argument('--reads-per-cycle', type=int, default=20, help='range requests between updates')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -0,0 +1,64 @@
+"""
+Сравнение разбора дат запросов v1: boiler.parsing_utils.parse_datetime против PrecompiledDatetimeParser.
+Шаблоны берутся из того же файла конфигов, что использует приложение.
+
+Запуск из каталога app:
+    python -m benchmarks.bench_datetime_parsing --config ../storage/config/config.yaml \
+        --datetime "2021-04-20 12:30" "2021-04-20 15:30"
+"""
+
+import argparse
+import timeit
+
+import yaml
+from dateutil.tz import gettz
+
+from boiler.parsing_utils.datetime_parsing import parse_datetime
+from backend.parsing.precompiled_datetime_parser import PrecompiledDatetimeParser
+
+
+def main(cmd_args):
+    with open(cmd_args.config) as f:
+        config = yaml.safe_load(f)
+    datetime_processing_params = config["core"]["datetime_processing"]
+    request_patterns = datetime_processing_params["request_patterns"]
+    timezone = gettz(datetime_processing_params["default_timezone"])
+
+    parser = PrecompiledDatetimeParser(request_patterns)
+    datetime_strings = cmd_args.datetime
+    for datetime_as_str in datetime_strings:
+        expected = parse_datetime(datetime_as_str, request_patterns, timezone=timezone)
+        actual = parser.parse_datetime(datetime_as_str, timezone=timezone)
+        assert expected == actual, f"{datetime_as_str}: {expected} != {actual}"
+
+    def parse_with_generic_parser():
+        for datetime_as_str_ in datetime_strings:
+            parse_datetime(datetime_as_str_, request_patterns, timezone=timezone)
+
+    def parse_with_precompiled_parser():
+        for datetime_as_str_ in datetime_strings:
+            parser.parse_datetime(datetime_as_str_, timezone=timezone)
+
+    def parse_with_precompiled_parser_uncached():
+        for datetime_as_str_ in datetime_strings:
+            parser._parse_datetime(datetime_as_str_, timezone)
+
+    print(f"{'parser':>32} {'us/string':>10}")
+    for name, func in (("parse_datetime", parse_with_generic_parser),
+                       ("precompiled, not memoized", parse_with_precompiled_parser_uncached),
+                       ("precompiled, memoized", parse_with_precompiled_parser)):
+        best_time = min(timeit.repeat(func, number=cmd_args.number, repeat=cmd_args.repeats))
+        us_per_string = best_time / (cmd_args.number * len(datetime_strings)) * 1e6
+        print(f"{name:>32} {us_per_string:>10.2f}")
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Request datetime parsing benchmark')
+    arg_parser.add_argument('--config', default="../storage/config/config.yaml", help='path to config file')
+    arg_parser.add_argument('--datetime', nargs='+', required=True,
+                            help='request datetime strings in one of configured request_patterns')
+    arg_parser.add_argument('--number', type=int, default=10_000)
+    arg_parser.add_argument('--repeats', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    main(args)
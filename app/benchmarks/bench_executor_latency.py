@@ -0,0 +1,92 @@
+"""
+Задержка цикла событий во время расчёта управляющих воздействий
+при разных исполнителях расчётов (thread, process, inline).
+
+Пока расчёт повторяется в исполнителе, в цикле событий работает «пульс»,
+который засыпает на interval и замеряет, насколько позже он просыпается.
+Это приближение к задержке, которую получает обработка HTTP запросов во время обновления.
+
+Запуск из каталога app:
+    python -m benchmarks.bench_executor_latency --kinds thread process --horizon 14400
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from boiler.constants import column_names
+from backend.calculators.corr_table_search_index import CorrTableSearchIndex
+from backend.calculators.executor_tasks import predict_control_temps
+from backend.calculators.indexed_corr_table_temp_predictor import IndexedCorrTableTempPredictor
+from backend.resources.executor_resource import ExecutorResource
+from benchmarks.synthetic_data import generate_home_time_deltas, generate_temp_correlation_table, \
+    generate_temp_requirements
+
+
+async def measure_loop_lag(interval: float, stop_event: asyncio.Event) -> list:
+    lags = []
+    while not stop_event.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started_at - interval)
+    return lags
+
+
+async def run_updates(executor, temp_predictor, temp_requirements_arr, updates_count: int) -> float:
+    loop = asyncio.get_running_loop()
+    started_at = time.perf_counter()
+    for _ in range(updates_count):
+        await loop.run_in_executor(executor, predict_control_temps, temp_predictor, temp_requirements_arr)
+    return time.perf_counter() - started_at
+
+
+async def bench_executor_kind(kind: str, temp_predictor, temp_requirements_arr, cmd_args) -> None:
+    executor_resource = ExecutorResource()
+    executor = executor_resource.init(kind, cmd_args.max_workers)
+    try:
+        # Прогрев: запуск процессов пула и импорт модулей в них
+        await run_updates(executor, temp_predictor, temp_requirements_arr, 1)
+
+        stop_event = asyncio.Event()
+        lag_task = asyncio.ensure_future(measure_loop_lag(cmd_args.interval, stop_event))
+        updates_time = await run_updates(executor, temp_predictor, temp_requirements_arr, cmd_args.updates)
+        stop_event.set()
+        lags = np.array(await lag_task) * 1e3
+    finally:
+        executor_resource.shutdown(executor)
+
+    print(f"{kind:>8} {updates_time / cmd_args.updates * 1e3:>11.2f} "
+          f"{np.percentile(lags, 50):>9.2f} {np.percentile(lags, 99):>9.2f} {lags.max():>9.2f}")
+
+
+async def main(cmd_args):
+    temp_predictor = IndexedCorrTableTempPredictor(
+        CorrTableSearchIndex(
+            generate_temp_correlation_table(cmd_args.table_size, cmd_args.homes),
+            generate_home_time_deltas(cmd_args.homes)
+        ),
+        home_min_temp_coefficient=0.98
+    )
+    temp_requirements_arr = generate_temp_requirements(cmd_args.horizon)[
+        column_names.FORWARD_PIPE_COOLANT_TEMP
+    ].to_numpy()
+
+    print(f"{'executor':>8} {'update, ms':>11} {'p50 lag':>9} {'p99 lag':>9} {'max lag':>9}")
+    for kind in cmd_args.kinds:
+        await bench_executor_kind(kind, temp_predictor, temp_requirements_arr, cmd_args)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Event loop lag while control actions are calculated')
+    parser.add_argument('--kinds', nargs='+', default=["inline", "thread", "process"])
+    parser.add_argument('--max-workers', type=int, default=None)
+    parser.add_argument('--table-size', type=int, default=7001, help='boiler temps count in correlation table')
+    parser.add_argument('--homes', type=int, default=100, help='homes count')
+    parser.add_argument('--horizon', type=int, default=14400, help='temp requirements count')
+    parser.add_argument('--updates', type=int, default=20)
+    parser.add_argument('--interval', type=float, default=0.001, help='event loop pulse interval, seconds')
+    args = parser.parse_args()
+
+    asyncio.get_event_loop().run_until_complete(main(args))
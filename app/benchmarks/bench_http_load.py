@@ -0,0 +1,381 @@
+"""
+Нагрузочное тестирование приложения по HTTP с локальными заглушками серверов SoftM.
+
+Скрипт запускает две заглушки: сервер прогноза погоды и сервер температурного графика.
+Заглушки отвечают с заданной задержкой и размером ответа на запрос по любому пути.
+Затем скрипт запускает main.py с конфигом, в котором адреса серверов SoftM заменены адресами заглушек,
+ждёт готовности приложения (/health/ready) и подаёт запросы к /api/v1 и /api/v2/getPredictedBoilerT
+с заданной частотой, пока в фоне идут циклы обновления.
+
+Запросы подаются по расписанию независимо от ответов (открытая модель нагрузки),
+задержка отсчитывается от запланированного момента отправки, поэтому очередь на стороне клиента
+тоже попадает в замер. По каждому эндпоинту выводятся перцентили задержки и пропускная способность.
+
+Синтетические ответы заглушек повторяют формат ответов SoftM, который разбирают
+SoftMSyncWeatherForecastJSONReader и SoftMSyncTempGraphJSONReader.
+Вместо них можно отдавать записанные ответы реальных серверов (--weather-payload, --temp-graph-payload).
+
+Запуск из каталога app:
+    python -m benchmarks.bench_http_load --config ../storage/config/config.yaml --rate 200 --duration 60 \
+        --upstream-latency 0.3 --update-interval 10 --output ../storage/http_load.json
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+import numpy as np
+import pandas as pd
+import yaml
+from aiohttp import web
+
+from boiler.constants import time_tick
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READINESS_PATH = "/health/ready"
+ENDPOINTS = {
+    "v1": "/api/v1/getPredictedBoilerT",
+    "v2": "/api/v2/getPredictedBoilerT"
+}
+SUCCESS_STATUSES = (200, 304)
+PERCENTILES = (50, 90, 99)
+
+# Поля ответов SoftM
+SOFTM_WEATHER_TIMESTAMP = "time"
+SOFTM_WEATHER_TEMP = "temp"
+SOFTM_WEATHER_DATETIME_PATTERN = "%Y-%m-%d %H:%M:%S"
+SOFTM_TEMP_GRAPH_WEATHER_TEMP = "tnv"
+SOFTM_TEMP_GRAPH_FORWARD_TEMP = "t1"
+SOFTM_TEMP_GRAPH_BACKWARD_TEMP = "t2"
+
+
+def make_weather_forecast_payload(points_count: int, seed: int) -> bytes:
+    # Сервер SoftM отдаёт прогноз во временной зоне weather_server_timezone без указания зоны
+    start_datetime = pd.Timestamp.now().floor(time_tick.TIME_TICK)
+    datetime_index = pd.date_range(start_datetime, periods=points_count, freq="H")
+    day_phase_arr = np.arange(points_count) / 24 * 2 * np.pi
+    weather_temp_arr = -10 + 8 * np.sin(day_phase_arr) + np.random.RandomState(seed).normal(0, 1.5, points_count)
+    return json.dumps([
+        {SOFTM_WEATHER_TIMESTAMP: timestamp, SOFTM_WEATHER_TEMP: round(weather_temp, 1)}
+        for timestamp, weather_temp in zip(datetime_index.strftime(SOFTM_WEATHER_DATETIME_PATTERN),
+                                           weather_temp_arr.tolist())
+    ]).encode()
+
+
+def make_temp_graph_payload(rows_count: int) -> bytes:
+    weather_temp_arr = np.linspace(8, -40, rows_count)
+    return json.dumps([
+        {
+            SOFTM_TEMP_GRAPH_WEATHER_TEMP: round(weather_temp, 1),
+            SOFTM_TEMP_GRAPH_FORWARD_TEMP: round(45 - 1.3 * (weather_temp - 8), 1),
+            SOFTM_TEMP_GRAPH_BACKWARD_TEMP: round(38 - 0.7 * (weather_temp - 8), 1)
+        }
+        for weather_temp in weather_temp_arr.tolist()
+    ]).encode()
+
+
+def weather_payload_factory(weather_payload: Optional[bytes], points_count: int):
+    if weather_payload is not None:
+        return lambda: weather_payload
+
+    # Каждый ответ - новый прогноз, чтобы циклы обновления не пропускали расчёт
+    responses_count = 0
+
+    def make_payload() -> bytes:
+        nonlocal responses_count
+        responses_count += 1
+        return make_weather_forecast_payload(points_count, seed=responses_count)
+
+    return make_payload
+
+
+class StubSoftMServer:
+    """
+    Заглушка сервера SoftM: на запрос по любому пути отдаёт ответ payload_factory()
+    после задержки latency ± jitter секунд.
+    """
+
+    def __init__(self, payload_factory, latency: float = 0, jitter: float = 0) -> None:
+        self._payload_factory = payload_factory
+        self._latency = latency
+        self._jitter = jitter
+        self._random_state = np.random.RandomState(0)
+        self._runner: Optional[web.AppRunner] = None
+        self.requests_count = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests_count += 1
+        delay = self._latency + self._random_state.uniform(-self._jitter, self._jitter)
+        await asyncio.sleep(max(delay, 0))
+        return web.Response(body=self._payload_factory(), content_type="application/json")
+
+
+def _set_config_value(config: dict, path: str, value) -> None:
+    *sections, key = path.split(".")
+    for section in sections:
+        if config.get(section) is None:
+            config[section] = {}
+        config = config[section]
+    config[key] = value
+
+
+def make_app_config(base_config: dict,
+                    port: int,
+                    weather_server_address: str,
+                    temp_graph_server_address: str,
+                    update_interval: Optional[float]) -> dict:
+    config = copy.deepcopy(base_config)
+    _set_config_value(config, "server.host", "127.0.0.1")
+    _set_config_value(config, "server.port", port)
+    _set_config_value(config, "services.temp_requirements_calculation.weather_server_address",
+                      weather_server_address)
+    _set_config_value(config, "services.temp_graph_providing.temp_graph_server_address",
+                      temp_graph_server_address)
+    if update_interval is not None:
+        _set_config_value(config, "services.updater.temp_requirements_update_interval", update_interval)
+        _set_config_value(config, "services.updater.temp_graph_update_interval", update_interval)
+    return config
+
+
+async def wait_ready(session: aiohttp.ClientSession,
+                     base_url: str,
+                     process: asyncio.subprocess.Process,
+                     timeout: float) -> float:
+    started_at = time.perf_counter()
+    while time.perf_counter() - started_at < timeout:
+        if process.returncode is not None:
+            raise RuntimeError(f"main.py exited with code {process.returncode} before getting ready")
+        try:
+            async with session.get(base_url + READINESS_PATH) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started_at
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.1)
+    raise TimeoutError(f"Application is not ready in {timeout} seconds")
+
+
+async def drive_load(session: aiohttp.ClientSession,
+                     base_url: str,
+                     endpoints: List[str],
+                     rate: float,
+                     duration: float) -> Dict[str, Dict[str, list]]:
+    results = {endpoint: {"latencies": [], "errors": []} for endpoint in endpoints}
+
+    async def send(endpoint: str, scheduled_at: float) -> None:
+        try:
+            async with session.get(base_url + ENDPOINTS[endpoint]) as response:
+                await response.read()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            results[endpoint]["errors"].append(e.__class__.__name__)
+            return
+        if status in SUCCESS_STATUSES:
+            results[endpoint]["latencies"].append(time.perf_counter() - scheduled_at)
+        else:
+            results[endpoint]["errors"].append(str(status))
+
+    requests_count = int(rate * duration)
+    started_at = time.perf_counter()
+    tasks = []
+    for request_idx in range(requests_count):
+        scheduled_at = started_at + request_idx / rate
+        delay = scheduled_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        endpoint = endpoints[request_idx % len(endpoints)]
+        tasks.append(asyncio.ensure_future(send(endpoint, scheduled_at)))
+    await asyncio.gather(*tasks)
+    return results
+
+
+def summarize(latencies: List[float], errors: List[str], duration: float) -> dict:
+    summary = {
+        "requests": len(latencies) + len(errors),
+        "errors": len(errors),
+        "throughput_rps": len(latencies) / duration
+    }
+    if errors:
+        summary["error_kinds"] = {kind: errors.count(kind) for kind in sorted(set(errors))}
+    if latencies:
+        latency_arr = np.array(latencies) * 1e3
+        for percentile in PERCENTILES:
+            summary[f"p{percentile}_ms"] = float(np.percentile(latency_arr, percentile))
+        summary["max_ms"] = float(latency_arr.max())
+    return summary
+
+
+def print_summary(results: Dict[str, dict]) -> None:
+    print(f"{'endpoint':>10} {'requests':>9} {'errors':>7} {'rps':>8} "
+          f"{'p50, ms':>9} {'p90, ms':>9} {'p99, ms':>9} {'max, ms':>9}")
+    for endpoint, summary in results.items():
+        latency_columns = " ".join(
+            f"{summary.get(key, float('nan')):>9.2f}" for key in ("p50_ms", "p90_ms", "p99_ms", "max_ms")
+        )
+        print(f"{endpoint:>10} {summary['requests']:>9} {summary['errors']:>7} "
+              f"{summary['throughput_rps']:>8.1f} {latency_columns}")
+        for kind, count in summary.get("error_kinds", {}).items():
+            print(f"{'':>10} {kind}: {count}")
+
+
+def load_payload(path: Optional[str]) -> Optional[bytes]:
+    if path is None:
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def run_load_test(cmd_args) -> dict:
+    weather_payload = load_payload(cmd_args.weather_payload)
+    temp_graph_payload = load_payload(cmd_args.temp_graph_payload)
+    if temp_graph_payload is None:
+        temp_graph_payload = make_temp_graph_payload(cmd_args.temp_graph_rows)
+
+    weather_server = StubSoftMServer(
+        weather_payload_factory(weather_payload, cmd_args.weather_points),
+        cmd_args.upstream_latency,
+        cmd_args.upstream_jitter
+    )
+    temp_graph_server = StubSoftMServer(
+        lambda: temp_graph_payload,
+        cmd_args.upstream_latency,
+        cmd_args.upstream_jitter
+    )
+    weather_server_address = await weather_server.start()
+    temp_graph_server_address = await temp_graph_server.start()
+
+    with open(cmd_args.config) as f:
+        base_config = yaml.safe_load(f)
+    app_config = make_app_config(base_config,
+                                 cmd_args.port,
+                                 weather_server_address,
+                                 temp_graph_server_address,
+                                 cmd_args.update_interval)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = os.path.join(tmp_dir, "config.yaml")
+        with open(config_path, "w") as f:
+            yaml.safe_dump(app_config, f)
+
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "main.py", "--config", config_path, "--workers", str(cmd_args.workers),
+            cwd=APP_DIR,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=None if cmd_args.app_output else asyncio.subprocess.DEVNULL
+        )
+        base_url = f"http://127.0.0.1:{cmd_args.port}"
+        connector = aiohttp.TCPConnector(limit=cmd_args.connections)
+        timeout = aiohttp.ClientTimeout(total=cmd_args.request_timeout)
+        try:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                ready_time = await wait_ready(session, base_url, process, cmd_args.ready_timeout)
+                print(f"Application is ready in {ready_time:.2f} s")
+                if cmd_args.warmup > 0:
+                    await drive_load(session, base_url, cmd_args.endpoints, cmd_args.rate, cmd_args.warmup)
+
+                upstream_requests_before = weather_server.requests_count, temp_graph_server.requests_count
+                started_at = time.perf_counter()
+                raw_results = await drive_load(session, base_url, cmd_args.endpoints,
+                                               cmd_args.rate, cmd_args.duration)
+                elapsed = time.perf_counter() - started_at
+        finally:
+            if process.returncode is None:
+                process.terminate()
+            await process.wait()
+            await weather_server.stop()
+            await temp_graph_server.stop()
+
+    all_latencies = [latency for result in raw_results.values() for latency in result["latencies"]]
+    all_errors = [error for result in raw_results.values() for error in result["errors"]]
+    endpoints_summary = {
+        endpoint: summarize(result["latencies"], result["errors"], elapsed)
+        for endpoint, result in raw_results.items()
+    }
+    endpoints_summary["total"] = summarize(all_latencies, all_errors, elapsed)
+    return {
+        "ready_time_s": ready_time,
+        "elapsed_s": elapsed,
+        "upstream_requests": {
+            "weather_forecast": weather_server.requests_count - upstream_requests_before[0],
+            "temp_graph": temp_graph_server.requests_count - upstream_requests_before[1]
+        },
+        "endpoints": endpoints_summary
+    }
+
+
+def main(cmd_args) -> int:
+    results = asyncio.get_event_loop().run_until_complete(run_load_test(cmd_args))
+
+    print(f"{cmd_args.duration} s at {cmd_args.rate} rps, "
+          f"upstream requests during the run: {results['upstream_requests']}")
+    print_summary(results["endpoints"])
+
+    if cmd_args.output is not None:
+        report = {
+            "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+            "params": {
+                "rate": cmd_args.rate,
+                "duration": cmd_args.duration,
+                "endpoints": cmd_args.endpoints,
+                "workers": cmd_args.workers,
+                "connections": cmd_args.connections,
+                "upstream_latency": cmd_args.upstream_latency,
+                "upstream_jitter": cmd_args.upstream_jitter,
+                "weather_points": cmd_args.weather_points,
+                "temp_graph_rows": cmd_args.temp_graph_rows,
+                "update_interval": cmd_args.update_interval
+            },
+            **results
+        }
+        with open(cmd_args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results are saved to {cmd_args.output}")
+
+    return 1 if results["endpoints"]["total"]["errors"] else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='HTTP load test with local SoftM stub servers')
+    parser.add_argument('--config', default="../storage/config/config.yaml", help='base config for main.py')
+    parser.add_argument('--port', type=int, default=8000, help='port for the application')
+    parser.add_argument('--workers', type=int, default=1, help='API workers of the application')
+    parser.add_argument('--endpoints', nargs='+', choices=tuple(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument('--rate', type=float, default=100, help='target requests per second')
+    parser.add_argument('--duration', type=float, default=30, help='load duration, seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='warm up duration before measuring, seconds')
+    parser.add_argument('--connections', type=int, default=100, help='max simultaneous connections')
+    parser.add_argument('--request-timeout', type=float, default=10, help='request timeout, seconds')
+    parser.add_argument('--ready-timeout', type=float, default=120, help='seconds to wait for readiness')
+    parser.add_argument('--upstream-latency', type=float, default=0.2, help='stub servers latency, seconds')
+    parser.add_argument('--upstream-jitter', type=float, default=0.05, help='stub servers latency jitter, seconds')
+    parser.add_argument('--weather-points', type=int, default=72, help='hourly points in weather forecast')
+    parser.add_argument('--temp-graph-rows', type=int, default=49, help='rows in temp graph')
+    parser.add_argument('--weather-payload', default=None, help='recorded weather forecast response to serve')
+    parser.add_argument('--temp-graph-payload', default=None, help='recorded temp graph response to serve')
+    parser.add_argument('--update-interval', type=float, default=None,
+                        help='temp graph and temp requirements update interval for the run, seconds')
+    parser.add_argument('--app-output', action='store_true', help='show stderr of the application')
+    parser.add_argument('--output', default=None, help='path to save results as json')
+    args = parser.parse_args()
+
+    sys.exit(main(args))
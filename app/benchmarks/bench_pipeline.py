@@ -0,0 +1,261 @@
+"""
+Сквозной замер цикла обновления на синтетических данных: время каждого этапа и всего цикла.
+
+Этапы:
+    weather_interpolation - интерполяция прогноза погоды до шага TIME_TICK;
+    temp_requirements_calculation - SimpleTempRequirementsService._calc_temp_requirements;
+    control_actions_calculation - предсказание управляющих воздействий (как в исполнителе сервиса);
+    temp_requirements_write / temp_requirements_read - хранилище требований к температуре;
+    control_actions_write / control_actions_read - хранилище управляющих воздействий;
+    response_serialization - формирование JSON ответа /api/v2/getPredictedBoilerT на весь горизонт;
+    full_cycle - обновление требований к температуре и предсказание через сервисы
+                 с синтетическими загрузчиками прогноза погоды и температурного графика.
+
+Результаты сохраняются в JSON (--output) вместе с версиями библиотек
+и сравниваются с сохранённым прогоном (--compare): если этап медленнее больше чем на tolerance,
+скрипт завершается с кодом 1.
+
+Запуск из каталога app:
+    python -m benchmarks.bench_pipeline --output ../storage/bench_pipeline_baseline.json
+    python -m benchmarks.bench_pipeline --compare ../storage/bench_pipeline_baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from boiler.constants import column_names, time_tick
+from backend.calculators.corr_table_search_index import CorrTableSearchIndex
+from backend.calculators.executor_tasks import predict_control_temps
+from backend.calculators.indexed_corr_table_temp_predictor import IndexedCorrTableTempPredictor
+from backend.calculators.vectorized_temp_graph_requirements_calculator import \
+    VectorizedTempGraphRequirementsCalculator
+from backend.repositories.control_action_columnar_repository import ControlActionsColumnarRepository
+from backend.repositories.control_action_response_cache import ControlActionResponseCache
+from backend.repositories.temp_requirements_sqlite_repository import TempRequirementsSQLiteRepository
+from backend.resources.executor_resource import InlineExecutor
+from backend.services.control_action_prediction_service.corr_table_control_action_prediction_service import \
+    CorrTableControlActionPredictionService
+from backend.services.temp_requirements_update_service.simple_temp_requirements_service import \
+    SimpleTempRequirementsService
+from backend.web.control_action_responses import API_V2, render_control_actions
+from benchmarks.synthetic_data import generate_home_time_deltas, generate_temp_correlation_table, \
+    generate_temp_graph, generate_weather_forecast
+
+RESULTS_FORMAT_VERSION = 1
+VERSIONED_PACKAGES = ("numpy", "pandas", "boiler", "boiler-softm", "aiosqlite")
+
+
+class SyntheticWeatherLoader:
+    """
+    Загрузчик прогноза погоды, каждый вызов которого возвращает новый прогноз,
+    чтобы сервис не пропускал расчёт из-за неизменившихся данных.
+    """
+
+    def __init__(self, points_count: int, freq: pd.Timedelta) -> None:
+        self._points_count = points_count
+        self._freq = freq
+        self._loads_count = 0
+
+    async def load_weather(self, start_datetime: Optional[pd.Timestamp] = None, end_datetime=None):
+        self._loads_count += 1
+        return generate_weather_forecast(self._points_count, seed=self._loads_count, freq=self._freq)
+
+
+class SyntheticTempGraphLoader:
+
+    def __init__(self, temp_graph: pd.DataFrame) -> None:
+        self._temp_graph = temp_graph
+
+    def load_temp_graph(self) -> pd.DataFrame:
+        return self._temp_graph
+
+
+async def measure_stage(stage: Callable, repeats: int) -> Dict[str, float]:
+    stage_times = []
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        result = stage()
+        if asyncio.iscoroutine(result):
+            await result
+        stage_times.append(time.perf_counter() - started_at)
+    return {
+        "median_s": float(np.median(stage_times)),
+        "min_s": float(np.min(stage_times)),
+        "repeats": repeats
+    }
+
+
+def get_packages_versions() -> Dict[str, Optional[str]]:
+    from importlib import metadata
+    versions = {}
+    for package in VERSIONED_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+async def run_benchmark(cmd_args) -> Dict[str, Dict[str, float]]:
+    weather_freq = pd.Timedelta(seconds=cmd_args.weather_step)
+    weather_points_count = int(cmd_args.horizon * time_tick.TIME_TICK / weather_freq) + 1
+    raw_weather_df = generate_weather_forecast(weather_points_count, freq=weather_freq)
+    temp_graph = generate_temp_graph()
+    temp_predictor = IndexedCorrTableTempPredictor(
+        CorrTableSearchIndex(
+            generate_temp_correlation_table(cmd_args.table_size, cmd_args.homes),
+            generate_home_time_deltas(cmd_args.homes)
+        ),
+        home_min_temp_coefficient=0.98
+    )
+
+    temp_requirements_repository = TempRequirementsSQLiteRepository()
+    control_actions_repository = ControlActionsColumnarRepository()
+    temp_requirements_service = SimpleTempRequirementsService(
+        temp_graph_loader=SyntheticTempGraphLoader(temp_graph),
+        weather_loader=SyntheticWeatherLoader(weather_points_count, weather_freq),
+        temp_requirements_repository=temp_requirements_repository,
+        temp_graph_requirements_calculator=VectorizedTempGraphRequirementsCalculator(),
+        executor=InlineExecutor()
+    )
+    prediction_service = CorrTableControlActionPredictionService(
+        temp_predictor=temp_predictor,
+        temp_requirements_repository=temp_requirements_repository,
+        control_actions_repository=control_actions_repository,
+        control_actions_response_cache=ControlActionResponseCache(),
+        executor=InlineExecutor()
+    )
+
+    weather_df = temp_requirements_service._interpolate_weather_forecast(raw_weather_df)
+    temp_requirements_df = temp_requirements_service._calc_temp_requirements(weather_df, temp_graph)
+    forward_temp_arr = temp_requirements_df[column_names.FORWARD_PIPE_COOLANT_TEMP].to_numpy()
+    control_actions_df = prediction_service._make_control_actions_df(
+        temp_requirements_df,
+        predict_control_temps(temp_predictor, forward_temp_arr)
+    )
+    start_datetime = temp_requirements_df[column_names.TIMESTAMP].iloc[0]
+    end_datetime = temp_requirements_df[column_names.TIMESTAMP].iloc[-1]
+
+    async def write_control_actions():
+        await control_actions_repository.set_control_action(control_actions_df)
+
+    await write_control_actions()
+    snapshot = control_actions_repository.get_snapshot()
+    snapshot_timestamps, snapshot_forward_temps = snapshot.get_arrays(0, len(snapshot))
+
+    async def run_full_cycle():
+        await temp_requirements_service.update_temp_requirements_async()
+        await prediction_service.predict_control_actions_async()
+
+    stages = {
+        "weather_interpolation":
+            lambda: temp_requirements_service._interpolate_weather_forecast(raw_weather_df),
+        "temp_requirements_calculation":
+            lambda: temp_requirements_service._calc_temp_requirements(weather_df, temp_graph),
+        "control_actions_calculation":
+            lambda: prediction_service._make_control_actions_df(
+                temp_requirements_df,
+                predict_control_temps(temp_predictor, forward_temp_arr)
+            ),
+        "temp_requirements_write":
+            lambda: temp_requirements_repository.set_temp_requirements(temp_requirements_df),
+        "temp_requirements_read":
+            lambda: temp_requirements_repository.get_temp_requirements(start_datetime, end_datetime),
+        "control_actions_write": write_control_actions,
+        "control_actions_read":
+            lambda: control_actions_repository.get_control_action(start_datetime, end_datetime),
+        "response_serialization":
+            lambda: render_control_actions(
+                snapshot_timestamps, snapshot_forward_temps, snapshot.timezone, API_V2
+            ),
+        "full_cycle": run_full_cycle
+    }
+
+    results = {}
+    for stage_name, stage in stages.items():
+        if cmd_args.stages and stage_name not in cmd_args.stages:
+            continue
+        results[stage_name] = await measure_stage(stage, cmd_args.repeats)
+
+    await temp_requirements_repository.close()
+    return results
+
+
+def compare_results(results: Dict[str, Dict[str, float]],
+                    baseline: Dict[str, Dict[str, float]],
+                    tolerance: float) -> List[str]:
+    print(f"{'stage':>30} {'baseline, ms':>13} {'current, ms':>12} {'ratio':>7}")
+    regressions = []
+    for stage_name, stage_result in results.items():
+        baseline_result = baseline.get(stage_name)
+        if baseline_result is None:
+            continue
+        ratio = stage_result["median_s"] / baseline_result["median_s"]
+        print(f"{stage_name:>30} {baseline_result['median_s'] * 1e3:>13.2f} "
+              f"{stage_result['median_s'] * 1e3:>12.2f} {ratio:>6.2f}x")
+        if ratio > 1 + tolerance:
+            regressions.append(f"{stage_name} is {ratio:.2f}x slower than baseline")
+    return regressions
+
+
+def main(cmd_args) -> int:
+    results = asyncio.get_event_loop().run_until_complete(run_benchmark(cmd_args))
+
+    print(f"{'stage':>30} {'median, ms':>11} {'min, ms':>9}")
+    for stage_name, stage_result in results.items():
+        print(f"{stage_name:>30} {stage_result['median_s'] * 1e3:>11.2f} {stage_result['min_s'] * 1e3:>9.2f}")
+
+    report = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "packages": get_packages_versions(),
+        "params": {
+            "horizon": cmd_args.horizon,
+            "weather_step": cmd_args.weather_step,
+            "table_size": cmd_args.table_size,
+            "homes": cmd_args.homes,
+            "repeats": cmd_args.repeats
+        },
+        "stages": results
+    }
+    if cmd_args.output is not None:
+        with open(cmd_args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results are saved to {cmd_args.output}")
+
+    if cmd_args.compare is None:
+        return 0
+    with open(cmd_args.compare) as f:
+        baseline_report = json.load(f)
+    if baseline_report.get("params") != report["params"]:
+        print(f"WARNING baseline params {baseline_report.get('params')} differ from {report['params']}")
+    regressions = compare_results(results, baseline_report["stages"], cmd_args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='End-to-end update cycle benchmark')
+    parser.add_argument('--horizon', type=int, default=14400, help='temp requirements count (TIME_TICK steps)')
+    parser.add_argument('--weather-step', type=float, default=3600, help='weather forecast step, seconds')
+    parser.add_argument('--table-size', type=int, default=7001, help='boiler temps count in correlation table')
+    parser.add_argument('--homes', type=int, default=100, help='homes count')
+    parser.add_argument('--repeats', type=int, default=10, help='repeats for each stage')
+    parser.add_argument('--stages', nargs='+', default=None, help='stages to run, all by default')
+    parser.add_argument('--output', default=None, help='path to save results as json')
+    parser.add_argument('--compare', default=None, help='results json of a previous run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown relative to baseline')
+    args = parser.parse_args()
+
+    sys.exit(main(args))
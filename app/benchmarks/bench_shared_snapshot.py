@@ -0,0 +1,100 @@
+"""
+Проверка и замер чтения разделяемого среза управляющих воздействий несколькими процессами.
+
+Писатель непрерывно публикует срезы, в которых температура однозначно определяется
+версией среза и меткой времени, а читатели в отдельных процессах проверяют,
+что каждый прочитанный срез согласован, и считают число чтений в секунду.
+
+Запуск из каталога app:
+    python -m benchmarks.bench_shared_snapshot --readers 4 --points 10000 --duration 5
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from backend.repositories.control_actions_snapshot import ControlActionsSnapshot
+from backend.repositories.shared_control_actions_snapshot import SharedControlActionsSnapshotReader, \
+    SharedControlActionsSnapshotWriter
+
+TIMESTAMPS_STEP = 180 * 10 ** 9
+
+
+def make_snapshot(version: int, points_count: int) -> ControlActionsSnapshot:
+    # Длина среза меняется от версии к версии, чтобы проверить и счётчик записей
+    count = points_count - version % 100
+    timestamps = (np.arange(count, dtype=np.int64) + version) * TIMESTAMPS_STEP
+    forward_temps = (timestamps // TIMESTAMPS_STEP + version) % 1000 / 10
+    return ControlActionsSnapshot(timestamps, forward_temps, version=version)
+
+
+def check_snapshot(snapshot: ControlActionsSnapshot, points_count: int) -> None:
+    expected = make_snapshot(snapshot.version, points_count)
+    if not (np.array_equal(snapshot.timestamps, expected.timestamps) and
+            np.array_equal(snapshot.forward_temps, expected.forward_temps)):
+        raise AssertionError(f"Snapshot version {snapshot.version} is torn")
+
+
+def run_reader(path: str, points_count: int, duration: float, results: multiprocessing.Queue) -> None:
+    reader = SharedControlActionsSnapshotReader(path)
+    reads_count = 0
+    versions = set()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        snapshot = reader.get_snapshot()
+        if snapshot.version not in versions:
+            check_snapshot(snapshot, points_count)
+            versions.add(snapshot.version)
+        reads_count += 1
+    results.put((reads_count, len(versions)))
+
+
+def main(cmd_args):
+    path = os.path.join(tempfile.mkdtemp(), "control_actions.snapshot")
+    writer = SharedControlActionsSnapshotWriter(path, capacity=cmd_args.points)
+    writer.publish(make_snapshot(1, cmd_args.points))
+
+    spawn_context = multiprocessing.get_context("spawn")
+    results = spawn_context.Queue()
+    readers = [
+        spawn_context.Process(target=run_reader, args=(path, cmd_args.points, cmd_args.duration, results))
+        for _ in range(cmd_args.readers)
+    ]
+    for reader in readers:
+        reader.start()
+
+    version = 1
+    deadline = time.monotonic() + cmd_args.duration
+    while time.monotonic() < deadline:
+        version += 1
+        writer.publish(make_snapshot(version, cmd_args.points))
+        time.sleep(cmd_args.publish_interval)
+
+    reader_results = [results.get() for _ in readers]
+    for reader in readers:
+        reader.join()
+        if reader.exitcode != 0:
+            raise AssertionError(f"Reader exited with code {reader.exitcode}")
+    writer.close()
+
+    total_reads = sum(reads_count for reads_count, _ in reader_results)
+    print(f"published {version} snapshots of {cmd_args.points} points")
+    for reader_idx, (reads_count, versions_count) in enumerate(reader_results):
+        print(f"reader {reader_idx}: {reads_count / cmd_args.duration:,.0f} reads/s, "
+              f"{versions_count} consistent versions")
+    print(f"total: {total_reads / cmd_args.duration:,.0f} reads/s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Shared control actions snapshot benchmark')
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--points', type=int, default=10000)
+    parser.add_argument('--duration', type=float, default=5, help='seconds')
+    parser.add_argument('--publish-interval', type=float, default=0.001, help='seconds')
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,170 @@
+"""
+Время холодного старта: импорт контейнеров приложения и время до первого обслуженного запроса.
+
+Импорт замеряется в отдельном процессе с -X importtime, время до первого запроса -
+от запуска main.py до первого HTTP ответа с кодом, отличным от 503
+(503 сервер отдаёт, пока запуск не завершён; любой другой код означает, что запрос обслужен).
+Для защиты от регрессий проверяется, что импорт контейнеров не импортирует тяжёлые модули,
+и результаты сравниваются с сохранённым базовым замером: если замер хуже базового
+больше чем на tolerance, скрипт завершается с кодом 1.
+
+Запуск из каталога app:
+    python -m benchmarks.bench_startup --save-baseline ../storage/startup_baseline.json
+    python -m benchmarks.bench_startup --baseline ../storage/startup_baseline.json \
+        --config ../storage/config/config.yaml --url http://127.0.0.1:8000/api/v2/getPredictedBoilerT
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONTAINERS_MODULE = "backend.containers.application"
+SERVICE_UNAVAILABLE = 503
+# Модули, которые не должны импортироваться до разрешения провайдеров.
+# fastapi, starlette и pydantic сюда не входят: dependency_injector.containers импортирует
+# dependency_injector.wiring, а тот - fastapi.params, так что они загружаются вместе с любым контейнером.
+DEFERRED_MODULES = (
+    "pandas",
+    "boiler",
+    "boiler_softm",
+    "sqlalchemy",
+    "uvicorn",
+    "aiosqlite",
+    "dynamic_settings",
+    "updater"
+)
+
+
+def measure_import(module_name: str) -> Tuple[float, List[Tuple[str, float]], List[str]]:
+    code = (
+        f"import sys, time\n"
+        f"started_at = time.perf_counter()\n"
+        f"import {module_name}\n"
+        f"print(time.perf_counter() - started_at)\n"
+        f"print(','.join(sorted({{name.split('.')[0] for name in sys.modules}})))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    stdout_lines = completed.stdout.splitlines()
+    import_time = float(stdout_lines[0])
+    imported_packages = set(stdout_lines[1].split(","))
+
+    # Строки -X importtime: "import time: self [us] | cumulative | imported package"
+    top_level_imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            top_level_imports.append((name.strip(), int(cumulative_us) / 1e6))
+    top_level_imports.sort(key=lambda item: item[1], reverse=True)
+
+    deferred_imported = [module for module in DEFERRED_MODULES if module in imported_packages]
+    return import_time, top_level_imports, deferred_imported
+
+
+def measure_first_request(config_path: str, url: str, timeout: float) -> float:
+    started_at = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "main.py", "--config", config_path],
+        cwd=APP_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started_at < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"main.py exited with code {process.returncode} before serving a request")
+            try:
+                with urllib.request.urlopen(url, timeout=1):
+                    pass
+                return time.perf_counter() - started_at
+            except urllib.error.HTTPError as e:
+                # 503 - сервер уже принимает соединения, но запуск ещё не завершён
+                if e.code != SERVICE_UNAVAILABLE:
+                    return time.perf_counter() - started_at
+                time.sleep(0.01)
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.01)
+        raise TimeoutError(f"No response from {url} in {timeout} seconds")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def compare_with_baseline(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    regressions = []
+    for metric, value in results.items():
+        baseline_value = baseline.get(metric)
+        if baseline_value is not None and value > baseline_value * (1 + tolerance):
+            regressions.append(f"{metric}: {value:.3f} s > baseline {baseline_value:.3f} s (+{tolerance:.0%})")
+    return regressions
+
+
+def main(cmd_args) -> int:
+    import_times = []
+    top_level_imports = []
+    deferred_imported = []
+    for _ in range(cmd_args.repeats):
+        import_time, top_level_imports, deferred_imported = measure_import(CONTAINERS_MODULE)
+        import_times.append(import_time)
+    results = {"containers_import": float(np.median(import_times))}
+
+    print(f"import {CONTAINERS_MODULE}: median {results['containers_import'] * 1e3:.1f} ms "
+          f"of {cmd_args.repeats} runs")
+    for name, cumulative_time in top_level_imports[:cmd_args.top]:
+        print(f"    {name:<60} {cumulative_time * 1e3:>8.1f} ms")
+
+    if cmd_args.config is not None:
+        first_request_times = [
+            measure_first_request(cmd_args.config, cmd_args.url, cmd_args.timeout)
+            for _ in range(cmd_args.repeats)
+        ]
+        results["first_request"] = float(np.median(first_request_times))
+        print(f"time to first request: median {results['first_request']:.3f} s of {cmd_args.repeats} runs")
+
+    failures = []
+    if deferred_imported:
+        failures.append(f"{CONTAINERS_MODULE} imports deferred modules: {', '.join(deferred_imported)}")
+    if cmd_args.baseline is not None:
+        with open(cmd_args.baseline) as f:
+            failures.extend(compare_with_baseline(results, json.load(f), cmd_args.tolerance))
+    if cmd_args.save_baseline is not None:
+        with open(cmd_args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline is saved to {cmd_args.save_baseline}")
+
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+def parse_args(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Cold start benchmark with regression guard')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='slowest top level imports to print')
+    parser.add_argument('--config', default=None, help='config for main.py; time to first request is measured if set')
+    parser.add_argument('--url', default="http://127.0.0.1:8000/api/v2/getPredictedBoilerT")
+    parser.add_argument('--timeout', type=float, default=60, help='seconds to wait for the first response')
+    parser.add_argument('--baseline', default=None, help='baseline json to compare with')
+    parser.add_argument('--save-baseline', default=None, help='path to save results as a new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown relative to baseline')
+    return parser.parse_args(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main(parse_args()))
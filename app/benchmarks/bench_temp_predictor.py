@@ -0,0 +1,82 @@
+"""
+Сравнение CorrTableTempPredictor из boiler и IndexedCorrTableTempPredictor
+для разных размеров таблицы корреляции и длины горизонта прогноза.
+
+Запуск из каталога app:
+    python -m benchmarks.bench_temp_predictor --table-sizes 101 701 7001 --horizons 480 2880 14400
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from boiler.constants import column_names
+from boiler.temp_predictors.corr_table_temp_predictor import CorrTableTempPredictor
+from backend.calculators.corr_table_search_index import CorrTableSearchIndex
+from backend.calculators.indexed_corr_table_temp_predictor import IndexedCorrTableTempPredictor
+from benchmarks.synthetic_data import generate_home_time_deltas, generate_temp_correlation_table, \
+    generate_temp_requirements
+
+
+def main(cmd_args):
+    home_time_deltas = generate_home_time_deltas(cmd_args.homes)
+
+    print(f"{'table size':>10} {'horizon':>8} {'index build, ms':>16} "
+          f"{'reference, ms':>14} {'indexed, ms':>12} {'speedup':>8}")
+    for table_size in cmd_args.table_sizes:
+        temp_correlation_table = generate_temp_correlation_table(table_size, cmd_args.homes)
+        index_build_time = min(timeit.repeat(
+            lambda: CorrTableSearchIndex(temp_correlation_table, home_time_deltas),
+            number=1, repeat=cmd_args.repeats
+        ))
+        indexed_predictor = IndexedCorrTableTempPredictor(
+            CorrTableSearchIndex(temp_correlation_table, home_time_deltas),
+            cmd_args.coefficient
+        )
+        reference_predictor = CorrTableTempPredictor(
+            temp_correlation_table=temp_correlation_table,
+            home_time_deltas=home_time_deltas,
+            home_min_temp_coefficient=cmd_args.coefficient
+        )
+
+        for horizon in cmd_args.horizons:
+            temp_requirements_arr = generate_temp_requirements(horizon)[
+                column_names.FORWARD_PIPE_COOLANT_TEMP
+            ].to_numpy()
+
+            indexed_time = min(timeit.repeat(
+                lambda: indexed_predictor.predict_on_temp_requirements(temp_requirements_arr),
+                number=1, repeat=cmd_args.repeats
+            ))
+
+            reference_time = float("nan")
+            if not cmd_args.skip_reference:
+                np.testing.assert_allclose(
+                    np.asarray(reference_predictor.predict_on_temp_requirements(temp_requirements_arr)),
+                    indexed_predictor.predict_on_temp_requirements(temp_requirements_arr)
+                )
+                reference_time = min(timeit.repeat(
+                    lambda: reference_predictor.predict_on_temp_requirements(temp_requirements_arr),
+                    number=1, repeat=1
+                ))
+
+            print(f"{table_size:>10} {horizon:>8} {index_build_time * 1e3:>16.2f} "
+                  f"{reference_time * 1e3:>14.2f} {indexed_time * 1e3:>12.2f} "
+                  f"{reference_time / indexed_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Temp predictor benchmark')
+    parser.add_argument('--table-sizes', type=int, nargs='+', default=[101, 701, 7001],
+                        help='boiler temps count in correlation table')
+    parser.add_argument('--horizons', type=int, nargs='+', default=[480, 2880, 14400],
+                        help='temp requirements count')
+    parser.add_argument('--homes', type=int, default=20, help='homes count')
+    parser.add_argument('--coefficient', type=float, default=0.98, help='home min temp coefficient')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--skip-reference', action='store_true',
+                        help='do not run CorrTableTempPredictor from boiler')
+    args = parser.parse_args()
+
+    main(args)
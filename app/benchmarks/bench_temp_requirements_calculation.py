@@ -0,0 +1,84 @@
+"""
+Сравнение построчного и векторизованного расчёта требований к температуре теплоносителя.
+
+Запуск из каталога app:
+    python -m benchmarks.bench_temp_requirements_calculation --sizes 1000 10000 100000
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from boiler.constants import column_names
+from boiler.temp_requirements.calculators.temp_graph_requirements_calculator \
+    import TempGraphRequirementsCalculator
+from backend.calculators.vectorized_temp_graph_requirements_calculator \
+    import VectorizedTempGraphRequirementsCalculator
+from backend.services.temp_requirements_update_service.simple_temp_requirements_service \
+    import SimpleTempRequirementsService
+from benchmarks.synthetic_data import generate_temp_graph, generate_weather_forecast
+
+
+def calc_temp_requirements_per_row(weather_df, temp_graph):
+    calculator = TempGraphRequirementsCalculator()
+    calculator.set_temp_graph(temp_graph)
+
+    weather_temp_arr = weather_df[column_names.WEATHER_TEMP].to_numpy()
+    temp_requirements_datetime_list = weather_df[column_names.TIMESTAMP].to_list()
+    temp_requirements = []
+    for weather_temp, datetime_ in zip(weather_temp_arr, temp_requirements_datetime_list):
+        required_temp = calculator.get_temp_requirements_for_weather_temp(weather_temp)
+        temp_requirements.append({
+            column_names.TIMESTAMP: datetime_,
+            column_names.FORWARD_PIPE_COOLANT_TEMP: required_temp[column_names.FORWARD_PIPE_COOLANT_TEMP],
+            column_names.BACKWARD_PIPE_COOLANT_TEMP: required_temp[column_names.BACKWARD_PIPE_COOLANT_TEMP]
+        })
+    return pd.DataFrame(temp_requirements)
+
+
+def check_correctness(per_row_df, batch_df):
+    assert len(per_row_df) == len(batch_df)
+    assert (per_row_df[column_names.TIMESTAMP] == batch_df[column_names.TIMESTAMP]).all()
+    for column in (column_names.FORWARD_PIPE_COOLANT_TEMP, column_names.BACKWARD_PIPE_COOLANT_TEMP):
+        np.testing.assert_allclose(
+            per_row_df[column].to_numpy(dtype=np.float64),
+            batch_df[column].to_numpy(dtype=np.float64)
+        )
+
+
+def main(cmd_args):
+    temp_graph = generate_temp_graph()
+    batch_service = SimpleTempRequirementsService(
+        temp_graph_requirements_calculator=VectorizedTempGraphRequirementsCalculator()
+    )
+
+    print(f"{'points':>10} {'per row, s':>12} {'batch, s':>12} {'speedup':>10}")
+    for points_count in cmd_args.sizes:
+        weather_df = generate_weather_forecast(points_count)
+
+        per_row_df = calc_temp_requirements_per_row(weather_df, temp_graph)
+        batch_df = batch_service._calc_temp_requirements(weather_df, temp_graph)
+        check_correctness(per_row_df, batch_df)
+
+        per_row_repeats = 1 if points_count > 10_000 else cmd_args.repeats
+        per_row_time = min(timeit.repeat(
+            lambda: calc_temp_requirements_per_row(weather_df, temp_graph),
+            number=1, repeat=per_row_repeats
+        ))
+        batch_time = min(timeit.repeat(
+            lambda: batch_service._calc_temp_requirements(weather_df, temp_graph),
+            number=1, repeat=cmd_args.repeats
+        ))
+        print(f"{points_count:>10} {per_row_time:>12.4f} {batch_time:>12.4f} {per_row_time / batch_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Temp requirements calculation benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='weather forecast lengths')
+    parser.add_argument('--repeats', type=int, default=5, help='repeats for each measurement')
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,116 @@
+"""
+Пропускная способность хранилищ требований к температуре теплоносителя:
+обновление прогноза, удаление устаревших данных и чтение диапазонов.
+
+Запуск из каталога app:
+    python -m benchmarks.bench_temp_requirements_repository --cycles 200 --horizon 14400
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from boiler.constants import column_names, time_tick
+from boiler.temp_requirements.repository.db.async_.temp_requirements_db_async_fake_repository \
+    import TempRequirementsDBAsyncFakeRepository
+from backend.repositories.temp_requirements_sqlite_repository import TempRequirementsSQLiteRepository
+from benchmarks.synthetic_data import generate_temp_requirements
+
+
+async def simulate_uptime(repository, cycles: int, horizon: int, reads_per_cycle: int, seed: int):
+    start_datetime = pd.Timestamp("2021-01-01", tz="UTC")
+
+    write_time = 0.0
+    read_time = 0.0
+    for cycle in range(cycles):
+        datetime_now = start_datetime + cycle * time_tick.TIME_TICK
+        temp_requirements_df = generate_temp_requirements(horizon, datetime_now, seed + cycle)
+
+        started_at = time.perf_counter()
+        await repository.update_temp_requirements(temp_requirements_df)
+        await repository.delete_temp_requirements_older_than(datetime_now)
+        write_time += time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        for _ in range(reads_per_cycle):
+            await repository.get_temp_requirements(datetime_now, datetime_now + horizon * time_tick.TIME_TICK)
+        read_time += time.perf_counter() - started_at
+
+    return write_time, read_time
+
+
+def expected_temp_requirements(cycles: int, horizon: int, seed: int) -> pd.DataFrame:
+    start_datetime = pd.Timestamp("2021-01-01", tz="UTC")
+    expected_df = pd.concat([
+        generate_temp_requirements(horizon, start_datetime + cycle * time_tick.TIME_TICK, seed + cycle)
+        for cycle in range(cycles)
+    ])
+    expected_df = expected_df.drop_duplicates(column_names.TIMESTAMP, keep="last")
+    last_update_datetime = start_datetime + (cycles - 1) * time_tick.TIME_TICK
+    expected_df = expected_df[expected_df[column_names.TIMESTAMP] >= last_update_datetime]
+    return expected_df.sort_values(column_names.TIMESTAMP, ignore_index=True)
+
+
+async def check_correctness(horizon: int, seed: int, db_path: str):
+    cycles = 5
+    repository = TempRequirementsSQLiteRepository(db_path)
+    await simulate_uptime(repository, cycles=cycles, horizon=horizon, reads_per_cycle=0, seed=seed)
+    actual_df = await repository.get_temp_requirements()
+    await repository.close()
+
+    expected_df = expected_temp_requirements(cycles, horizon, seed)
+    assert len(expected_df) == len(actual_df)
+    np.testing.assert_array_equal(
+        pd.DatetimeIndex(expected_df[column_names.TIMESTAMP]).asi8,
+        pd.DatetimeIndex(actual_df[column_names.TIMESTAMP]).asi8
+    )
+    for column in (column_names.FORWARD_PIPE_COOLANT_TEMP, column_names.BACKWARD_PIPE_COOLANT_TEMP):
+        np.testing.assert_array_equal(
+            expected_df[column].to_numpy(dtype=np.float64),
+            actual_df[column].to_numpy(dtype=np.float64)
+        )
+
+
+async def main(cmd_args):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        await check_correctness(cmd_args.horizon, cmd_args.seed, os.path.join(tmp_dir, "check.sqlite"))
+
+        repositories = (
+            ("fake", TempRequirementsDBAsyncFakeRepository()),
+            ("sqlite memory", TempRequirementsSQLiteRepository()),
+            ("sqlite file", TempRequirementsSQLiteRepository(os.path.join(tmp_dir, "bench.sqlite")))
+        )
+
+        print(f"{'repository':>14} {'writes, rows/s':>15} {'writes, ms/cycle':>17} {'reads, ms/request':>18}")
+        for repository_name, repository in repositories:
+            write_time, read_time = await simulate_uptime(
+                repository,
+                cmd_args.cycles,
+                cmd_args.horizon,
+                cmd_args.reads_per_cycle,
+                cmd_args.seed
+            )
+            if isinstance(repository, TempRequirementsSQLiteRepository):
+                await repository.close()
+
+            rows_per_second = cmd_args.cycles * cmd_args.horizon / write_time
+            write_ms_per_cycle = write_time / cmd_args.cycles * 1e3
+            read_ms_per_request = read_time / max(cmd_args.cycles * cmd_args.reads_per_cycle, 1) * 1e3
+            print(f"{repository_name:>14} {rows_per_second:>15.0f} "
+                  f"{write_ms_per_cycle:>17.2f} {read_ms_per_request:>18.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Temp requirements repository benchmark')
+    parser.add_argument('--cycles', type=int, default=200, help='update cycles to simulate')
+    parser.add_argument('--horizon', type=int, default=14400, help='temp requirements in each update')
+    parser.add_argument('--reads-per-cycle', type=int, default=5, help='range requests between updates')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
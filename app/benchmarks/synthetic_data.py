@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+from dateutil.tz import tzlocal
+
+from boiler.constants import column_names, time_tick
+from backend.calculators.corr_table_search_index import BOILER_TEMP_COLUMN, HOME_NAME_COLUMN, HOME_TIME_DELTA_COLUMN
+
+
+def generate_temp_graph(min_weather_temp: float = -40,
+                        max_weather_temp: float = 10,
+                        step: float = 1) -> pd.DataFrame:
+    weather_temp_arr = np.arange(min_weather_temp, max_weather_temp + step, step, dtype=np.float64)
+    forward_temp_arr = np.interp(weather_temp_arr, (min_weather_temp, max_weather_temp), (95, 40)).round(1)
+    backward_temp_arr = np.interp(weather_temp_arr, (min_weather_temp, max_weather_temp), (70, 33)).round(1)
+    return pd.DataFrame({
+        column_names.WEATHER_TEMP: weather_temp_arr,
+        column_names.FORWARD_PIPE_COOLANT_TEMP: forward_temp_arr,
+        column_names.BACKWARD_PIPE_COOLANT_TEMP: backward_temp_arr
+    })
+
+
+def generate_weather_forecast(points_count: int,
+                              start_datetime: pd.Timestamp = None,
+                              seed: int = 0,
+                              freq: pd.Timedelta = time_tick.TIME_TICK) -> pd.DataFrame:
+    if start_datetime is None:
+        start_datetime = pd.Timestamp.now(tz=tzlocal()).floor(time_tick.TIME_TICK)
+    random_state = np.random.RandomState(seed)
+    day_phase_arr = np.arange(points_count) * (freq / pd.Timedelta(days=1)) * 2 * np.pi
+    weather_temp_arr = -10 + 8 * np.sin(day_phase_arr) + random_state.normal(0, 1.5, points_count)
+    return pd.DataFrame({
+        column_names.TIMESTAMP: pd.date_range(start_datetime, periods=points_count, freq=freq),
+        column_names.WEATHER_TEMP: weather_temp_arr.round(1)
+    })
+
+
+def generate_temp_correlation_table(boiler_temps_count: int = 701,
+                                    homes_count: int = 20,
+                                    min_boiler_temp: float = 30,
+                                    max_boiler_temp: float = 100,
+                                    seed: int = 0) -> pd.DataFrame:
+    random_state = np.random.RandomState(seed)
+    boiler_temp_arr = np.linspace(min_boiler_temp, max_boiler_temp, boiler_temps_count)
+    temp_correlation_table = {BOILER_TEMP_COLUMN: boiler_temp_arr}
+    for home_idx in range(homes_count):
+        heat_loss_coefficient = random_state.uniform(0.75, 0.95)
+        temp_correlation_table[f"home_{home_idx}"] = (boiler_temp_arr * heat_loss_coefficient).round(2)
+    return pd.DataFrame(temp_correlation_table)
+
+
+def generate_home_time_deltas(homes_count: int = 20,
+                              max_time_delta: pd.Timedelta = pd.Timedelta(hours=2),
+                              seed: int = 0) -> pd.DataFrame:
+    random_state = np.random.RandomState(seed)
+    max_time_delta_in_ticks = int(max_time_delta / time_tick.TIME_TICK)
+    time_deltas_in_ticks = random_state.randint(0, max_time_delta_in_ticks + 1, homes_count)
+    return pd.DataFrame({
+        HOME_NAME_COLUMN: [f"home_{home_idx}" for home_idx in range(homes_count)],
+        HOME_TIME_DELTA_COLUMN: time_deltas_in_ticks * time_tick.TIME_TICK.total_seconds()
+    })
+
+
+def generate_temp_requirements(points_count: int,
+                               start_datetime: pd.Timestamp = None,
+                               seed: int = 0) -> pd.DataFrame:
+    weather_df = generate_weather_forecast(points_count, start_datetime, seed)
+    temp_graph = generate_temp_graph()
+    forward_temp_arr = np.interp(
+        weather_df[column_names.WEATHER_TEMP].to_numpy(),
+        temp_graph[column_names.WEATHER_TEMP].to_numpy(),
+        temp_graph[column_names.FORWARD_PIPE_COOLANT_TEMP].to_numpy()
+    )
+    backward_temp_arr = np.interp(
+        weather_df[column_names.WEATHER_TEMP].to_numpy(),
+        temp_graph[column_names.WEATHER_TEMP].to_numpy(),
+        temp_graph[column_names.BACKWARD_PIPE_COOLANT_TEMP].to_numpy()
+    )
+    return pd.DataFrame({
+        column_names.TIMESTAMP: weather_df[column_names.TIMESTAMP],
+        column_names.FORWARD_PIPE_COOLANT_TEMP: forward_temp_arr,
+        column_names.BACKWARD_PIPE_COOLANT_TEMP: backward_temp_arr
+    })
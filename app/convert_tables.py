@@ -0,0 +1,62 @@
+"""
+Конвертация таблицы корреляции (pickle) и таблицы времён запаздывания домов (csv)
+в формат с загрузкой через memory mapping (см. backend.utils.mmap_table_format).
+
+Пример:
+    python convert_tables.py \
+        --temp-correlation-table ../storage/temp_correlation_table.pickle ../storage/temp_correlation_table \
+        --homes-deltas ../storage/homes_deltas.csv ../storage/homes_deltas
+
+После конвертации в конфиге указываются пути к каталогам вместо исходных файлов.
+"""
+
+import argparse
+import logging
+
+import pandas as pd
+
+from backend.calculators.corr_table_search_index import BOILER_TEMP_COLUMN, HOME_TIME_DELTA_COLUMN
+from backend.utils.mmap_table_format import load_mmap_table, save_mmap_table
+
+
+def convert_temp_correlation_table(src_path: str, dst_path: str) -> None:
+    logging.info(f"Converting temp correlation table {src_path} -> {dst_path}")
+    temp_correlation_table = pd.read_pickle(src_path)
+    # Отсортированная таблица используется поисковым индексом без копирования колонок.
+    if BOILER_TEMP_COLUMN in temp_correlation_table.columns:
+        temp_correlation_table = temp_correlation_table.sort_values(BOILER_TEMP_COLUMN, kind="mergesort")
+    temp_correlation_table = temp_correlation_table.reset_index(drop=True)
+    _save_and_check(temp_correlation_table, dst_path)
+
+
+def convert_homes_deltas(src_path: str, dst_path: str) -> None:
+    logging.info(f"Converting home time deltas {src_path} -> {dst_path}")
+    homes_time_deltas = pd.read_csv(src_path)
+    time_deltas = homes_time_deltas[HOME_TIME_DELTA_COLUMN]
+    if not pd.api.types.is_numeric_dtype(time_deltas):
+        homes_time_deltas[HOME_TIME_DELTA_COLUMN] = pd.to_timedelta(time_deltas).dt.total_seconds()
+    _save_and_check(homes_time_deltas, dst_path)
+
+
+def _save_and_check(df: pd.DataFrame, dst_path: str) -> None:
+    df.columns = [str(column) for column in df.columns]
+    save_mmap_table(df, dst_path)
+    pd.testing.assert_frame_equal(load_mmap_table(dst_path), df, check_dtype=False)
+    logging.info(f"{len(df)} rows with {len(df.columns)} columns are saved to {dst_path}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert tables to memory-mapped format')
+    parser.add_argument('--temp-correlation-table', nargs=2, metavar=('SRC_PICKLE', 'DST_DIR'),
+                        help='temp correlation table pickle and output directory')
+    parser.add_argument('--homes-deltas', nargs=2, metavar=('SRC_CSV', 'DST_DIR'),
+                        help='home time deltas csv and output directory')
+    args = parser.parse_args()
+    if args.temp_correlation_table is None and args.homes_deltas is None:
+        parser.error("nothing to convert")
+
+    logging.basicConfig(level=logging.INFO)
+    if args.temp_correlation_table is not None:
+        convert_temp_correlation_table(*args.temp_correlation_table)
+    if args.homes_deltas is not None:
+        convert_homes_deltas(*args.homes_deltas)
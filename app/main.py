@@ -1,30 +1,122 @@
 import argparse
 import asyncio
 import logging
-
-import uvicorn
-from dynamic_settings.service.settings_service import SettingsService
-from updater.updater_service.updater_service import UpdaterService
+import multiprocessing
+import signal
 
 from backend.containers.application import Application
-from backend.web import api_v1, api_v2
+from backend.services.health_service.health_service import HealthService
+
+# uvicorn, dynamic_settings, updater, модули API и сервисы импортируются в функциях, которые их используют,
+# чтобы импорт main.py не загружал то, что контейнеры загружают лениво
+
+WORKERS_CHECK_INTERVAL = 1
 
 
 def wire(application_container):
-    application_container.core.wire(modules=(api_v1, api_v2))
-    application_container.services.wire(modules=(api_v1, api_v2))
+    from backend.web import api_health, api_stations, api_v1, api_v2
+
+    application_container.core.wire(modules=(api_v1, api_v2, api_stations, api_health))
+    application_container.services.wire(modules=(api_v1, api_v2, api_stations, api_health))
+
+
+async def init_control_action_resources(control_action_pkg, health_service: HealthService):
+    # Таблицы читаются из файлов параллельно вне цикла событий, индекс строится после загрузки обеих
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(
+        health_service.track_init(
+            "temp_correlation_table",
+            loop.run_in_executor(None, control_action_pkg.temp_correlation_table)
+        ),
+        health_service.track_init(
+            "homes_time_deltas",
+            loop.run_in_executor(None, control_action_pkg.homes_time_deltas)
+        )
+    )
+    await health_service.track_init(
+        "temp_correlation_index",
+        loop.run_in_executor(None, control_action_pkg.temp_correlation_index)
+    )
+
+
+async def init_resources(application_container, health_service: HealthService):
+    from backend.stations.stations_registry import StationsRegistry
+
+    init_coroutines = [
+        health_service.track_init("dynamic_settings", initialize_dynamic_settings(application_container))
+    ]
+    # В режиме нескольких станций таблицы загружаются реестром станций
+    if is_stations_mode(application_container):
+        stations_registry: StationsRegistry = application_container.services.stations_registry()
+        init_coroutines.append(health_service.track_init("stations_tables", stations_registry.init_resources()))
+    else:
+        init_coroutines.append(
+            init_control_action_resources(application_container.services.control_action_pkg, health_service)
+        )
+    await asyncio.gather(*init_coroutines)
+
+
+def register_readiness_checks(application_container, health_service: HealthService):
+    from backend.stations.stations_registry import StationsRegistry
+
+    if is_stations_mode(application_container):
+        stations_registry: StationsRegistry = application_container.services.stations_registry()
+        health_service.add_readiness_check("control_actions", stations_registry.has_control_actions)
+    else:
+        control_actions_repository = application_container.services.control_action_pkg.control_actions_repository()
+        health_service.add_readiness_check(
+            "control_actions",
+            lambda: len(control_actions_repository.get_snapshot()) > 0
+        )
+
+
+def is_stations_mode(application_container) -> bool:
+    return bool(application_container.config.services.stations())
+
+
+async def initialize_dynamic_settings(application_container):
+    from backend.services.dynamic_settings_service.cached_settings_service import CachedSettingsService
+
+    dynamic_settings_service: CachedSettingsService = \
+        await application_container.services.dynamic_settings_pkg.settings_service()
+    await dynamic_settings_service.initialize_service()
+    # Изменения настроек, сделанные не через этот процесс, подхватываются периодической проверкой
+    dynamic_settings_service.start_periodic_refresh()
+
 
+async def stop_dynamic_settings(application_container):
+    from backend.services.dynamic_settings_service.cached_settings_service import CachedSettingsService
 
-def init_resources(application_container):
-    application_container.core.init_resources()
-    application_container.services.control_action_pkg.init_resources()
+    dynamic_settings_service: CachedSettingsService = \
+        await application_container.services.dynamic_settings_pkg.settings_service()
+    await dynamic_settings_service.stop_async()
+
+
+def stop_executor(application_container):
+    # Пул процессов не завершается сам при выходе из цикла событий
+    application_container.services.executor.shutdown()
+
+
+async def restore_pipeline_state(application_container):
+    from backend.services.warm_start_service.warm_start_service import WarmStartService
+
+    # Вызывается до запуска сервиса обновления, чтобы обновление шло уже поверх восстановленного состояния
+    warm_start_service: WarmStartService = application_container.services.warm_start_service()
+    await warm_start_service.restore_async()
+    warm_start_service.start_periodic_save()
+    return warm_start_service
 
 
 async def main(cmd_args):
+    import uvicorn
+    from updater.updater_service.updater_service import UpdaterService
+
+    from backend.stations.stations_registry import StationsRegistry
+
     application = Application()
     application.config.from_yaml(cmd_args.config)
 
-    init_resources(application)
+    application.core.init_resources()
 
     # Must be placed after core.init_resources()
     logger = logging.getLogger(__name__)
@@ -32,25 +124,187 @@ async def main(cmd_args):
     logger.debug("Wiring")
     wire(application)
 
-    logger.debug(f"Initialization of dynamic config")
-    dynamic_settings_service: SettingsService = \
+    logger.debug("Compiling request datetime patterns")
+    application.core.datetime_parser()
+
+    health_service: HealthService = application.services.health_service()
+    register_readiness_checks(application, health_service)
+
+    # Сервер принимает соединения сразу, до окончания запуска отвечает 503 на всё, кроме проб
+    server: uvicorn.Server = application.wsgi.server()
+    logger.debug(f"Starting server at {server.config.host}:{server.config.port}")
+    server_task = asyncio.ensure_future(server.serve(sockets=None))
+
+    warm_start_service = None
+    try:
+        logger.debug("Initialization of resources and dynamic config")
+        await init_resources(application, health_service)
+
+        if is_stations_mode(application):
+            logger.debug(f"Starting updater services of stations")
+            stations_registry: StationsRegistry = application.services.stations_registry()
+            await stations_registry.start_service()
+        else:
+            warm_start_service = await restore_pipeline_state(application)
+            logger.debug(f"Starting updater service")
+            updater_service: UpdaterService = application.services.updater_pkg.updater_service()
+            await updater_service.start_service()
+    except Exception:
+        server.should_exit = True
+        await server_task
+        raise
+
+    health_service.mark_started()
+    try:
+        await server_task
+    finally:
+        await stop_dynamic_settings(application)
+        if warm_start_service is not None:
+            logger.debug("Saving pipeline state")
+            await warm_start_service.stop_async()
+        stop_executor(application)
+
+
+async def main_updater(cmd_args):
+    """
+    Процесс обновления в режиме с несколькими процессами API.
+    Рассчитывает управляющие воздействия, публикует их в разделяемый файл
+    и перезапускает завершившиеся процессы API.
+    """
+    import uvicorn
+    from updater.updater_service.updater_service import UpdaterService
+
+    from backend.services.dynamic_settings_service.cached_settings_service import CachedSettingsService
+
+    application = Application()
+    application.config.from_yaml(cmd_args.config)
+    if is_stations_mode(application):
+        raise ValueError("Multiple API workers are not supported together with services.stations")
+
+    application.core.init_resources()
+
+    # Must be placed after core.init_resources()
+    logger = logging.getLogger(__name__)
+
+    control_action_pkg = application.services.control_action_pkg
+    control_action_pkg.control_actions_snapshot_publisher.override(control_action_pkg.shared_snapshot_writer)
+    logger.debug("Creating shared control actions snapshot")
+    shared_snapshot_writer = control_action_pkg.shared_snapshot_writer()
+    # Версия настроек публикуется в разделяемый файл, процессы API по ней сбрасывают свои кэши настроек
+    dynamic_settings_service: CachedSettingsService = \
         await application.services.dynamic_settings_pkg.settings_service()
-    await dynamic_settings_service.initialize_service()
+    dynamic_settings_service.add_version_listener(shared_snapshot_writer.publish_settings_version)
 
+    logger.debug("Initialization of resources and dynamic config")
+    await init_resources(application, application.services.health_service())
+
+    warm_start_service = await restore_pipeline_state(application)
     logger.debug(f"Starting updater service")
     updater_service: UpdaterService = application.services.updater_pkg.updater_service()
     await updater_service.start_service()
 
+    server_config: uvicorn.Config = application.wsgi.server_config()
+    logger.debug(f"Binding socket at {server_config.host}:{server_config.port}")
+    sockets = [server_config.bind_socket()]
+
+    # По SIGTERM/SIGINT цикл наблюдения завершается, процессы API останавливаются, состояние сохраняется
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for stop_signal in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(stop_signal, stop_event.set)
+
+    spawn_context = multiprocessing.get_context("spawn")
+    workers = [None] * cmd_args.workers
+    try:
+        while not stop_event.is_set():
+            for worker_idx, worker in enumerate(workers):
+                if worker is None or not worker.is_alive():
+                    if worker is not None:
+                        logger.warning(f"API worker {worker.pid} exited with code {worker.exitcode}, restarting")
+                    worker = spawn_context.Process(target=run_api_worker, args=(cmd_args, sockets))
+                    worker.start()
+                    logger.debug(f"API worker {worker.pid} is started")
+                    workers[worker_idx] = worker
+            try:
+                await asyncio.wait_for(stop_event.wait(), WORKERS_CHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+        logger.debug("Stop signal is received, stopping API workers")
+    finally:
+        for stop_signal in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(stop_signal)
+        # Состояние сохраняется до остановки процессов API, чтобы не потерять его,
+        # если процесс будет убит до окончания их остановки
+        logger.debug("Saving pipeline state")
+        await warm_start_service.stop_async()
+        await stop_dynamic_settings(application)
+        for worker in workers:
+            if worker is not None:
+                worker.terminate()
+        for worker in workers:
+            if worker is not None:
+                worker.join()
+        stop_executor(application)
+
+
+async def main_api_worker(cmd_args, sockets):
+    """
+    Процесс API в режиме с несколькими процессами API.
+    Не рассчитывает управляющие воздействия, а читает срез, опубликованный процессом обновления.
+    """
+    import uvicorn
+
+    from backend.services.dynamic_settings_service.cached_settings_service import CachedSettingsService
+
+    application = Application()
+    application.config.from_yaml(cmd_args.config)
+
+    application.core.init_resources()
+
+    # Must be placed after core.init_resources()
+    logger = logging.getLogger(__name__)
+
+    control_action_pkg = application.services.control_action_pkg
+    control_action_pkg.control_actions_repository.override(control_action_pkg.shared_control_actions_repository)
+
+    logger.debug("Wiring")
+    wire(application)
+
+    logger.debug("Compiling request datetime patterns")
+    application.core.datetime_parser()
+
+    # Версия настроек читается из разделяемого файла вместо БД
+    dynamic_settings_service: CachedSettingsService = \
+        await application.services.dynamic_settings_pkg.settings_service()
+    dynamic_settings_service.set_version_getter(control_action_pkg.shared_snapshot_reader().get_settings_version)
+
+    logger.debug(f"Initialization of dynamic config")
+    health_service: HealthService = application.services.health_service()
+    await health_service.track_init("dynamic_settings", initialize_dynamic_settings(application))
+    register_readiness_checks(application, health_service)
+    health_service.mark_started()
+
     server: uvicorn.Server = application.wsgi.server()
-    logger.debug(f"Starting server at {server.config.host}:{server.config.port}")
-    await server.serve(sockets=None)
+    logger.debug(f"Starting API worker at {server.config.host}:{server.config.port}")
+    await server.serve(sockets=sockets)
+
+
+def run_api_worker(cmd_args, sockets):
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(main_api_worker(cmd_args, sockets))
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Control boiler')
     parser.add_argument('--config', default="../storage/config/config.yaml", help='path to config file')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='API worker processes count; '
+                             'if greater than 1, control actions are calculated in a separate updater process')
     args = parser.parse_args()
 
     loop = asyncio.get_event_loop()
     loop.set_debug(True)
-    loop.run_until_complete(main(args))
+    if args.workers > 1:
+        loop.run_until_complete(main_updater(args))
+    else:
+        loop.run_until_complete(main(args))
@@ -0,0 +1,132 @@
+"""
+Запрос /api/v2/getPredictedBoilerTBatch через приложение с подключёнными (wired) контейнерами.
+
+Запуск из каталога app:
+    python -m unittest discover tests
+"""
+
+import asyncio
+import json
+import unittest
+
+import pandas as pd
+from fastapi import FastAPI
+
+from boiler.constants import column_names, time_tick
+from backend.containers.application import Application
+from backend.web import api_v2
+
+TIMEZONE_NAME = "Asia/Yekaterinburg"
+CONTROL_ACTIONS_COUNT = 10
+
+
+async def post_json(app, path: str, body) -> tuple:
+    request_body = json.dumps(body).encode("utf-8")
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(request_body)).encode("utf-8"))
+        ],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80)
+    }
+    messages = [{"type": "http.request", "body": request_body, "more_body": False}]
+    response = {"status": None, "body": b""}
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return response["status"], response["body"]
+
+
+class TestPredictedBoilerTBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.application = Application()
+        self.application.config.from_dict({
+            "core": {
+                "datetime_processing": {
+                    "default_timezone": TIMEZONE_NAME
+                }
+            }
+        })
+        self.application.core.wire(modules=(api_v2,))
+        self.application.services.wire(modules=(api_v2,))
+
+        self.loop = asyncio.new_event_loop()
+        control_actions_repository = self.application.services.control_action_pkg.control_actions_repository()
+        self.start_datetime = pd.Timestamp.now(tz=TIMEZONE_NAME).floor(time_tick.TIME_TICK)
+        control_actions_df = pd.DataFrame({
+            column_names.TIMESTAMP: pd.date_range(
+                self.start_datetime,
+                periods=CONTROL_ACTIONS_COUNT,
+                freq=time_tick.TIME_TICK
+            ),
+            column_names.FORWARD_PIPE_COOLANT_TEMP: [float(temp) for temp in range(CONTROL_ACTIONS_COUNT)]
+        })
+        self.loop.run_until_complete(control_actions_repository.set_control_action(control_actions_df))
+
+        self.app = FastAPI()
+        self.app.include_router(api_v2.api_router)
+
+    def tearDown(self) -> None:
+        self.application.unwire()
+        self.loop.close()
+
+    def test_batch_with_default_and_explicit_timezones(self):
+        end_datetime = self.start_datetime + 3 * time_tick.TIME_TICK
+        status_code, body = self.loop.run_until_complete(post_json(
+            self.app,
+            "/api/v2/getPredictedBoilerTBatch",
+            {
+                "queries": [
+                    {
+                        "start_datetime": self.start_datetime.isoformat(),
+                        "end_datetime": end_datetime.isoformat()
+                    },
+                    {
+                        "start_datetime": self.start_datetime.isoformat(),
+                        "end_datetime": end_datetime.isoformat(),
+                        "timezone_name": "UTC"
+                    }
+                ]
+            }
+        ))
+
+        self.assertEqual(status_code, 200, body)
+        responses = json.loads(body)
+        self.assertEqual(len(responses), 2)
+        self.assertEqual(len(responses[0]), 4)
+        self.assertEqual(responses[0][0][1], responses[1][0][1])
+
+    def test_batch_with_incorrect_timezone(self):
+        status_code, body = self.loop.run_until_complete(post_json(
+            self.app,
+            "/api/v2/getPredictedBoilerTBatch",
+            {"queries": [{}, {"timezone_name": "Not/AZone"}]}
+        ))
+
+        self.assertEqual(status_code, 400, body)
+        self.assertIn("queries[1]", json.loads(body)["detail"])
+
+
+if __name__ == '__main__':
+    unittest.main()